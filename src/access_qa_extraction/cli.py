@@ -1,6 +1,7 @@
 """Command-line interface for Q&A extraction."""
 
 import asyncio
+import logging
 from pathlib import Path
 
 import typer
@@ -23,6 +24,7 @@ from .extractors import (
     SoftwareDiscoveryExtractor,
 )
 from .generators import ComparisonGenerator, IncrementalCache
+from .llm_cache import LLMResponseCache
 from .models import ExtractionResult
 from .output import JSONLWriter
 
@@ -32,6 +34,15 @@ app = typer.Typer(
 console = Console()
 
 
+@app.callback()
+def main() -> None:
+    """Extract Q&A pairs from ACCESS-CI MCP servers."""
+    # Show this package's progress logs; third-party loggers (httpx logs every
+    # request at INFO) stay at WARNING.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("access_qa_extraction").setLevel(logging.INFO)
+
+
 # Registry of available extractors
 EXTRACTORS = {
     "compute-resources": ComputeResourcesExtractor,
@@ -46,6 +57,7 @@ async def run_extraction(
     server_name: str,
     config: Config,
     incremental_cache: IncrementalCache | None = None,
+    llm_cache: LLMResponseCache | None = None,
 ) -> tuple[str, ExtractionOutput]:
     """Run extraction for a single server."""
     if server_name not in EXTRACTORS:
@@ -61,11 +73,16 @@ async def run_extraction(
         server_config,
         extraction_config=extraction_config,
         incremental_cache=incremental_cache,
+        llm_cache=llm_cache,
     )
 
     try:
         output = await extractor.run()
         console.print(f"[green]  Generated {len(output.pairs)} Q&A pairs[/green]")
+        usage = extractor.token_usage
+        cached = usage["cache_read_input_tokens"] + usage["cached_tokens"]
+        if cached:
+            console.print(f"[dim]  Prompt cache: {cached:,} input tokens read from cache[/dim]")
         return server_name, output
     except Exception as e:
         console.print(f"[red]  Error: {e}[/red]")
@@ -109,12 +126,48 @@ def extract(
         "Applied after fetch and dedup. Works for all strategies. "
         "Set to 1 for a cheap single-entity test run.",
     ),
+    concurrency: int = typer.Option(
+        None,
+        "--concurrency",
+        help="Max entities processed at once (overlaps MCP + LLM latency). "
+        "Lower it if the LLM provider rate-limits.",
+    ),
+    batch_size: int = typer.Option(
+        None,
+        "--batch-size",
+        help="Entities packed into one battery LLM call (1 = no batching). "
+        "Cuts request count under requests-per-minute limits.",
+    ),
+    llm_rpm: int = typer.Option(
+        None,
+        "--llm-rpm",
+        help="Cap live LLM requests per minute (0 = no cap). "
+        "Set just under the provider's RPM limit to avoid 429 retries.",
+    ),
+    parallel_discovery: bool = typer.Option(
+        False,
+        "--parallel-discovery",
+        help="Send the discovery LLM call alongside the battery call instead of "
+        "after it. Faster, but discovery can't see the battery's pairs.",
+    ),
+    batch_api: bool = typer.Option(
+        False,
+        "--batch-api",
+        help="Submit LLM calls as provider batch jobs (Anthropic/OpenAI). "
+        "~50% cheaper but can take hours; for offline full-corpus runs.",
+    ),
     incremental: bool = typer.Option(
         False,
         "--incremental",
         "-i",
         help="Skip entities unchanged since last run (uses content hash).",
     ),
+    llm_cache: bool = typer.Option(
+        False,
+        "--llm-cache",
+        help="Replay LLM responses for prompts already sent in an earlier run "
+        "(stored in the output dir). For iterating on a subset during development.",
+    ),
     no_judge: bool = typer.Option(
         False,
         "--no-judge",
@@ -141,6 +194,26 @@ def extract(
             if max_entities is not None:
                 config.extraction[name].max_entities = max_entities
 
+    if concurrency is not None:
+        for name in config.extraction:
+            config.extraction[name].concurrency = concurrency
+
+    if batch_size is not None:
+        for name in config.extraction:
+            config.extraction[name].batch_size = batch_size
+
+    if llm_rpm is not None:
+        for name in config.extraction:
+            config.extraction[name].llm_requests_per_minute = llm_rpm
+
+    if parallel_discovery:
+        for name in config.extraction:
+            config.extraction[name].parallel_discovery = True
+
+    if batch_api:
+        for name in config.extraction:
+            config.extraction[name].use_batch_api = True
+
     if no_judge:
         for name in config.extraction:
             config.extraction[name].no_judge = True
@@ -163,16 +236,27 @@ def extract(
     if cache:
         console.print("[blue]Incremental mode: skipping unchanged entities[/blue]")
 
+    response_cache = None
+    if llm_cache:
+        response_cache = LLMResponseCache(Path(config.output_dir) / ".llm_cache.sqlite")
+
     # TRACE-TOUR.extract[5] — asyncio.run(run_all())
     async def run_all():
         results = {}
         for server in servers:
-            name, output = await run_extraction(server, config, incremental_cache=cache)
+            name, output = await run_extraction(
+                server, config, incremental_cache=cache, llm_cache=response_cache
+            )
             results[name] = output
         return results
 
     outputs = asyncio.run(run_all())
 
+    if response_cache:
+        response_cache.close()
+        hits, misses = response_cache.stats
+        console.print(f"[blue]LLM cache: {hits} replayed, {misses} sent[/blue]")
+
     # TRACE-TOUR.extract[18] — cache.save()
     if cache:
         cache.save()
@@ -55,7 +55,28 @@ class ExtractionConfig(BaseModel):
           for list-all, search-terms, and broad-queries strategies alike.
         - max_tokens: token limit for each LLM generation call. Every extractor
           calls the LLM once per entity, asking it to produce a JSON array of Q&A
-          pairs. 2048 is enough for ~5-8 Q&A pairs per entity.
+          pairs. 2048 is enough for ~5-8 Q&A pairs per entity. Extractors that
+          go through BaseExtractor._generate treat this as a ceiling and ask for
+          less on small entities.
+        - concurrency: how many entities are processed at once. Each entity's
+          MCP detail fetch, LLM calls, and judge call run as one pipeline; up to
+          this many pipelines overlap. Lower it if the LLM provider rate-limits.
+        - batch_size: how many entities share one battery LLM call. 1 = one call
+          per entity. Higher values cut request count when the provider's
+          requests-per-minute limit is the bottleneck. Keep it small (5-10).
+        - discovery_min_data_fields: entities with fewer non-empty fields than
+          this skip the discovery call (the battery already covers them).
+        - use_batch_api: submit all battery calls, then all discovery calls, as
+          provider batch jobs (Anthropic Message Batches / OpenAI Batches). About
+          half the cost and no per-minute limits, but jobs can take hours. For
+          offline full-corpus runs.
+        - llm_requests_per_minute: cap on live LLM requests per minute across
+          all concurrent entities (0 = no cap). Set it just under the provider's
+          RPM limit so calls wait locally instead of bouncing off 429s.
+        - parallel_discovery: send the discovery call alongside the battery
+          instead of after it, without the battery's pairs as context. About
+          half the per-entity LLM latency, at the cost of some overlapping pairs
+          (exact repeats are dropped).
     """
 
     # Cap on how many entities get sent to the LLM for Q&A generation.
@@ -75,6 +96,7 @@ class ExtractionConfig(BaseModel):
 
     # Token limit for each LLM call (one call per entity).
     # 2048 produces ~5-8 Q&A pairs. Increase if answers are getting truncated.
+    # Acts as a ceiling: small entities get a smaller, size-based budget.
     max_tokens: int = 2048
 
     # Max events/knowledge-base items included per affinity group in the LLM prompt.
@@ -82,6 +104,33 @@ class ExtractionConfig(BaseModel):
     # for groups with many events.
     max_detail_items: int = 5
 
+    # Max entities processed concurrently (MCP detail fetch + LLM calls + judge).
+    # LLM calls are I/O-bound, so overlapping them cuts wall time roughly N×.
+    concurrency: int = 8
+
+    # Entities packed into one battery LLM call (the model returns a JSON object
+    # keyed by entity ID). 1 = no batching. Discovery calls stay per-entity.
+    # Entities missing from a batched response fall back to their own call.
+    batch_size: int = 1
+
+    # Skip the discovery LLM call for entities with fewer non-empty fields than
+    # this — sparse entities are fully covered by the battery. 0 = always run it.
+    discovery_min_data_fields: int = 3
+
+    # Send LLM calls through the provider's batch API instead of live requests.
+    # Backends without one (local, transformers) run the requests sequentially.
+    # Set via --batch-api CLI flag. Only the allocations extractor uses it so far.
+    use_batch_api: bool = False
+
+    # Client-side token bucket for live LLM calls (retries included). Set via
+    # EXTRACT_LLM_RPM or --llm-rpm. 0 = unlimited.
+    llm_requests_per_minute: int = 0
+
+    # Run the discovery call concurrently with the battery ("blind" — it can't
+    # see the battery's pairs). Set via --parallel-discovery CLI flag.
+    # Only the compute-resources extractor uses it so far.
+    parallel_discovery: bool = False
+
     # Skip LLM judge evaluation (no quality scores on pairs). Set via --no-judge CLI flag.
     no_judge: bool = False
 
@@ -137,11 +186,17 @@ class Config(BaseModel):
         env_max_entities = os.getenv("EXTRACT_MAX_ENTITIES")
         env_max_queries = os.getenv("EXTRACT_MAX_QUERIES")
         env_search_limit = os.getenv("EXTRACT_SEARCH_LIMIT")
+        env_concurrency = os.getenv("EXTRACT_CONCURRENCY")
+        env_batch_size = os.getenv("EXTRACT_BATCH_SIZE")
+        env_llm_rpm = os.getenv("EXTRACT_LLM_RPM")
 
         shared = ExtractionConfig(
             max_entities=int(env_max_entities) if env_max_entities else None,
             max_queries=int(env_max_queries) if env_max_queries else None,
             search_limit=int(env_search_limit) if env_search_limit else 20,
+            concurrency=int(env_concurrency) if env_concurrency else 8,
+            batch_size=int(env_batch_size) if env_batch_size else 1,
+            llm_requests_per_minute=int(env_llm_rpm) if env_llm_rpm else 0,
         )
 
         # Every server gets the same extraction config by default.
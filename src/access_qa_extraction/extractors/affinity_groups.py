@@ -8,11 +8,13 @@ Fetches all groups via search_affinity_groups({}) (list-all strategy), then
 fetches detail (events + KB) per group.
 """
 
-import json
+import asyncio
+import logging
 import re
 
 from ..generators.incremental import compute_entity_hash
 from ..generators.judge import evaluate_pairs
+from ..json_utils import dumps_compact, find_json_array
 from ..llm_client import BaseLLMClient, get_judge_client, get_llm_client
 from ..models import ExtractionResult, QAPair
 from ..question_categories import (
@@ -20,7 +22,12 @@ from ..question_categories import (
     build_discovery_system_prompt,
     build_user_prompt,
 )
-from .base import BaseExtractor, ExtractionOutput, ExtractionReport
+from .base import BaseExtractor, ExtractionOutput, ExtractionReport, QAItem, parse_qa_items
+
+logger = logging.getLogger(__name__)
+
+# Questions mentioning any of these are tagged "moderate" complexity
+_MODERATE_RE = re.compile(r"how to|steps|process|compare", re.IGNORECASE)
 
 
 def strip_html(text: str) -> str:
@@ -79,7 +86,7 @@ class AffinityGroupsExtractor(BaseExtractor):
 
         system_prompt = build_battery_system_prompt("affinity-groups")
 
-        entity_count = 0
+        selected: list[tuple[str, dict]] = []
         for group in groups:
             group_id = str(group.get("id", ""))
             group_name = group.get("name", "")
@@ -97,60 +104,80 @@ class AffinityGroupsExtractor(BaseExtractor):
 
             # Respect max_entities limit
             if self.extraction_config.max_entities is not None:
-                if entity_count >= self.extraction_config.max_entities:
+                if len(selected) >= self.extraction_config.max_entities:
                     break
-            entity_count += 1
+            selected.append((group_id, group))
 
-            # Fetch detail with events and knowledge base
-            detail = await self._fetch_group_detail(group_id)
+        # Groups are independent: overlap their detail fetches, LLM calls,
+        # and judge calls instead of running them one group at a time.
+        results = await self._gather_bounded(
+            lambda item: self._process_group(*item, system_prompt), selected
+        )
 
-            # Clean data for LLM consumption
-            clean_group = self._clean_group_data(group, detail)
+        for (group_id, _), (group_pairs, raw_entry) in zip(selected, results):
+            pairs.extend(group_pairs)
+            raw_data[group_id] = raw_entry
 
-            # Incremental: skip if entity data unchanged
-            entity_hash = compute_entity_hash(clean_group)
-            used_cache = False
-            if self.incremental_cache:
-                if self.incremental_cache.is_unchanged("affinity-groups", group_id, entity_hash):
-                    cached_pairs = self.incremental_cache.get_cached_pairs(
-                        "affinity-groups", group_id
-                    )
-                    if cached_pairs:
-                        pairs.extend(cached_pairs)
-                        used_cache = True
+        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
 
-            if not used_cache:
-                source_data = {"group": clean_group}
+    async def _process_group(
+        self, group_id: str, group: dict, system_prompt: str
+    ) -> tuple[ExtractionResult, dict]:
+        """Fetch detail, generate (or replay cached) pairs, and judge one group.
+
+        Returns the group's pairs and its normalized raw_data entry.
+        """
+        # Fetch detail with events and knowledge base
+        detail = await self._fetch_group_detail(group_id)
+
+        # Clean data for LLM consumption
+        clean_group = self._clean_group_data(group, detail)
+
+        # Incremental: skip if entity data unchanged
+        entity_hash = compute_entity_hash(clean_group)
+        group_pairs: ExtractionResult = []
+        used_cache = False
+        if self.incremental_cache:
+            if self.incremental_cache.is_unchanged("affinity-groups", group_id, entity_hash):
+                cached_pairs = self.incremental_cache.get_cached_pairs(
+                    "affinity-groups", group_id
+                )
+                if cached_pairs:
+                    group_pairs = cached_pairs
+                    used_cache = True
+
+        if not used_cache:
+            source_data = {"group": clean_group}
 
-                # Send to LLM and get Q&A pairs back (freeform — variable count)
-                group_pairs = await self._generate_qa_pairs(
-                    group_id, clean_group, source_data, system_prompt
+            # Send to LLM and get Q&A pairs back (freeform — variable count)
+            group_pairs = await self._generate_qa_pairs(
+                group_id, clean_group, source_data, system_prompt
+            )
+
+            # Judge evaluation: score all pairs for this entity
+            if self.judge_client:
+                await asyncio.to_thread(
+                    evaluate_pairs, group_pairs, {"group": clean_group}, self.judge_client
                 )
-                pairs.extend(group_pairs)
-
-                # Judge evaluation: score all pairs for this entity
-                if self.judge_client:
-                    evaluate_pairs(group_pairs, {"group": clean_group}, self.judge_client)
-
-                if self.incremental_cache:
-                    self.incremental_cache.store(
-                        "affinity-groups",
-                        group_id,
-                        entity_hash,
-                        group_pairs,
-                    )
 
-            # Store normalized data for ComparisonGenerator
-            raw_data[group_id] = {
-                "name": group_name,
-                "group_id": group_id,
-                "category": group.get("category", ""),
-                "coordinator": group.get("coordinator", ""),
-                "has_events": bool(detail.get("events", {}).get("total", 0)),
-                "has_knowledge_base": bool(detail.get("knowledge_base", {}).get("total", 0)),
-            }
+            if self.incremental_cache:
+                self.incremental_cache.store(
+                    "affinity-groups",
+                    group_id,
+                    entity_hash,
+                    group_pairs,
+                )
 
-        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+        # Store normalized data for ComparisonGenerator
+        raw_entry = {
+            "name": group.get("name", ""),
+            "group_id": group_id,
+            "category": group.get("category", ""),
+            "coordinator": group.get("coordinator", ""),
+            "has_events": bool(detail.get("events", {}).get("total", 0)),
+            "has_knowledge_base": bool(detail.get("knowledge_base", {}).get("total", 0)),
+        }
+        return group_pairs, raw_entry
 
     async def _fetch_group_detail(self, group_id: str) -> dict:
         """Fetch detailed group info including events and knowledge base."""
@@ -202,67 +229,49 @@ class AffinityGroupsExtractor(BaseExtractor):
         """Use LLM to generate Q&A pairs from group data."""
         pairs: ExtractionResult = []
 
-        entity_json = json.dumps(group, indent=2)
+        entity_json = dumps_compact(group)
         user_prompt = build_user_prompt(
             "affinity-groups", group_id, entity_json,
             entity_name=group.get("name", ""),
         )
 
         try:
-            response = self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                max_tokens=self.extraction_config.max_tokens,
-            )
+            response = await self._generate(system_prompt, user_prompt, cache_system=True)
 
             qa_list = self._parse_qa_response(response.text)
 
             # Discovery call: find what the battery missed
-            if qa_list:
-                existing = [{"question": qa["question"], "answer": qa["answer"]} for qa in qa_list]
+            if qa_list and self._wants_discovery(group):
+                existing = [{"question": qa.question, "answer": qa.answer} for qa in qa_list]
                 discovery_prompt = build_discovery_system_prompt("affinity-groups", existing)
-                discovery_response = self.llm.generate(
-                    system=discovery_prompt,
-                    user=user_prompt,
-                    max_tokens=self.extraction_config.max_tokens,
-                )
+                discovery_response = await self._generate(discovery_prompt, user_prompt)
                 qa_list.extend(self._parse_qa_response(discovery_response.text))
 
+            # parse_qa_items already dropped items without a question and answer
             for seq_n, qa in enumerate(qa_list, start=1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-
-                if question and answer:
-                    pair_id = f"affinity-groups_{group_id}_{seq_n}"
-
-                    complexity = "simple"
-                    if any(
-                        term in question.lower()
-                        for term in ["how to", "steps", "process", "compare"]
-                    ):
-                        complexity = "moderate"
-
-                    pairs.append(
-                        QAPair.create(
-                            id=pair_id,
-                            question=question,
-                            answer=answer,
-                            source_ref=f"mcp://affinity-groups/groups/{group_id}",
-                            domain="affinity-groups",
-                            complexity=complexity,
-                            source_data=source_data,
-                        )
+                question = qa.question
+                pair_id = f"affinity-groups_{group_id}_{seq_n}"
+
+                complexity = "moderate" if _MODERATE_RE.search(question) else "simple"
+
+                pairs.append(
+                    QAPair.create(
+                        id=pair_id,
+                        question=question,
+                        answer=qa.answer,
+                        source_ref=f"mcp://affinity-groups/groups/{group_id}",
+                        domain="affinity-groups",
+                        complexity=complexity,
+                        source_data=source_data,
                     )
+                )
 
         except Exception as e:
-            print(f"Error generating Q&A for affinity group {group_id}: {e}")
+            logger.warning("Error generating Q&A for affinity group %s: %s", group_id, e)
 
         return pairs
 
     @staticmethod
-    def _parse_qa_response(response_text: str) -> list[dict]:
+    def _parse_qa_response(response_text: str) -> list[QAItem]:
         """Parse a JSON array of Q&A pairs from an LLM response."""
-        json_match = re.search(r"\[[\s\S]*\]", response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return []
+        return parse_qa_items(find_json_array(response_text))
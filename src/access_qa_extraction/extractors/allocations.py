@@ -7,32 +7,74 @@ pairs as the data warrants, guided by per-domain key areas but not
 constrained to them.
 """
 
-import json
+import asyncio
+import logging
 import re
 
 import httpx
 
 from ..generators.incremental import compute_entity_hash
-from ..generators.judge import evaluate_pairs
-from ..llm_client import BaseLLMClient, get_judge_client, get_llm_client
+from ..json_utils import dumps_compact, find_json_array
+from ..llm_client import (
+    BaseLLMClient,
+    LLMResponse,
+    get_judge_client,
+    get_llm_client,
+)
 from ..models import ExtractionResult, QAPair
 from ..question_categories import (
     build_battery_system_prompt,
     build_discovery_system_prompt,
     build_user_prompt,
 )
-from .base import BaseExtractor, ExtractionOutput, ExtractionReport
+from ..resilience import CircuitBreaker, call_with_retry
+from .base import (
+    BaseExtractor,
+    ExtractionOutput,
+    ExtractionReport,
+    QAItem,
+    chunked,
+    parse_qa_items,
+)
+
+logger = logging.getLogger(__name__)
 
 ALLOCATIONS_API_URL = "https://allocations.access-ci.org/current-projects.json"
 
+# Max page requests in flight at once while paginating the allocations API
+PAGE_FETCH_CONCURRENCY = 16
+
+# Project fields read by extract()/_clean_project_data(); everything else the
+# API returns is dropped as each page arrives so it isn't held for the whole run
+PROJECT_FIELDS = (
+    "projectId",
+    "requestNumber",
+    "requestTitle",
+    "pi",
+    "piInstitution",
+    "fos",
+    "abstract",
+    "allocationType",
+    "beginDate",
+    "endDate",
+)
+RESOURCE_FIELDS = ("resourceName", "units", "allocation")
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# Questions mentioning any of these are tagged "moderate" complexity
+_MODERATE_RE = re.compile(r"how to|steps|process|compare", re.IGNORECASE)
+
 
 def strip_html(text: str) -> str:
     """Remove HTML tags from text."""
     if not text:
         return text
-    clean = re.sub(r"<[^>]+>", "", text)
-    clean = re.sub(r"\s+", " ", clean).strip()
-    return clean
+    # Most abstracts are plain text; skip the tag pass when there are no tags
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    return _WS_RE.sub(" ", text).strip()
 
 
 class AllocationsExtractor(BaseExtractor):
@@ -49,23 +91,73 @@ class AllocationsExtractor(BaseExtractor):
                 self.judge_client = get_judge_client()
             except (ValueError, ImportError):
                 pass
+        self._http: httpx.AsyncClient | None = None
+        self._api_breaker = CircuitBreaker("allocations API")
+        # Judge + cache-store tasks running behind generation; see _process_project
+        self._post_tasks: list[asyncio.Task] = []
+        self._judge_semaphore = asyncio.Semaphore(max(1, self.extraction_config.concurrency))
 
     async def run(self) -> ExtractionOutput:
         """Run extraction — no MCPClient needed (uses direct API)."""
         # Overrides BaseExtractor.run() which creates an MCPClient context.
         # This extractor fetches from allocations.access-ci.org directly.
-        return await self.extract()
+        try:
+            return await self.extract()
+        finally:
+            await self.aclose()
 
     async def run_report(self) -> ExtractionReport:
         """Run report — no MCPClient needed (uses direct API)."""
-        return await self.report()
+        try:
+            return await self.report()
+        finally:
+            await self.aclose()
 
-    async def report(self) -> ExtractionReport:
-        """Fetch page 1 to get total page count and a sample of projects."""
-        async with httpx.AsyncClient(timeout=30.0) as http:
-            resp = await http.get(ALLOCATIONS_API_URL, params={"page": 1})
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use.
+
+        One client per extractor keeps connections alive across report()
+        and every page of the pagination loop.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=PAGE_FETCH_CONCURRENCY,
+                    max_keepalive_connections=PAGE_FETCH_CONCURRENCY,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _get_page(self, **params) -> dict:
+        """GET one page of the allocations API, retrying transient failures.
+
+        A 429/5xx or dropped connection on one page is retried with backoff
+        instead of aborting the whole pagination run.
+        """
+        http = self._get_http()
+
+        async def fetch() -> dict:
+            resp = await http.get(ALLOCATIONS_API_URL, params=params)
             resp.raise_for_status()
-            data = resp.json()
+            return resp.json()
+
+        return await call_with_retry(fetch, breaker=self._api_breaker)
+
+    async def report(self) -> ExtractionReport:
+        """Fetch page 1 to get total page count and a sample of projects.
+
+        Asks for a 5-item page since only the page count and sample IDs are
+        needed. If the API ignores per_page we get a normal page, and the
+        estimate (items on page x pages) holds either way.
+        """
+        data = await self._get_page(page=1, per_page=5)
 
         projects = data.get("projects", [])
         total_pages = data.get("pages", 1)
@@ -85,55 +177,73 @@ class AllocationsExtractor(BaseExtractor):
     async def _fetch_all_projects(self) -> list[dict]:
         """Paginate the allocations API and return all projects.
 
-        Fetches page 1 to learn total page count, then iterates through
-        remaining pages. Respects --max-entities to stop early.
+        Fetches page 1 to learn total page count, then fetches the remaining
+        pages concurrently (up to PAGE_FETCH_CONCURRENCY at a time). Respects
+        --max-entities by only requesting as many pages as it needs.
         """
-        all_projects: list[dict] = []
         max_entities = self.extraction_config.max_entities
 
-        async with httpx.AsyncClient(timeout=30.0) as http:
-            # Page 1: learn total pages
-            resp = await http.get(ALLOCATIONS_API_URL, params={"page": 1})
-            resp.raise_for_status()
-            data = resp.json()
+        # Page 1: learn total pages
+        data = await self._get_page(page=1)
 
-            page_projects = data.get("projects", [])
-            total_pages = data.get("pages", 1)
-            all_projects.extend(page_projects)
+        all_projects = [self._slim_project(p) for p in data.get("projects", [])]
+        total_pages = data.get("pages", 1)
+        per_page = len(all_projects)
+
+        logger.info("  Allocations API: %d pages, %d on page 1", total_pages, per_page)
 
-            print(f"  Allocations API: {total_pages} pages, {len(page_projects)} on page 1")
+        if max_entities and len(all_projects) >= max_entities:
+            return all_projects[:max_entities]
 
-            if max_entities and len(all_projects) >= max_entities:
-                return all_projects[:max_entities]
+        last_page = total_pages
+        if max_entities and per_page:
+            last_page = min(total_pages, -(-max_entities // per_page))
 
-            # Pages 2..N
-            for page_num in range(2, total_pages + 1):
-                resp = await http.get(ALLOCATIONS_API_URL, params={"page": page_num})
-                resp.raise_for_status()
-                data = resp.json()
+        # Pages 2..N, fetched concurrently; gather keeps them in page order
+        semaphore = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+        done = 1
 
-                page_projects = data.get("projects", [])
-                all_projects.extend(page_projects)
+        async def fetch_page(page_num: int) -> list[dict]:
+            nonlocal done
+            async with semaphore:
+                data = await self._get_page(page=page_num)
+                page_projects = [self._slim_project(p) for p in data.get("projects", [])]
+            done += 1
+            if done % 50 == 0 or done == last_page:
+                logger.info("  Page %d/%d fetched", done, last_page)
+            return page_projects
 
-                if page_num % 50 == 0 or page_num == total_pages:
-                    print(f"  Page {page_num}/{total_pages}: {len(all_projects)} total projects")
+        pages = await asyncio.gather(*(fetch_page(n) for n in range(2, last_page + 1)))
 
-                if max_entities and len(all_projects) >= max_entities:
-                    return all_projects[:max_entities]
+        for page_projects in pages:
+            all_projects.extend(page_projects)
 
+        if max_entities:
+            return all_projects[:max_entities]
         return all_projects
 
+    @staticmethod
+    def _slim_project(project: dict) -> dict:
+        """Keep only the fields the extractor uses from an API project record."""
+        slim = {k: project[k] for k in PROJECT_FIELDS if k in project}
+        resources = project.get("resources")
+        if resources:
+            slim["resources"] = [
+                {k: r[k] for k in RESOURCE_FIELDS if k in r} for r in resources
+            ]
+        return slim
+
     async def extract(self) -> ExtractionOutput:
         """Extract Q&A pairs for all allocation projects."""
         pairs: ExtractionResult = []
         raw_data: dict = {}
 
         projects = await self._fetch_all_projects()
-        print(f"  Fetched {len(projects)} projects, generating Q&A pairs...")
+        logger.info("  Fetched %d projects, generating Q&A pairs...", len(projects))
 
         system_prompt = build_battery_system_prompt("allocations")
 
-        entity_count = 0
+        selected: list[tuple[str, dict]] = []
         for project in projects:
             project_id = str(project.get("projectId", "") or project.get("requestNumber", ""))
             title = project.get("requestTitle", "")
@@ -147,155 +257,391 @@ class AllocationsExtractor(BaseExtractor):
 
             # Respect max_entities limit (may have fetched extra on last page)
             if self.extraction_config.max_entities is not None:
-                if entity_count >= self.extraction_config.max_entities:
+                if len(selected) >= self.extraction_config.max_entities:
                     break
-            entity_count += 1
+            selected.append((project_id, project))
+
+        try:
+            results = await self._generate_all(selected, system_prompt)
+        finally:
+            # Judge calls for the last projects may still be running
+            await self._drain_post_tasks()
 
-            clean_project = self._clean_project_data(project)
+        for (project_id, _), (project_pairs, raw_entry) in zip(selected, results):
+            pairs.extend(project_pairs)
+            raw_data[project_id] = raw_entry
 
-            entity_hash = compute_entity_hash(clean_project)
-            used_cache = False
-            if self.incremental_cache:
-                if self.incremental_cache.is_unchanged("allocations", project_id, entity_hash):
-                    cached_pairs = self.incremental_cache.get_cached_pairs(
-                        "allocations", project_id
-                    )
-                    if cached_pairs:
-                        pairs.extend(cached_pairs)
-                        used_cache = True
+        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+
+    async def _generate_all(
+        self, selected: list[tuple[str, dict]], system_prompt: str
+    ) -> list[tuple[ExtractionResult, dict]]:
+        """Process every selected project, picking the batching mode from config."""
+        # Projects are independent: overlap their LLM and judge calls
+        batch_size = self.extraction_config.batch_size
+        if self.extraction_config.use_batch_api:
+            prepared = [self._prepare_project(*item) for item in selected]
+            batteries, discoveries = await self._run_batch_jobs(selected, prepared, system_prompt)
+            return await self._gather_bounded(
+                lambda item: self._process_project(
+                    item[0],
+                    item[1],
+                    system_prompt,
+                    battery=batteries.get(item[0]),
+                    discovery=discoveries.get(item[0]),
+                    prepared=item[2],
+                ),
+                [(pid, project, prep) for (pid, project), prep in zip(selected, prepared)],
+            )
+        elif batch_size > 1:
+            batch_results = await self._gather_bounded(
+                lambda batch: self._process_batch(batch, system_prompt),
+                chunked(selected, batch_size),
+            )
+            return [result for batch in batch_results for result in batch]
+        return await self._gather_bounded(
+            lambda item: self._process_project(*item, system_prompt), selected
+        )
+
+    async def _drain_post_tasks(self) -> None:
+        """Wait for background judge/cache-store tasks started by _process_project."""
+        tasks, self._post_tasks = self._post_tasks, []
+        await asyncio.gather(*tasks)
+
+    async def _process_batch(
+        self, batch: list[tuple[str, dict]], system_prompt: str
+    ) -> list[tuple[ExtractionResult, dict]]:
+        """Share one battery call across a batch of projects, then finish each.
+
+        Cached projects are left out of the batched prompt. Each project then
+        runs its own discovery, judge, and cache store via _process_project,
+        concurrently with the rest of the batch.
+        """
+        prepared = [self._prepare_project(project_id, project) for project_id, project in batch]
+        to_generate = [
+            (project_id, clean_project, clean_project["title"])
+            for (project_id, _), (clean_project, _, cached) in zip(batch, prepared)
+            if cached is None
+        ]
+
+        batteries: dict[str, list[QAItem]] = {}
+        if len(to_generate) > 1:
+            batteries = await self._generate_battery_batch(
+                "allocations", system_prompt, to_generate
+            )
+
+        return await asyncio.gather(
+            *(
+                self._process_project(
+                    project_id,
+                    project,
+                    system_prompt,
+                    battery=batteries.get(project_id),
+                    prepared=prep,
+                )
+                for (project_id, project), prep in zip(batch, prepared)
+            )
+        )
+
+    async def _run_batch_jobs(
+        self,
+        selected: list[tuple[str, dict]],
+        prepared: list[tuple[dict | None, dict, ExtractionResult | None]],
+        system_prompt: str,
+    ) -> tuple[dict[str, list[QAItem]], dict[str, list[QAItem]]]:
+        """Run every battery call, then every discovery call, as provider batch jobs.
+
+        prepared holds each selected project's _prepare_project() result;
+        cached projects are left out of the jobs.
+
+        Returns ({project_id: battery qa_list}, {project_id: discovery qa_list}).
+        Sparse projects (see _wants_discovery) get an empty discovery list.
+        Projects whose request failed are left out, so _process_project falls
+        back to a live call for them.
+        """
+        user_prompts: dict[str, str] = {}
+        wants_discovery: set[str] = set()
+        for (project_id, _), (clean_project, _, cached) in zip(selected, prepared):
+            if cached is None:
+                user_prompts[project_id] = self._build_user_prompt(project_id, clean_project)
+                if self._wants_discovery(clean_project):
+                    wants_discovery.add(project_id)
+
+        batteries = self._parse_batch_responses(
+            user_prompts,
+            await self._generate_batch(
+                [(system_prompt, user, True) for user in user_prompts.values()]
+            ),
+        )
+
+        discovery_prompts = {
+            pid: user_prompts[pid] for pid, qa in batteries.items() if qa and pid in wants_discovery
+        }
+        discovery_requests = [
+            (
+                build_discovery_system_prompt(
+                    "allocations",
+                    [{"question": qa.question, "answer": qa.answer} for qa in batteries[pid]],
+                ),
+                user,
+                False,
+            )
+            for pid, user in discovery_prompts.items()
+        ]
+        discoveries = self._parse_batch_responses(
+            discovery_prompts, await self._generate_batch(discovery_requests)
+        )
+        for project_id in batteries.keys() - wants_discovery:
+            discoveries[project_id] = []
+        return batteries, discoveries
+
+    def _parse_batch_responses(
+        self, prompts: dict[str, str], responses: list[LLMResponse | None]
+    ) -> dict[str, list[QAItem]]:
+        """Map batch job responses back to project IDs, dropping failures."""
+        parsed: dict[str, list[QAItem]] = {}
+        for project_id, response in zip(prompts, responses):
+            if response is None:
+                continue
+            try:
+                parsed[project_id] = self._parse_qa_response(response.text)
+            except (ValueError, KeyError) as e:
+                logger.warning("Error parsing batched Q&A for %s: %s", project_id, e)
+        return parsed
+
+    def _prepare_project(
+        self, project_id: str, project: dict
+    ) -> tuple[dict | None, dict, ExtractionResult | None]:
+        """Clean a project and look up its --incremental cached pairs, once.
+
+        Returns (clean_project, raw_entry, cached pairs or None). The hash of
+        the raw API record is checked first, so unchanged projects skip
+        _clean_project_data (HTML stripping) and leave clean_project as None;
+        the cleaned-data hash is the fallback for entries cached before raw
+        hashes were stored. Batches call this once per project and hand the
+        result on to _process_project.
+        """
+        cache = self.incremental_cache
+        clean_project = raw_entry = None
+        unchanged = False
+        if cache:
+            unchanged = cache.is_raw_unchanged(
+                "allocations", project_id, compute_entity_hash(project)
+            )
+            if not unchanged:
+                clean_project, raw_entry = self._build_project_views(project_id, project)
+                unchanged = cache.is_unchanged(
+                    "allocations", project_id, compute_entity_hash(clean_project)
+                )
+        if unchanged:
+            cached_pairs = cache.get_cached_pairs("allocations", project_id)
+            if cached_pairs:
+                raw_entry = raw_entry or self._raw_summary(project_id, project)
+                return clean_project, raw_entry, cached_pairs
+        if clean_project is None:
+            clean_project, raw_entry = self._build_project_views(project_id, project)
+        return clean_project, raw_entry, None
+
+    async def _process_project(
+        self,
+        project_id: str,
+        project: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
+        discovery: list[QAItem] | None = None,
+        prepared: tuple[dict | None, dict, ExtractionResult | None] | None = None,
+    ) -> tuple[ExtractionResult, dict]:
+        """Generate (or replay cached) pairs for one project and queue its judging.
+
+        battery/discovery, when given, are this project's results from a
+        batched or batch-API call and replace the matching live call.
+        prepared is the project's _prepare_project() result when the caller
+        already built it.
+
+        Judging and the cache store run as a background task so this project's
+        concurrency slot is freed for the next project's generation as soon as
+        its pairs exist. The judge scores the returned pairs in place; callers
+        must await _drain_post_tasks() before reading scores.
+
+        Returns the project's pairs and its normalized raw_data entry.
+        """
+        if prepared is None:
+            prepared = self._prepare_project(project_id, project)
+        clean_project, raw_entry, cached_pairs = prepared
+        if cached_pairs:
+            return cached_pairs, raw_entry
+
+        project_pairs = await self._generate_qa_pairs(
+            project_id, clean_project, system_prompt, battery, discovery
+        )
 
-            if not used_cache:
-                project_pairs = await self._generate_qa_pairs(
-                    project_id, clean_project, system_prompt
+        if self.judge_client or self.incremental_cache:
+            self._post_tasks.append(
+                asyncio.create_task(
+                    self._judge_and_store(project_id, project, clean_project, project_pairs)
                 )
-                pairs.extend(project_pairs)
+            )
 
-                if self.judge_client:
-                    evaluate_pairs(project_pairs, {"project": clean_project}, self.judge_client)
+        return project_pairs, raw_entry
 
-                if self.incremental_cache:
-                    self.incremental_cache.store(
-                        "allocations",
-                        project_id,
-                        entity_hash,
-                        project_pairs,
-                    )
+    async def _judge_and_store(
+        self, project_id: str, project: dict, clean_project: dict, project_pairs: ExtractionResult
+    ) -> None:
+        """Score a project's pairs with the judge, then cache them.
 
-            raw_data[project_id] = {
-                "name": title,
-                "project_id": project_id,
-                "pi": project.get("pi", ""),
-                "institution": project.get("piInstitution", ""),
-                "fos": project.get("fos", ""),
-                "allocation_type": project.get("allocationType", ""),
-                "resource_count": len(project.get("resources", [])),
-                "resource_names": [
-                    r.get("resourceName", "")
-                    for r in project.get("resources", [])
-                    if r.get("resourceName")
-                ],
-            }
+        The store waits for the judge because it serializes the pairs
+        immediately and the cache should hold the scores.
+        """
+        if self.judge_client:
+            async with self._judge_semaphore:
+                await self._judge_pairs(project_pairs, {"project": clean_project})
+
+        if self.incremental_cache:
+            self.incremental_cache.store(
+                "allocations",
+                project_id,
+                compute_entity_hash(clean_project),
+                project_pairs,
+                raw_hash=compute_entity_hash(project),
+            )
 
-        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+    @staticmethod
+    def _raw_summary(
+        project_id: str, project: dict, resource_names: list[str] | None = None
+    ) -> dict:
+        """Normalized raw_data entry for ComparisonGenerator.
 
-    def _clean_project_data(self, project: dict) -> dict:
-        """Clean project data for LLM consumption."""
+        Stays a plain dict: ComparisonGenerator reads it with .get().
+        resource_names may be passed in when the caller already walked resources.
+        """
+        get = project.get
+        resources = get("resources") or []
+        if resource_names is None:
+            resource_names = [r["resourceName"] for r in resources if r.get("resourceName")]
+        return {
+            "name": get("requestTitle", ""),
+            "project_id": project_id,
+            "pi": get("pi", ""),
+            "institution": get("piInstitution", ""),
+            "fos": get("fos", ""),
+            "allocation_type": get("allocationType", ""),
+            "resource_count": len(resources),
+            "resource_names": resource_names,
+        }
+
+    def _build_project_views(self, project_id: str, project: dict) -> tuple[dict, dict]:
+        """Build the cleaned LLM view and the raw_data summary in one pass.
+
+        Resources are walked once for both the cleaned resource list and the
+        summary's resource names.
+        """
+        get = project.get
         cleaned = {
-            "title": project.get("requestTitle", ""),
-            "pi": project.get("pi", ""),
-            "institution": project.get("piInstitution", ""),
-            "field_of_science": project.get("fos", ""),
-            "allocation_type": project.get("allocationType", ""),
+            "title": get("requestTitle", ""),
+            "pi": get("pi", ""),
+            "institution": get("piInstitution", ""),
+            "field_of_science": get("fos", ""),
+            "allocation_type": get("allocationType", ""),
         }
 
-        for field in ["abstract", "beginDate", "endDate"]:
-            value = project.get(field, "")
+        abstract = get("abstract")
+        if abstract:
+            cleaned["abstract"] = strip_html(abstract)
+        for field in ("beginDate", "endDate"):
+            value = get(field)
             if value:
-                if field == "abstract":
-                    cleaned[field] = strip_html(value)
-                else:
-                    cleaned[field] = value
+                cleaned[field] = value
 
-        resources = project.get("resources", [])
+        resource_names: list[str] = []
+        resources = get("resources")
         if resources:
-            cleaned["resources"] = [
-                {
-                    "name": r.get("resourceName", ""),
-                    "units": r.get("units", ""),
-                    "allocation": r.get("allocation", ""),
-                }
-                for r in resources
-                if r.get("resourceName")
-            ]
+            clean_resources = []
+            for r in resources:
+                name = r.get("resourceName")
+                if name:
+                    resource_names.append(name)
+                    clean_resources.append(
+                        {
+                            "name": name,
+                            "units": r.get("units", ""),
+                            "allocation": r.get("allocation", ""),
+                        }
+                    )
+            cleaned["resources"] = clean_resources
 
-        return cleaned
+        return cleaned, self._raw_summary(project_id, project, resource_names)
+
+    def _clean_project_data(self, project: dict) -> dict:
+        """Clean project data for LLM consumption."""
+        return self._build_project_views("", project)[0]
 
     async def _generate_qa_pairs(
-        self, project_id: str, project: dict, system_prompt: str
+        self,
+        project_id: str,
+        project: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
+        discovery: list[QAItem] | None = None,
     ) -> ExtractionResult:
-        """Use LLM to generate Q&A pairs from project data."""
+        """Use LLM to generate Q&A pairs from project data.
+
+        Precomputed battery/discovery results (from batched calls) skip the
+        matching LLM call.
+        """
         pairs: ExtractionResult = []
 
-        entity_json = json.dumps(project, indent=2)
-        user_prompt = build_user_prompt(
-            "allocations", project_id, entity_json,
-            entity_name=project.get("title", ""),
-        )
+        user_prompt = self._build_user_prompt(project_id, project)
 
         try:
-            response = self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                max_tokens=self.extraction_config.max_tokens,
-            )
-
-            qa_list = self._parse_qa_response(response.text)
-
-            if qa_list:
-                existing = [{"question": qa["question"], "answer": qa["answer"]} for qa in qa_list]
+            if battery is None:
+                response = await self._generate(system_prompt, user_prompt, cache_system=True)
+                qa_list = self._parse_qa_response(response.text)
+            else:
+                qa_list = list(battery)
+
+            if qa_list and discovery is not None:
+                qa_list.extend(discovery)
+            elif qa_list and self._wants_discovery(project):
+                existing = [{"question": qa.question, "answer": qa.answer} for qa in qa_list]
                 discovery_prompt = build_discovery_system_prompt("allocations", existing)
-                discovery_response = self.llm.generate(
-                    system=discovery_prompt,
-                    user=user_prompt,
-                    max_tokens=self.extraction_config.max_tokens,
-                )
+                discovery_response = await self._generate(discovery_prompt, user_prompt)
                 qa_list.extend(self._parse_qa_response(discovery_response.text))
 
+            # One wrapper for every pair of this project (QAPair validation makes
+            # its own shallow copy; the project dict itself is shared, not copied)
+            source_data = {"project": project}
+            # parse_qa_items already dropped items without a question and answer
             for seq_n, qa in enumerate(qa_list, start=1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-
-                if question and answer:
-                    pair_id = f"allocations_{project_id}_{seq_n}"
-
-                    complexity = "simple"
-                    if any(
-                        term in question.lower()
-                        for term in ["how to", "steps", "process", "compare"]
-                    ):
-                        complexity = "moderate"
-
-                    pairs.append(
-                        QAPair.create(
-                            id=pair_id,
-                            question=question,
-                            answer=answer,
-                            source_ref=f"mcp://allocations/projects/{project_id}",
-                            domain="allocations",
-                            complexity=complexity,
-                            source_data={"project": project},
-                        )
+                question = qa.question
+                complexity = "moderate" if _MODERATE_RE.search(question) else "simple"
+
+                pairs.append(
+                    QAPair.create(
+                        id=f"allocations_{project_id}_{seq_n}",
+                        question=question,
+                        answer=qa.answer,
+                        source_ref=f"mcp://allocations/projects/{project_id}",
+                        domain="allocations",
+                        complexity=complexity,
+                        source_data=source_data,
                     )
+                )
 
         except Exception as e:
-            print(f"Error generating Q&A for allocation project {project_id}: {e}")
+            logger.warning("Error generating Q&A for allocation project %s: %s", project_id, e)
 
         return pairs
 
     @staticmethod
-    def _parse_qa_response(response_text: str) -> list[dict]:
+    def _build_user_prompt(project_id: str, project: dict) -> str:
+        """Build the user prompt shared by the battery and discovery calls."""
+        entity_json = dumps_compact(project)
+        return build_user_prompt(
+            "allocations", project_id, entity_json,
+            entity_name=project.get("title", ""),
+        )
+
+    @staticmethod
+    def _parse_qa_response(response_text: str) -> list[QAItem]:
         """Parse a JSON array of Q&A pairs from an LLM response."""
-        json_match = re.search(r"\[[\s\S]*\]", response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return []
+        return parse_qa_items(find_json_array(response_text))
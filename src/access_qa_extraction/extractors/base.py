@@ -2,16 +2,72 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 from ..config import ExtractionConfig, MCPServerConfig
+from ..generators.judge import evaluate_pairs
+from ..json_utils import dumps_compact, find_json_object
+from ..llm_cache import LLMResponseCache, llm_cache_key
+from ..llm_client import LLMRequest, LLMResponse
 from ..mcp_client import MCPClient
 from ..models import ExtractionResult
+from ..question_categories import build_batched_user_prompt
+from ..resilience import CircuitBreaker, RateLimiter, call_with_retry
 
 if TYPE_CHECKING:
     from ..generators.incremental import IncrementalCache
+    from ..llm_client import BaseLLMClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Output-token floor for a generation call: enough for a 5-8 pair JSON array
+# with citations even when the entity itself is tiny.
+MIN_GENERATION_TOKENS = 768
+
+# Max pairs per judge call. Larger entities are judged in parallel chunks so one
+# long judge response doesn't stall the entity (or run out of judge max_tokens).
+JUDGE_CHUNK_SIZE = 8
+
+
+def chunked(items: list[T], size: int) -> list[list[T]]:
+    """Split items into consecutive lists of at most `size`."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+@dataclass(slots=True)
+class QAItem:
+    """One question/answer item parsed from an LLM response."""
+
+    question: str
+    answer: str
+
+
+def parse_qa_items(items: object) -> list[QAItem]:
+    """Validate a decoded JSON array of Q&A objects into QAItems.
+
+    Items that are not objects with non-empty string "question" and "answer"
+    are dropped here instead of failing later on, mid-entity.
+    """
+    if not isinstance(items, list):
+        return []
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        question = item.get("question")
+        answer = item.get("answer")
+        if question and answer and isinstance(question, str) and isinstance(answer, str):
+            parsed.append(QAItem(question, answer))
+    return parsed
 
 
 @dataclass
@@ -38,16 +94,27 @@ class BaseExtractor(ABC):
     """Base class for MCP server extractors."""
 
     server_name: str
+    llm: BaseLLMClient  # set by subclasses that generate Q&A pairs
+    judge_client: BaseLLMClient | None = None  # set by subclasses that judge pairs
 
     def __init__(
         self,
         config: MCPServerConfig,
         extraction_config: ExtractionConfig | None = None,
         incremental_cache: IncrementalCache | None = None,
+        llm_cache: LLMResponseCache | None = None,
     ):
         self.config = config
         self.extraction_config = extraction_config or ExtractionConfig()
         self.incremental_cache = incremental_cache
+        self.llm_cache = llm_cache
+        # Summed LLMResponse.usage counts from live calls, incl. prompt-cache reads
+        self.token_usage: Counter[str] = Counter()
+        # Shared by every entity in this run, so a provider outage trips it
+        # once instead of each entity burning through its own retries
+        self.llm_breaker = CircuitBreaker(f"{self.server_name} LLM")
+        rpm = self.extraction_config.llm_requests_per_minute
+        self.llm_limiter = RateLimiter(rpm) if rpm else None
 
     @abstractmethod
     async def extract(self) -> ExtractionOutput:
@@ -58,6 +125,187 @@ class BaseExtractor(ABC):
         """
         pass
 
+    async def _generate(
+        self,
+        system: str,
+        user: str,
+        ceiling: int | None = None,
+        cache_system: bool = False,
+    ) -> LLMResponse:
+        """Call the LLM in a worker thread so the event loop stays free.
+
+        The LLM clients are synchronous; running them off-loop lets concurrent
+        entities overlap their MCP fetches and LLM round-trips. Transient
+        failures (rate limits, 5xx, dropped connections) are retried with
+        jittered backoff; once the breaker opens, calls fail fast. With
+        llm_requests_per_minute set, every attempt first waits on the limiter.
+
+        ceiling overrides max_tokens as the token cap (batched calls need more).
+        cache_system marks a system prompt reused across entities (the battery
+        prompt) for provider-side prompt caching.
+
+        With an llm_cache, a response for the identical request (model,
+        max_tokens, system, user) is replayed without calling the LLM.
+        """
+        max_tokens = self._token_budget(user, ceiling)
+        model = self._llm_model()
+        cache_key = None
+        if self.llm_cache:
+            cache_key = llm_cache_key(model, max_tokens, system, user)
+            cached_text = self.llm_cache.get(cache_key)
+            if cached_text is not None:
+                return LLMResponse(text=cached_text, model=model)
+
+        async def attempt() -> LLMResponse:
+            if self.llm_limiter:
+                await self.llm_limiter.acquire()
+            return await asyncio.to_thread(
+                self.llm.generate,
+                system=system,
+                user=user,
+                max_tokens=max_tokens,
+                cache_system=cache_system,
+            )
+
+        response = await call_with_retry(attempt, attempts=3, breaker=self.llm_breaker)
+        self._record_usage(response)
+        if cache_key:
+            self.llm_cache.put(cache_key, response.text)
+        return response
+
+    async def _generate_batch(
+        self, requests: list[tuple[str, str, bool]]
+    ) -> list[LLMResponse | None]:
+        """Run (system, user, cache_system) requests as one provider batch job.
+
+        The batch counterpart of _generate(): each request gets the same
+        _token_budget() cap, llm_cache hits are replayed instead of sent, and
+        responses are recorded in token_usage and the cache. Responses come
+        back in request order; a request that failed is None, and so is every
+        request if the job itself fails (callers fall back to live calls).
+        """
+        model = self._llm_model()
+        responses: list[LLMResponse | None] = [None] * len(requests)
+        cache_keys: list[str | None] = [None] * len(requests)
+        pending: list[int] = []
+        llm_requests: list[LLMRequest] = []
+        for i, (system, user, cache_system) in enumerate(requests):
+            max_tokens = self._token_budget(user)
+            if self.llm_cache:
+                cache_keys[i] = llm_cache_key(model, max_tokens, system, user)
+                cached_text = self.llm_cache.get(cache_keys[i])
+                if cached_text is not None:
+                    responses[i] = LLMResponse(text=cached_text, model=model)
+                    continue
+            pending.append(i)
+            llm_requests.append(LLMRequest(system, user, max_tokens, cache_system=cache_system))
+
+        if not llm_requests:
+            return responses
+        try:
+            results = await asyncio.to_thread(self.llm.generate_batch, llm_requests)
+        except Exception as e:
+            logger.warning("Batch job failed, falling back to live calls: %s", e)
+            return responses
+
+        for i, response in zip(pending, results):
+            if response is None:
+                continue
+            self._record_usage(response)
+            if cache_keys[i]:
+                self.llm_cache.put(cache_keys[i], response.text)
+            responses[i] = response
+        return responses
+
+    def _llm_model(self) -> str:
+        """Model name of self.llm, as used in llm_cache keys."""
+        return str(getattr(self.llm, "model_path", None) or getattr(self.llm, "model", ""))
+
+    def _record_usage(self, response: LLMResponse) -> None:
+        """Add a response's token counts to token_usage."""
+        usage = getattr(response, "usage", None)
+        if not usage:
+            return
+        for key, value in usage.items():
+            if isinstance(value, int):
+                self.token_usage[key] += value
+        logger.debug("LLM usage: %s", usage)
+
+    def _token_budget(self, user: str, ceiling: int | None = None) -> int:
+        """Size max_tokens to the entity instead of always asking for the cap.
+
+        Answers are drawn from the entity data, so output length tracks input
+        length (~4 chars per token). max_tokens from the config stays the ceiling.
+        """
+        ceiling = ceiling or self.extraction_config.max_tokens
+        return min(ceiling, MIN_GENERATION_TOKENS + len(user) // 4)
+
+    def _wants_discovery(self, entity_data: dict) -> bool:
+        """Whether an entity has enough data for the discovery call to find anything.
+
+        The battery already asks about every field group, so an entity with fewer
+        than discovery_min_data_fields non-empty fields has nothing left over.
+        """
+        filled = sum(1 for value in entity_data.values() if value not in (None, "", [], {}))
+        return filled >= self.extraction_config.discovery_min_data_fields
+
+    async def _generate_battery_batch(
+        self, domain: str, system_prompt: str, entities: list[tuple[str, dict, str]]
+    ) -> dict[str, list[QAItem]]:
+        """Run one battery call for several entities (ExtractionConfig.batch_size).
+
+        entities is a list of (entity_id, entity_data, entity_name). Returns
+        {entity_id: qa_list}. Entities the response leaves out, or every entity
+        if the call fails, are absent from the result; callers fall back to a
+        per-entity battery call for those.
+        """
+        user_prompt = build_batched_user_prompt(
+            domain,
+            [(entity_id, dumps_compact(data), name) for entity_id, data, name in entities],
+        )
+        try:
+            response = await self._generate(
+                system_prompt,
+                user_prompt,
+                ceiling=self.extraction_config.max_tokens * len(entities),
+                cache_system=True,
+            )
+            parsed = find_json_object(response.text)
+        except Exception as e:
+            logger.warning("Error generating batched Q&A for %s: %s", domain, e)
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+        return {str(k): parse_qa_items(v) for k, v in parsed.items() if isinstance(v, list)}
+
+    async def _judge_pairs(self, pairs: ExtractionResult, source_data: dict) -> None:
+        """Score pairs with self.judge_client in worker threads (in place).
+
+        Pairs are split into JUDGE_CHUNK_SIZE chunks judged concurrently; each
+        chunk call carries the full source data.
+        """
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(evaluate_pairs, chunk, source_data, self.judge_client)
+                for chunk in chunked(pairs, JUDGE_CHUNK_SIZE)
+            )
+        )
+
+    async def _gather_bounded(
+        self, func: Callable[[T], Awaitable[R]], items: Iterable[T]
+    ) -> list[R]:
+        """Run func(item) for each item, at most `concurrency` at a time.
+
+        Results come back in input order, so output stays deterministic.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.extraction_config.concurrency))
+
+        async def bounded(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
     async def report(self) -> ExtractionReport:
         """Fetch data from MCP and return coverage stats (no LLM calls).
 
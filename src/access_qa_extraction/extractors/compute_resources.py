@@ -8,11 +8,12 @@ Fetches all resources via search_resources({}) (list-all strategy), then fetches
 hardware details per resource.
 """
 
-import json
+import asyncio
+import logging
 import re
 
-from ..generators.incremental import compute_entity_hash
-from ..generators.judge import evaluate_pairs
+from ..generators.incremental import hash_serialized
+from ..json_utils import dumps_canonical, find_json_array
 from ..llm_client import BaseLLMClient, get_judge_client, get_llm_client
 from ..models import ExtractionResult, QAPair
 from ..question_categories import (
@@ -20,16 +21,62 @@ from ..question_categories import (
     build_discovery_system_prompt,
     build_user_prompt,
 )
-from .base import BaseExtractor, ExtractionOutput, ExtractionReport
+from .base import (
+    BaseExtractor,
+    ExtractionOutput,
+    ExtractionReport,
+    QAItem,
+    chunked,
+    parse_qa_items,
+)
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_STATUS_SUFFIX_RE = re.compile(r"\s*-\s*(COMING SOON|RETIRED|BETA).*$", re.IGNORECASE)
+_COMING_SOON_RE = re.compile(r"\s*\(coming soon\)", re.IGNORECASE)
+# Both GPU patterns in one scan. The zero-width lookahead lets a model name
+# inside "NVIDIA A100 40GB" match on its own too ("A100 40GB" and "A100"), as
+# it did when the two patterns were run separately.
+_GPU_RE = re.compile(
+    r"(?=NVIDIA\s+([A-Z]\d+\s*\d*\s*(?:GB)?)|(A100|V100|H100|A40|A30|RTX\s*\d+))",
+    re.IGNORECASE,
+)
+
+# Questions mentioning any of these are tagged "moderate" complexity
+_MODERATE_RE = re.compile(r"specifications|how many|performance|compared", re.IGNORECASE)
+
+# Resource fields kept for the prompt; everything else search_resources returns is noise.
+_USEFUL_RESOURCE_FIELDS = frozenset(
+    {
+        "name",
+        "description",
+        "organization_names",
+        "feature_names",
+        "hasGpu",
+        "resourceType",
+        "accessAllocated",
+    }
+)
+
+# Prompt-size caps for hardware data: characters per item's details, and items
+# per category. Trimmed text ends in "…"; trimmed categories get a
+# "<category>_truncated" flag so the LLM knows the list is partial.
+_MAX_DETAILS_CHARS = 800
+_MAX_HARDWARE_ITEMS = 20
 
 
 def strip_html(text: str) -> str:
-    """Remove HTML tags from text."""
+    """Remove HTML tags from text and collapse whitespace."""
     if not text:
         return text
-    clean = re.sub(r"<[^>]+>", "", text)
-    clean = re.sub(r"\s+", " ", clean).strip()
-    return clean
+    # One regex pass for tags; str.split() collapses the same whitespace \s+ does
+    return " ".join(_TAG_RE.sub("", text).split())
+
+
+def _normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question, for deduplication."""
+    return " ".join(question.lower().split())
 
 
 class ComputeResourcesExtractor(BaseExtractor):
@@ -46,6 +93,11 @@ class ComputeResourcesExtractor(BaseExtractor):
                 self.judge_client = get_judge_client()
             except (ValueError, ImportError):
                 pass
+        # resource ID → in-flight or finished get_resource_hardware call
+        self._hardware_tasks: dict[str, asyncio.Future] = {}
+        # Prefetching starts every hardware task up front; this caps how many
+        # get_resource_hardware calls are actually in flight on the MCP server.
+        self._hardware_semaphore = asyncio.Semaphore(max(1, self.extraction_config.concurrency))
 
     async def report(self) -> ExtractionReport:
         """Fetch all resources from MCP and return coverage stats."""
@@ -81,7 +133,7 @@ class ComputeResourcesExtractor(BaseExtractor):
         system_prompt = build_battery_system_prompt("compute-resources")
 
         # TRACE-TOUR.extract[11] — FOR EACH ENTITY
-        entity_count = 0
+        selected: list[tuple[str, dict]] = []
         for resource in resources:
             resource_id = resource.get("id", "")
             resource_name = resource.get("name", "")
@@ -100,124 +152,250 @@ class ComputeResourcesExtractor(BaseExtractor):
 
             # Respect max_entities limit
             if self.extraction_config.max_entities is not None:
-                if entity_count >= self.extraction_config.max_entities:
+                if len(selected) >= self.extraction_config.max_entities:
                     break
-            entity_count += 1
+            selected.append((resource_id, resource))
+
+        # Start every hardware fetch now, so later resources don't wait for a
+        # concurrency slot just to make their MCP call; _fetch_hardware picks
+        # up the running task.
+        for resource_id, _ in selected:
+            self._hardware_task(resource_id)
+
+        # Resources are independent: overlap their hardware fetches, LLM calls,
+        # and judge calls instead of running them one resource at a time.
+        batch_size = self.extraction_config.batch_size
+        if batch_size > 1:
+            batch_results = await self._gather_bounded(
+                lambda batch: self._process_batch(batch, system_prompt),
+                chunked(selected, batch_size),
+            )
+            results = [result for batch in batch_results for result in batch]
+        else:
+            results = await self._gather_bounded(
+                lambda item: self._process_resource(*item, system_prompt), selected
+            )
 
-            # Fetch hardware details
-            hardware = {}
-            try:
-                hw_result = await self.client.call_tool(
-                    "get_resource_hardware", {"id": resource_id}
+        for (resource_id, _), (resource_pairs, raw_entry) in zip(selected, results):
+            pairs.extend(resource_pairs)
+            raw_data[resource_id] = raw_entry
+
+        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+
+    async def _process_batch(
+        self, batch: list[tuple[str, dict]], system_prompt: str
+    ) -> list[tuple[ExtractionResult, dict]]:
+        """Share one battery call across a batch of resources, then finish each.
+
+        Hardware is fetched for the whole batch first, since it is part of the
+        prompt. Cached resources are left out of the batched prompt. Each
+        resource then runs its own discovery, judge, and cache store,
+        concurrently with the rest of the batch.
+        """
+        hardware = await asyncio.gather(*(self._fetch_hardware(rid) for rid, _ in batch))
+        prepared = [
+            self._prepare_resource(resource_id, resource, hw)
+            for (resource_id, resource), hw in zip(batch, hardware)
+        ]
+
+        to_generate = [
+            (resource_id, entity_data, entity_data.get("name", ""))
+            for (resource_id, _), (entity_data, _, _, _, cached) in zip(batch, prepared)
+            if cached is None
+        ]
+
+        batteries: dict[str, list[QAItem]] = {}
+        if len(to_generate) > 1:
+            batteries = await self._generate_battery_batch(
+                "compute-resources", system_prompt, to_generate
+            )
+
+        return await asyncio.gather(
+            *(
+                self._process_resource(
+                    resource_id,
+                    resource,
+                    system_prompt,
+                    hardware=hw,
+                    battery=batteries.get(resource_id),
+                    prepared=prep,
                 )
-                hardware = hw_result
-            except Exception:
-                pass
+                for (resource_id, resource), hw, prep in zip(batch, hardware, prepared)
+            )
+        )
 
-            # Clean up data for LLM
-            clean_resource = self._clean_resource_data(resource)
-            clean_hardware = self._clean_hardware_data(hardware)
+    async def _process_resource(
+        self,
+        resource_id: str,
+        resource: dict,
+        system_prompt: str,
+        hardware: dict | None = None,
+        battery: list[QAItem] | None = None,
+        prepared: tuple[dict, dict, str, str, ExtractionResult | None] | None = None,
+    ) -> tuple[ExtractionResult, dict]:
+        """Fetch hardware, generate (or replay cached) pairs, and judge one resource.
+
+        hardware and battery, when given, were already fetched/generated for a
+        batch and skip the MCP call and the battery LLM call. prepared is the
+        resource's _prepare_resource() result when the caller already built it.
+
+        Returns the resource's pairs and its normalized raw_data entry.
+        """
+        if hardware is None:
+            hardware = await self._fetch_hardware(resource_id)
+        if prepared is None:
+            prepared = self._prepare_resource(resource_id, resource, hardware)
+        entity_data, source_data, entity_json, entity_hash, resource_pairs = prepared
+
+        if resource_pairs is None:
+            # Generate Q&A pairs using LLM (freeform — variable count)
+            resource_pairs = await self._generate_qa_pairs(
+                resource_id, entity_data, entity_json, source_data, system_prompt, battery
+            )
 
-            # Merge hardware into entity data so the generic user prompt works
-            entity_data = {**clean_resource}
-            if clean_hardware:
-                entity_data["hardware"] = clean_hardware
+            # TRACE-TOUR.extract[16] — evaluate_pairs()
+            if self.judge_client:
+                await self._judge_pairs(resource_pairs, source_data)
 
-            # TRACE-TOUR.extract[12] — [CACHE HIT] / extract[13] — [CACHE MISS]
-            entity_hash = compute_entity_hash(entity_data)
-            used_cache = False
+            # TRACE-TOUR.extract[17] — cache.store()
             if self.incremental_cache:
-                if self.incremental_cache.is_unchanged(
-                    "compute-resources", resource_id, entity_hash
-                ):
-                    cached_pairs = self.incremental_cache.get_cached_pairs(
-                        "compute-resources", resource_id
-                    )
-                    if cached_pairs:
-                        pairs.extend(cached_pairs)
-                        used_cache = True
-
-            if not used_cache:
-                source_data = {
-                    "resource": clean_resource,
-                    "hardware": clean_hardware if clean_hardware else None,
-                }
-
-                # Generate Q&A pairs using LLM (freeform — variable count)
-                resource_pairs = await self._generate_qa_pairs(
-                    resource_id, entity_data, source_data, system_prompt
+                self.incremental_cache.store(
+                    "compute-resources",
+                    resource_id,
+                    entity_hash,
+                    resource_pairs,
                 )
-                pairs.extend(resource_pairs)
-
-                # TRACE-TOUR.extract[16] — evaluate_pairs()
-                if self.judge_client:
-                    evaluate_pairs(resource_pairs, source_data, self.judge_client)
-
-                # TRACE-TOUR.extract[17] — cache.store()
-                if self.incremental_cache:
-                    self.incremental_cache.store(
-                        "compute-resources",
-                        resource_id,
-                        entity_hash,
-                        resource_pairs,
-                    )
 
-            raw_data[resource_id] = {
-                "name": self._clean_name(resource_name),
-                "resource_id": resource_id,
-                "organizations": resource.get("organization_names", []),
-                "has_gpu": resource.get("hasGpu", False),
-                "gpu_types": self._extract_gpu_types(clean_hardware),
-                "features": clean_resource.get("feature_names", []),
-                "resource_type": resource.get("resourceType", ""),
-            }
+        clean_resource = source_data["resource"]
+        raw_entry = {
+            "name": self._clean_name(resource.get("name", "")),
+            "resource_id": resource_id,
+            "organizations": resource.get("organization_names", []),
+            "has_gpu": resource.get("hasGpu", False),
+            "gpu_types": self._extract_gpu_types(hardware),
+            "features": clean_resource.get("feature_names", []),
+            "resource_type": resource.get("resourceType", ""),
+        }
+        return resource_pairs, raw_entry
+
+    def _prepare_resource(
+        self, resource_id: str, resource: dict, hardware: dict
+    ) -> tuple[dict, dict, str, str, ExtractionResult | None]:
+        """Clean, serialize, and hash one resource, and look up cached pairs.
+
+        Returns (entity_data, source_data, entity_json, entity_hash, cached
+        pairs or None). Batches call this once per resource and hand the result
+        on, so the cleaning, hashing, and cache read are not repeated.
+        """
+        clean_resource, clean_hardware, entity_data = self._build_entity_data(resource, hardware)
+
+        # Serialized once: the same string is hashed and sent in the prompt.
+        entity_json = dumps_canonical(entity_data)
+
+        # TRACE-TOUR.extract[12] — [CACHE HIT] / extract[13] — [CACHE MISS]
+        entity_hash = hash_serialized(entity_json)
+        source_data = {
+            "resource": clean_resource,
+            "hardware": clean_hardware if clean_hardware else None,
+        }
+        return (
+            entity_data,
+            source_data,
+            entity_json,
+            entity_hash,
+            self._cached_pairs(resource_id, entity_hash),
+        )
+
+    async def _fetch_hardware(self, resource_id: str) -> dict:
+        """Fetch hardware details for one resource ({} if the call fails).
 
-        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+        Memoized per extractor: concurrent or repeated requests for the same
+        resource ID share one MCP call.
+        """
+        return await self._hardware_task(resource_id)
+
+    def _hardware_task(self, resource_id: str) -> asyncio.Future:
+        """Start (or reuse) the hardware fetch for a resource without awaiting it."""
+        task = self._hardware_tasks.get(resource_id)
+        if task is None:
+            task = asyncio.ensure_future(self._call_hardware(resource_id))
+            self._hardware_tasks[resource_id] = task
+        return task
+
+    async def _call_hardware(self, resource_id: str) -> dict:
+        async with self._hardware_semaphore:
+            try:
+                hardware = await self.client.call_tool(
+                    "get_resource_hardware", {"id": resource_id}
+                )
+            except Exception as e:
+                logger.warning(
+                    "Hardware fetch failed for %s, continuing without hardware: %s",
+                    resource_id,
+                    e,
+                )
+                return {}
+        if not hardware:
+            logger.info("No hardware details for %s", resource_id)
+        return hardware
+
+    def _build_entity_data(self, resource: dict, hardware: dict) -> tuple[dict, dict, dict]:
+        """Clean resource and hardware data for the LLM.
+
+        Returns (clean_resource, clean_hardware, entity_data), where entity_data
+        merges hardware into the resource so the generic user prompt works.
+        """
+        clean_resource = self._clean_resource_data(resource)
+        clean_hardware = self._clean_hardware_data(hardware)
+
+        entity_data = {**clean_resource}
+        if clean_hardware:
+            entity_data["hardware"] = clean_hardware
+        return clean_resource, clean_hardware, entity_data
+
+    def _cached_pairs(self, resource_id: str, entity_hash: str) -> ExtractionResult | None:
+        """Return --incremental cached pairs if the resource is unchanged, else None."""
+        cache = self.incremental_cache
+        if cache and cache.is_unchanged("compute-resources", resource_id, entity_hash):
+            return cache.get_cached_pairs("compute-resources", resource_id) or None
+        return None
 
     def _clean_name(self, name: str) -> str:
         """Clean resource name by removing status indicators."""
-        name = re.sub(r"\s*-\s*(COMING SOON|RETIRED|BETA).*$", "", name, flags=re.IGNORECASE)
-        name = re.sub(r"\s*\(coming soon\)", "", name, flags=re.IGNORECASE)
+        name = _STATUS_SUFFIX_RE.sub("", name)
+        name = _COMING_SOON_RE.sub("", name)
         return name.strip()
 
     def _extract_gpu_types(self, hardware: dict) -> list[str]:
-        """Extract GPU type names from hardware data."""
+        """Extract GPU type names from raw get_resource_hardware data.
+
+        Reads the full payload rather than the prompt-capped cleaned copy, so
+        GPUs past _MAX_HARDWARE_ITEMS or _MAX_DETAILS_CHARS are still listed.
+        """
         gpu_types = []
         if not hardware:
             return gpu_types
+        hardware = hardware.get("hardware", hardware)
 
         for gpu in hardware.get("gpus", []):
             gpu_name = gpu.get("name", "")
             if gpu_name:
                 gpu_types.append(gpu_name)
 
+        seen = set(gpu_types)
         for node in hardware.get("compute_nodes", []):
-            details = node.get("details", "")
-            gpu_patterns = [
-                r"NVIDIA\s+([A-Z]\d+\s*\d*\s*(?:GB)?)",
-                r"(A100|V100|H100|A40|A30|RTX\s*\d+)",
-            ]
-            for pattern in gpu_patterns:
-                matches = re.findall(pattern, details, re.IGNORECASE)
-                for match in matches:
-                    normalized = match.strip().upper()
-                    if normalized and normalized not in gpu_types:
-                        gpu_types.append(normalized)
+            details = strip_html(node.get("details", ""))
+            for match in _GPU_RE.finditer(details):
+                normalized = (match.group(1) or match.group(2)).strip().upper()
+                if normalized and normalized not in seen:
+                    seen.add(normalized)
+                    gpu_types.append(normalized)
 
         return gpu_types
 
     def _clean_resource_data(self, resource: dict) -> dict:
         """Clean resource data for LLM consumption."""
-        useful_fields = [
-            "name",
-            "description",
-            "organization_names",
-            "feature_names",
-            "hasGpu",
-            "resourceType",
-            "accessAllocated",
-        ]
-        cleaned = {k: v for k, v in resource.items() if k in useful_fields}
+        cleaned = {k: v for k, v in resource.items() if k in _USEFUL_RESOURCE_FIELDS}
 
         if "feature_names" in cleaned:
             cleaned["feature_names"] = [
@@ -230,7 +408,7 @@ class ComputeResourcesExtractor(BaseExtractor):
         return cleaned
 
     def _clean_hardware_data(self, hardware: dict) -> dict:
-        """Clean hardware data for LLM consumption."""
+        """Clean hardware data for LLM consumption, capped at the prompt-size limits."""
         if not hardware:
             return {}
 
@@ -241,86 +419,115 @@ class ComputeResourcesExtractor(BaseExtractor):
             if category in hw and hw[category]:
                 items = []
                 for item in hw[category]:
-                    cleaned_item = {
-                        "name": item.get("name", ""),
-                        "type": item.get("type", ""),
-                        "details": strip_html(item.get("details", "")),
-                    }
-                    if cleaned_item["details"] and len(cleaned_item["details"]) > 50:
-                        items.append(cleaned_item)
+                    details = strip_html(item.get("details", ""))
+                    if len(details) <= 50:
+                        continue
+                    if len(details) > _MAX_DETAILS_CHARS:
+                        details = details[:_MAX_DETAILS_CHARS].rstrip() + "…"
+                    items.append(
+                        {
+                            "name": item.get("name", ""),
+                            "type": item.get("type", ""),
+                            "details": details,
+                        }
+                    )
+                if len(items) > _MAX_HARDWARE_ITEMS:
+                    items = items[:_MAX_HARDWARE_ITEMS]
+                    result[f"{category}_truncated"] = True
                 if items:
                     result[category] = items
 
         return result
 
     async def _generate_qa_pairs(
-        self, resource_id: str, entity_data: dict, source_data: dict, system_prompt: str
+        self,
+        resource_id: str,
+        entity_data: dict,
+        entity_json: str,
+        source_data: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
     ) -> ExtractionResult:
-        """Use LLM to generate Q&A pairs from resource data."""
+        """Use LLM to generate Q&A pairs from resource data.
+
+        entity_json is entity_data as serialized by dumps_canonical().
+        A precomputed battery (from a batched call) skips the battery call.
+        """
         pairs: ExtractionResult = []
 
-        entity_json = json.dumps(entity_data, indent=2)
         user_prompt = build_user_prompt(
             "compute-resources", resource_id, entity_json,
             entity_name=entity_data.get("name", ""),
         )
 
         try:
-            # TRACE-TOUR.extract[14] — llm.generate() battery
-            response = self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                max_tokens=self.extraction_config.max_tokens,
-            )
-
-            qa_list = self._parse_qa_response(response.text)
-
-            # TRACE-TOUR.extract[15] — llm.generate() discovery
-            if qa_list:
-                existing = [{"question": qa["question"], "answer": qa["answer"]} for qa in qa_list]
-                discovery_prompt = build_discovery_system_prompt("compute-resources", existing)
-                discovery_response = self.llm.generate(
-                    system=discovery_prompt,
-                    user=user_prompt,
-                    max_tokens=self.extraction_config.max_tokens,
-                )
-                qa_list.extend(self._parse_qa_response(discovery_response.text))
-
+            if battery is None and self.extraction_config.parallel_discovery:
+                qa_list = await self._generate_parallel(system_prompt, user_prompt)
+            else:
+                if battery is None:
+                    # TRACE-TOUR.extract[14] — llm.generate() battery
+                    response = await self._generate(
+                        system_prompt, user_prompt, cache_system=True
+                    )
+                    qa_list = self._parse_qa_response(response.text)
+                else:
+                    qa_list = list(battery)
+
+                # TRACE-TOUR.extract[15] — llm.generate() discovery
+                if qa_list:
+                    existing = [{"question": qa.question, "answer": qa.answer} for qa in qa_list]
+                    discovery_prompt = build_discovery_system_prompt("compute-resources", existing)
+                    discovery_response = await self._generate(discovery_prompt, user_prompt)
+                    qa_list.extend(self._parse_qa_response(discovery_response.text))
+
+            # parse_qa_items already dropped items without a question and answer
             for seq_n, qa in enumerate(qa_list, start=1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-
-                if question and answer:
-                    pair_id = f"compute-resources_{resource_id}_{seq_n}"
-
-                    complexity = "simple"
-                    if any(
-                        term in question.lower()
-                        for term in ["specifications", "how many", "performance", "compared"]
-                    ):
-                        complexity = "moderate"
-
-                    pairs.append(
-                        QAPair.create(
-                            id=pair_id,
-                            question=question,
-                            answer=answer,
-                            source_ref=f"mcp://compute-resources/resources/{resource_id}",
-                            domain="compute-resources",
-                            complexity=complexity,
-                            source_data=source_data,
-                        )
+                question = qa.question
+
+                complexity = "moderate" if _MODERATE_RE.search(question) else "simple"
+
+                pairs.append(
+                    QAPair.create(
+                        id=f"compute-resources_{resource_id}_{seq_n}",
+                        question=question,
+                        answer=qa.answer,
+                        source_ref=f"mcp://compute-resources/resources/{resource_id}",
+                        domain="compute-resources",
+                        complexity=complexity,
+                        source_data=source_data,
                     )
+                )
 
         except Exception as e:
-            print(f"Error generating Q&A for {resource_id}: {e}")
+            logger.warning("Error generating Q&A for %s: %s", resource_id, e)
 
         return pairs
 
+    async def _generate_parallel(self, system_prompt: str, user_prompt: str) -> list[QAItem]:
+        """Run the battery and a blind discovery call at the same time.
+
+        The discovery call gets no existing pairs, so its system prompt is the
+        same for every resource. Discovery questions that repeat a battery
+        question (ignoring case and spacing) are dropped.
+        """
+        discovery_prompt = build_discovery_system_prompt("compute-resources", [])
+        response, discovery_response = await asyncio.gather(
+            self._generate(system_prompt, user_prompt, cache_system=True),
+            self._generate(discovery_prompt, user_prompt, cache_system=True),
+        )
+        qa_list = self._parse_qa_response(response.text)
+        if not qa_list:
+            return qa_list
+
+        seen = {_normalize_question(qa.question) for qa in qa_list}
+        for qa in self._parse_qa_response(discovery_response.text):
+            key = _normalize_question(qa.question)
+            if key not in seen:
+                seen.add(key)
+                qa_list.append(qa)
+        return qa_list
+
     @staticmethod
-    def _parse_qa_response(response_text: str) -> list[dict]:
+    def _parse_qa_response(response_text: str) -> list[QAItem]:
         """Parse a JSON array of Q&A pairs from an LLM response."""
-        json_match = re.search(r"\[[\s\S]*\]", response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return []
+        return parse_qa_items(find_json_array(response_text))
@@ -8,13 +8,15 @@ as the data warrants, guided by per-domain key areas but not constrained
 to them.
 """
 
-import json
+import asyncio
+import logging
 import re
+from collections.abc import AsyncIterator
 
 import httpx
 
 from ..generators.incremental import compute_entity_hash
-from ..generators.judge import evaluate_pairs
+from ..json_utils import dumps_compact, find_json_array, loads
 from ..llm_client import BaseLLMClient, get_judge_client, get_llm_client
 from ..models import ExtractionResult, QAPair
 from ..question_categories import (
@@ -22,7 +24,16 @@ from ..question_categories import (
     build_discovery_system_prompt,
     build_user_prompt,
 )
-from .base import BaseExtractor, ExtractionOutput, ExtractionReport
+from ..resilience import CircuitBreaker, call_with_retry
+from .base import (
+    BaseExtractor,
+    ExtractionOutput,
+    ExtractionReport,
+    QAItem,
+    parse_qa_items,
+)
+
+logger = logging.getLogger(__name__)
 
 NSF_API_URL = "https://api.nsf.gov/services/v1/awards.json"
 
@@ -49,25 +60,73 @@ NSF_PRINT_FIELDS = ",".join(
 
 NSF_PAGE_SIZE = 100  # Max allowed by NSF API
 
+# Max page requests in flight at once while paginating the NSF API
+PAGE_FETCH_CONCURRENCY = 8
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# (prompt name, MCP-normalized name) for the fields _clean_award_data renames,
+# then the fields it passes through under their own names. Empty values are
+# dropped; the order here is the order the LLM sees.
+_RENAMED_FIELDS = (
+    ("title", "title"),
+    ("principal_investigator", "principalInvestigator"),
+    ("institution", "institution"),
+    ("total_intended_award", "totalIntendedAward"),
+    ("fund_program_name", "fundProgramName"),
+    ("primary_program_budget_code", "primaryProgramCode"),
+)
+_OPTIONAL_FIELDS = ("startDate", "endDate", "totalAwardedToDate", "programOfficer")
+
+# Awards with fewer than _MIN_INFORMATIVE_FIELDS of these (cleaned names) carry
+# little beyond a title and PI; they get no LLM calls, only a raw_data entry.
+_INFORMATIVE_FIELDS = ("abstract", "startDate", "total_intended_award", "fund_program_name")
+_MIN_INFORMATIVE_FIELDS = 2
+
+# Questions mentioning any of these are tagged "moderate" complexity
+_MODERATE_RE = re.compile(r"how to|steps|process|compare", re.IGNORECASE)
+
 
 def strip_html(text: str) -> str:
     """Remove HTML tags from text."""
     if not text:
         return text
-    clean = re.sub(r"<[^>]+>", "", text)
-    clean = re.sub(r"\s+", " ", clean).strip()
-    return clean
+    # Most abstracts are plain text; skip the tag pass when there are no tags
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    # str.split() collapses the same whitespace \s+ does, without the regex engine
+    return " ".join(text.split())
 
 
 def _format_currency(amount_str: str) -> str:
     """Format a numeric string as USD currency (e.g., '1234567' → '$1,234,567')."""
     if not amount_str:
         return ""
+    if not isinstance(amount_str, str):
+        # Decoded JSON numbers (or other stray types): format like int() did,
+        # and pass anything int() rejects through unchanged
+        try:
+            return f"${int(amount_str):,}"
+        except (ValueError, TypeError, OverflowError):
+            return amount_str
+    # Check the digits up front instead of catching int()'s ValueError
+    digits = amount_str[1:] if amount_str[0] == "-" else amount_str
+    if digits.isdecimal():
+        return f"${int(amount_str):,}"
+    return amount_str
+
+
+def _total_count(awards_wrapper: dict) -> int | None:
+    """Total matching awards reported by the API, or None if it reports none.
+
+    The count is read from ``metadata.totalCount`` when present. Without
+    it, pagination falls back to stopping at the first short page.
+    """
+    metadata = awards_wrapper.get("metadata") or {}
     try:
-        amount = int(amount_str)
-        return f"${amount:,}"
-    except (ValueError, TypeError):
-        return amount_str
+        return int(metadata["totalCount"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 def _transform_nsf_award(raw: dict) -> dict:
@@ -131,27 +190,53 @@ class NSFAwardsExtractor(BaseExtractor):
                 self.judge_client = get_judge_client()
             except (ValueError, ImportError):
                 pass
+        self._skipped_sparse = 0
+        self._http: httpx.AsyncClient | None = None
+        self._api_breaker = CircuitBreaker("nsf-awards API")
+        # Same for every page; _get_page adds the offset and page size
+        self._base_params = self._build_query_params()
 
     async def run(self) -> ExtractionOutput:
         """Run extraction — no MCPClient needed (uses direct API)."""
         # Overrides BaseExtractor.run() which creates an MCPClient context.
         # This extractor fetches from api.nsf.gov directly.
-        return await self.extract()
+        try:
+            return await self.extract()
+        finally:
+            await self.aclose()
 
     async def run_report(self) -> ExtractionReport:
         """Run report — no MCPClient needed (uses direct API)."""
-        return await self.report()
+        try:
+            return await self.report()
+        finally:
+            await self.aclose()
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use.
+
+        One client per extractor keeps connections alive across report()
+        and every page of the pagination loop.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=PAGE_FETCH_CONCURRENCY,
+                    max_keepalive_connections=PAGE_FETCH_CONCURRENCY,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def report(self) -> ExtractionReport:
         """Fetch first page to get a sample and estimate total."""
-        params = self._build_query_params()
-        params["offset"] = 1
-        params["rpp"] = NSF_PAGE_SIZE
-
-        async with httpx.AsyncClient(timeout=30.0) as http:
-            resp = await http.get(NSF_API_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        data = await self._get_page(offset=1)
 
         awards_wrapper = data.get("response", {})
         raw_awards = awards_wrapper.get("award", [])
@@ -191,152 +276,274 @@ class NSFAwardsExtractor(BaseExtractor):
         """
         return {"printFields": NSF_PRINT_FIELDS}
 
-    async def _fetch_all_awards(self) -> list[dict]:
-        """Paginate the NSF API and return all awards (MCP-normalized format).
+    async def _get_page(self, offset: int) -> dict:
+        """GET one page of the NSF API (1-indexed offset, NSF_PAGE_SIZE awards).
 
-        Uses offset-based pagination (1-indexed, rpp=100 max).
-        Stops when fewer than 100 results returned or --max-entities cap hit.
+        A 429/5xx or dropped connection on one page is retried with backoff
+        (honoring Retry-After) instead of aborting the whole pagination run.
         """
-        all_awards: list[dict] = []
-        max_entities = self.extraction_config.max_entities
-        offset = 1
+        http = self._get_http()
+        params = {**self._base_params, "offset": offset, "rpp": NSF_PAGE_SIZE}
 
-        async with httpx.AsyncClient(timeout=30.0) as http:
-            while True:
-                params = self._build_query_params()
-                params["offset"] = offset
-                params["rpp"] = NSF_PAGE_SIZE
+        async def fetch() -> dict:
+            resp = await http.get(NSF_API_URL, params=params)
+            resp.raise_for_status()
+            # Decode the raw body with orjson (when installed), not httpx's stdlib json
+            return loads(resp.content)
 
-                resp = await http.get(NSF_API_URL, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+        return await call_with_retry(fetch, breaker=self._api_breaker)
 
-                awards_wrapper = data.get("response", {})
-                raw_awards = awards_wrapper.get("award", [])
+    async def _iter_award_pages(self) -> AsyncIterator[list[dict]]:
+        """Paginate the NSF API, yielding each page's awards (MCP-normalized).
 
-                if not raw_awards:
-                    break
+        Uses offset-based pagination (1-indexed, rpp=100 max). Page 1 is
+        fetched alone; after that, pages are requested in concurrent windows
+        of up to PAGE_FETCH_CONCURRENCY and yielded in page order. Stops at
+        the first short page, the API's total count if it reports one, or
+        the --max-entities cap. Awards are deduplicated by award number as
+        pages arrive (offset paging can repeat an award across pages); the
+        first copy wins and later copies are left out of their page.
+        """
+        seen: set[str] = set()
+        max_entities = self.extraction_config.max_entities
 
-                transformed = [_transform_nsf_award(a) for a in raw_awards]
-                all_awards.extend(transformed)
+        awards_wrapper = (await self._get_page(offset=1)).get("response", {})
+        total = _total_count(awards_wrapper)
+        last_page = -(-total // NSF_PAGE_SIZE) if total else None
+
+        pages = [awards_wrapper.get("award", [])]
+        page_num = 0
+        while pages:
+            for raw_awards in pages:
+                page_num += 1
+                page_awards = []
+                for raw in raw_awards:
+                    award = _transform_nsf_award(raw)
+                    award_number = str(award["awardNumber"])
+                    if award_number and award_number not in seen:
+                        seen.add(award_number)
+                        page_awards.append(award)
+
+                if max_entities and len(seen) >= max_entities:
+                    yield page_awards[: len(page_awards) - (len(seen) - max_entities)]
+                    return
 
-                page_num = (offset - 1) // NSF_PAGE_SIZE + 1
                 if page_num == 1 or page_num % 50 == 0:
-                    print(f"  NSF API page {page_num}: {len(all_awards)} total awards")
-
-                if max_entities and len(all_awards) >= max_entities:
-                    return all_awards[:max_entities]
+                    logger.info("  NSF API page %d: %d total awards", page_num, len(seen))
+                yield page_awards
 
                 if len(raw_awards) < NSF_PAGE_SIZE:
-                    break  # Last page
+                    pages = []  # Last page
+                    break
+            else:
+                window = PAGE_FETCH_CONCURRENCY
+                if max_entities:
+                    window = min(window, -(-(max_entities - len(seen)) // NSF_PAGE_SIZE))
+                if last_page is not None:
+                    window = min(window, last_page - page_num)
 
-                offset += NSF_PAGE_SIZE
+                offsets = [(page_num + i) * NSF_PAGE_SIZE + 1 for i in range(window)]
+                responses = await asyncio.gather(*(self._get_page(offset=o) for o in offsets))
+                pages = [r.get("response", {}).get("award", []) for r in responses]
 
-        print(f"  NSF API: {len(all_awards)} total awards fetched")
-        return all_awards
+        logger.info("  NSF API: %d total awards fetched", len(seen))
 
     async def extract(self) -> ExtractionOutput:
-        """Extract Q&A pairs for all NSF awards."""
+        """Extract Q&A pairs for all NSF awards.
+
+        Awards are handed to LLM workers page by page as the paginator
+        yields them, so generation overlaps the rest of the fetch instead
+        of waiting for the full crawl.
+        """
         pairs: ExtractionResult = []
         raw_data: dict = {}
 
-        awards = await self._fetch_all_awards()
-        print(f"  Fetched {len(awards)} awards, generating Q&A pairs...")
-
         system_prompt = build_battery_system_prompt("nsf-awards")
+        batch_size = self.extraction_config.batch_size
+        # Awards are independent: overlap their LLM and judge calls instead of
+        # running them one award at a time, at most `concurrency` at once.
+        semaphore = asyncio.Semaphore(max(1, self.extraction_config.concurrency))
+
+        async def process(chunk: list[tuple[str, dict]]) -> list[tuple[list, dict]]:
+            async with semaphore:
+                if batch_size > 1:
+                    return await self._process_batch(chunk, system_prompt)
+                return [await self._process_award(*chunk[0], system_prompt)]
+
+        # The paginator already dropped duplicate award numbers. Only the
+        # numbers are kept here; each award dict is held just until its task runs.
+        selected: list[str] = []
+        pending: list[tuple[str, dict]] = []
+        tasks: list[asyncio.Task] = []
+        try:
+            async for page_awards in self._iter_award_pages():
+                for award in page_awards:
+                    award_number = str(award.get("awardNumber", ""))
+                    title = award.get("title", "")
+                    if not award_number or not title:
+                        continue
+
+                    # Filter to specific entity IDs if requested
+                    if self.extraction_config.entity_ids is not None:
+                        if award_number not in self.extraction_config.entity_ids:
+                            continue
+
+                    # Respect max_entities limit
+                    if self.extraction_config.max_entities is not None:
+                        if len(selected) >= self.extraction_config.max_entities:
+                            continue
+                    selected.append(award_number)
+                    pending.append((award_number, award))
+                    if len(pending) >= batch_size:
+                        tasks.append(asyncio.create_task(process(pending)))
+                        pending = []
+            if pending:
+                tasks.append(asyncio.create_task(process(pending)))
+
+            logger.info("  Fetched %d awards, finishing Q&A generation...", len(selected))
+            chunk_results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        results = [result for chunk in chunk_results for result in chunk]
+        for award_number, (award_pairs, raw_entry) in zip(selected, results):
+            pairs.extend(award_pairs)
+            raw_data[award_number] = raw_entry
+
+        if self._skipped_sparse:
+            logger.info(
+                "  Skipped Q&A for %d awards with too little data", self._skipped_sparse
+            )
 
-        entity_count = 0
-        seen_ids: set[str] = set()
+        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
 
-        for award in awards:
-            award_number = str(award.get("awardNumber", ""))
-            title = award.get("title", "")
-            if not award_number or not title:
-                continue
+    async def _process_batch(
+        self, batch: list[tuple[str, dict]], system_prompt: str
+    ) -> list[tuple[ExtractionResult, dict]]:
+        """Share one battery call across a batch of awards, then finish each.
 
-            if award_number in seen_ids:
-                continue
-            seen_ids.add(award_number)
+        Cached awards are left out of the batched prompt. Each award then runs
+        its own discovery, judge, and cache store, concurrently with the rest
+        of the batch.
+        """
+        prepared = [self._prepare_award(award_number, award) for award_number, award in batch]
+        to_generate = [
+            (award_number, clean_award, clean_award.get("title", ""))
+            for (award_number, _), (clean_award, _, cached) in zip(batch, prepared)
+            if cached is None and not self._is_sparse(clean_award)
+        ]
+
+        batteries: dict[str, list[QAItem]] = {}
+        if len(to_generate) > 1:
+            batteries = await self._generate_battery_batch(
+                "nsf-awards", system_prompt, to_generate
+            )
 
-            # Filter to specific entity IDs if requested
-            if self.extraction_config.entity_ids is not None:
-                if award_number not in self.extraction_config.entity_ids:
-                    continue
+        return await asyncio.gather(
+            *(
+                self._process_award(
+                    award_number,
+                    award,
+                    system_prompt,
+                    battery=batteries.get(award_number),
+                    prepared=prep,
+                )
+                for (award_number, award), prep in zip(batch, prepared)
+            )
+        )
 
-            # Respect max_entities limit
-            if self.extraction_config.max_entities is not None:
-                if entity_count >= self.extraction_config.max_entities:
-                    break
-            entity_count += 1
+    async def _process_award(
+        self,
+        award_number: str,
+        award: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
+        prepared: tuple[dict, str, ExtractionResult | None] | None = None,
+    ) -> tuple[ExtractionResult, dict]:
+        """Generate (or replay cached) pairs for one award and judge them.
+
+        battery, when given, came from a batched call and skips the battery
+        LLM call. prepared is the award's _prepare_award() result when the
+        caller already computed it. Returns the award's pairs and its
+        raw_data entry.
+        """
+        if prepared is None:
+            prepared = self._prepare_award(award_number, award)
+        clean_award, entity_hash, award_pairs = prepared
+
+        if award_pairs is None and self._is_sparse(clean_award):
+            self._skipped_sparse += 1
+            award_pairs = []
+        elif award_pairs is None:
+            award_pairs = await self._generate_qa_pairs(
+                award_number, clean_award, system_prompt, battery
+            )
 
-            clean_award = self._clean_award_data(award)
+            # Judge evaluation: score all pairs for this entity
+            if self.judge_client:
+                await self._judge_pairs(award_pairs, {"award": clean_award})
 
-            # Incremental: skip if entity data unchanged
-            entity_hash = compute_entity_hash(clean_award)
-            used_cache = False
             if self.incremental_cache:
-                if self.incremental_cache.is_unchanged("nsf-awards", award_number, entity_hash):
-                    cached_pairs = self.incremental_cache.get_cached_pairs(
-                        "nsf-awards", award_number
-                    )
-                    if cached_pairs:
-                        pairs.extend(cached_pairs)
-                        used_cache = True
-
-            if not used_cache:
-                award_pairs = await self._generate_qa_pairs(
-                    award_number, clean_award, system_prompt
+                self.incremental_cache.store(
+                    "nsf-awards",
+                    award_number,
+                    entity_hash,
+                    award_pairs,
                 )
-                pairs.extend(award_pairs)
-
-                # Judge evaluation: score all pairs for this entity
-                if self.judge_client:
-                    evaluate_pairs(award_pairs, {"award": clean_award}, self.judge_client)
-
-                if self.incremental_cache:
-                    self.incremental_cache.store(
-                        "nsf-awards",
-                        award_number,
-                        entity_hash,
-                        award_pairs,
-                    )
 
-            raw_data[award_number] = {
-                "name": title,
-                "award_number": award_number,
-                "pi": award.get("principalInvestigator", ""),
-                "institution": award.get("institution", ""),
-                "total_award": award.get("totalIntendedAward", ""),
-                "fund_program_name": award.get("fundProgramName", ""),
-                "has_co_pis": bool(award.get("coPIs")),
-            }
-
-        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
-
-    def _clean_award_data(self, award: dict) -> dict:
-        """Clean award data for LLM consumption."""
-        cleaned = {
-            "title": award.get("title", ""),
-            "principal_investigator": award.get("principalInvestigator", ""),
+        raw_entry = {
+            "name": award.get("title", ""),
+            "award_number": award_number,
+            "pi": award.get("principalInvestigator", ""),
             "institution": award.get("institution", ""),
-            "total_intended_award": award.get("totalIntendedAward", ""),
+            "total_award": award.get("totalIntendedAward", ""),
             "fund_program_name": award.get("fundProgramName", ""),
-            "primary_program_budget_code": award.get("primaryProgramCode", ""),
+            "has_co_pis": bool(award.get("coPIs")),
         }
+        return award_pairs, raw_entry
 
-        for field in [
-            "abstract",
-            "startDate",
-            "endDate",
-            "totalAwardedToDate",
-            "programOfficer",
-        ]:
-            value = award.get(field, "")
-            if value:
-                if field == "abstract":
-                    cleaned[field] = strip_html(value)
-                else:
-                    cleaned[field] = value
+    def _prepare_award(
+        self, award_number: str, award: dict
+    ) -> tuple[dict, str, ExtractionResult | None]:
+        """Clean an award, hash it, and look up --incremental cached pairs.
+
+        Returns (clean_award, entity_hash, cached pairs or None). Batches call
+        this once per award and hand the result on, so the clean, hash, and
+        cache read are not repeated.
+        """
+        clean_award = self._clean_award_data(award)
+        # Incremental: skip if entity data unchanged
+        entity_hash = compute_entity_hash(clean_award)
+        return clean_award, entity_hash, self._cached_pairs(award_number, entity_hash)
+
+    @staticmethod
+    def _is_sparse(clean_award: dict) -> bool:
+        """Whether an award has too little data to be worth any LLM calls."""
+        informative = sum(1 for field in _INFORMATIVE_FIELDS if field in clean_award)
+        return informative < _MIN_INFORMATIVE_FIELDS
+
+    def _cached_pairs(self, award_number: str, entity_hash: str) -> ExtractionResult | None:
+        """Return --incremental cached pairs if the award is unchanged, else None."""
+        cache = self.incremental_cache
+        if cache and cache.is_unchanged("nsf-awards", award_number, entity_hash):
+            return cache.get_cached_pairs("nsf-awards", award_number) or None
+        return None
+
+    def _clean_award_data(self, award: dict) -> dict:
+        """Clean award data for LLM consumption.
+
+        Empty fields are left out: they cost prompt tokens and tell the LLM
+        nothing.
+        """
+        cleaned = {name: award[key] for name, key in _RENAMED_FIELDS if award.get(key)}
+
+        abstract = award.get("abstract")
+        if abstract:
+            cleaned["abstract"] = strip_html(abstract)
+
+        cleaned.update((key, award[key]) for key in _OPTIONAL_FIELDS if award.get(key))
 
         co_pis = award.get("coPIs", [])
         if co_pis:
@@ -345,72 +552,64 @@ class NSFAwardsExtractor(BaseExtractor):
         return cleaned
 
     async def _generate_qa_pairs(
-        self, award_number: str, award: dict, system_prompt: str
+        self,
+        award_number: str,
+        award: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
     ) -> ExtractionResult:
-        """Use LLM to generate Q&A pairs from award data."""
+        """Use LLM to generate Q&A pairs from award data.
+
+        A precomputed battery (from a batched call) skips the battery call.
+        """
         pairs: ExtractionResult = []
 
-        entity_json = json.dumps(award, indent=2)
+        entity_json = dumps_compact(award)
         user_prompt = build_user_prompt(
             "nsf-awards", award_number, entity_json,
             entity_name=award.get("title", ""),
         )
 
         try:
-            response = self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                max_tokens=self.extraction_config.max_tokens,
-            )
-
-            qa_list = self._parse_qa_response(response.text)
+            if battery is None:
+                # Same battery prompt for every award: let the provider cache it
+                response = await self._generate(system_prompt, user_prompt, cache_system=True)
+                qa_list = self._parse_qa_response(response.text)
+            else:
+                qa_list = list(battery)
 
             # Discovery call: find what the battery missed
             if qa_list:
-                existing = [{"question": qa["question"], "answer": qa["answer"]} for qa in qa_list]
+                existing = [{"question": qa.question, "answer": qa.answer} for qa in qa_list]
                 discovery_prompt = build_discovery_system_prompt("nsf-awards", existing)
-                discovery_response = self.llm.generate(
-                    system=discovery_prompt,
-                    user=user_prompt,
-                    max_tokens=self.extraction_config.max_tokens,
-                )
+                discovery_response = await self._generate(discovery_prompt, user_prompt)
                 qa_list.extend(self._parse_qa_response(discovery_response.text))
 
+            # parse_qa_items already dropped items without a question and answer
+            id_prefix = f"nsf-awards_{award_number}_"
+            source_ref = f"mcp://nsf-awards/awards/{award_number}"
             for seq_n, qa in enumerate(qa_list, start=1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-
-                if question and answer:
-                    pair_id = f"nsf-awards_{award_number}_{seq_n}"
-
-                    complexity = "simple"
-                    if any(
-                        term in question.lower()
-                        for term in ["how to", "steps", "process", "compare"]
-                    ):
-                        complexity = "moderate"
-
-                    pairs.append(
-                        QAPair.create(
-                            id=pair_id,
-                            question=question,
-                            answer=answer,
-                            source_ref=f"mcp://nsf-awards/awards/{award_number}",
-                            domain="nsf-awards",
-                            complexity=complexity,
-                            source_data={"award": award},
-                        )
+                question = qa.question
+                complexity = "moderate" if _MODERATE_RE.search(question) else "simple"
+
+                pairs.append(
+                    QAPair.create(
+                        id=f"{id_prefix}{seq_n}",
+                        question=question,
+                        answer=qa.answer,
+                        source_ref=source_ref,
+                        domain="nsf-awards",
+                        complexity=complexity,
+                        source_data={"award": award},
                     )
+                )
 
         except Exception as e:
-            print(f"Error generating Q&A for NSF award {award_number}: {e}")
+            logger.warning("Error generating Q&A for NSF award %s: %s", award_number, e)
 
         return pairs
 
     @staticmethod
-    def _parse_qa_response(response_text: str) -> list[dict]:
+    def _parse_qa_response(response_text: str) -> list[QAItem]:
         """Parse a JSON array of Q&A pairs from an LLM response."""
-        json_match = re.search(r"\[[\s\S]*\]", response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return []
+        return parse_qa_items(find_json_array(response_text))
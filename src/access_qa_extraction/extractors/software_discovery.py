@@ -7,11 +7,12 @@ guided by per-domain key areas but not constrained to them.
 Fetches all software via list_all_software MCP tool (list-all strategy).
 """
 
-import json
+import asyncio
+import logging
 import re
 
 from ..generators.incremental import compute_entity_hash
-from ..generators.judge import evaluate_pairs
+from ..json_utils import dumps_compact, find_json_array
 from ..llm_client import BaseLLMClient, get_judge_client, get_llm_client
 from ..models import ExtractionResult, QAPair
 from ..question_categories import (
@@ -19,7 +20,24 @@ from ..question_categories import (
     build_discovery_system_prompt,
     build_user_prompt,
 )
-from .base import BaseExtractor, ExtractionOutput, ExtractionReport
+from .base import (
+    BaseExtractor,
+    ExtractionOutput,
+    ExtractionReport,
+    QAItem,
+    chunked,
+    parse_qa_items,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fields _clean_software_data copies as-is when non-empty, in prompt order
+_CORE_FIELDS = ("description", "versions", "available_on_resources", "documentation", "website")
+_AI_FIELDS = ("tags", "research_area", "research_field", "software_type", "core_features")
+_MAX_EXAMPLE_CHARS = 1500
+
+# Questions mentioning any of these are tagged "moderate" complexity
+_MODERATE_RE = re.compile(r"how do i|how to|example|versions", re.IGNORECASE)
 
 
 class SoftwareDiscoveryExtractor(BaseExtractor):
@@ -72,9 +90,8 @@ class SoftwareDiscoveryExtractor(BaseExtractor):
 
         system_prompt = build_battery_system_prompt("software-discovery")
 
-        entity_count = 0
         seen_software: set[str] = set()
-
+        selected: list[tuple[str, dict]] = []
         for software in software_list:
             name = software.get("name", "").lower()
             if not name or name in seen_software:
@@ -88,53 +105,134 @@ class SoftwareDiscoveryExtractor(BaseExtractor):
 
             # Respect max_entities limit
             if self.extraction_config.max_entities is not None:
-                if entity_count >= self.extraction_config.max_entities:
+                if len(selected) >= self.extraction_config.max_entities:
                     break
-            entity_count += 1
+            selected.append((name, software))
+
+        # Packages are independent: overlap their LLM and judge calls instead
+        # of running them one package at a time.
+        batch_size = self.extraction_config.batch_size
+        if batch_size > 1:
+            batch_results = await self._gather_bounded(
+                lambda batch: self._process_batch(batch, system_prompt),
+                chunked(selected, batch_size),
+            )
+            results = [result for batch in batch_results for result in batch]
+        else:
+            results = await self._gather_bounded(
+                lambda item: self._process_software(*item, system_prompt), selected
+            )
 
-            # Clean up data for LLM (also serves as source_data for review)
-            clean_software = self._clean_software_data(software)
+        for (name, _), (software_pairs, raw_entry) in zip(selected, results):
+            pairs.extend(software_pairs)
+            raw_data[name] = raw_entry
 
-            # Incremental: skip if entity data unchanged
-            entity_hash = compute_entity_hash(clean_software)
-            used_cache = False
-            if self.incremental_cache:
-                if self.incremental_cache.is_unchanged("software-discovery", name, entity_hash):
-                    cached_pairs = self.incremental_cache.get_cached_pairs(
-                        "software-discovery", name
-                    )
-                    if cached_pairs:
-                        pairs.extend(cached_pairs)
-                        used_cache = True
-
-            if not used_cache:
-                # Generate Q&A pairs using LLM (freeform — variable count)
-                software_pairs = await self._generate_qa_pairs(name, clean_software, system_prompt)
-                pairs.extend(software_pairs)
-
-                # Judge evaluation: score all pairs for this entity
-                if self.judge_client:
-                    evaluate_pairs(software_pairs, clean_software, self.judge_client)
-
-                if self.incremental_cache:
-                    self.incremental_cache.store(
-                        "software-discovery",
-                        name,
-                        entity_hash,
-                        software_pairs,
-                    )
+        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
 
-            # Store normalized data for comparison generation
-            raw_data[name] = {
-                "name": software.get("name", name),
-                "software_id": name,
-                "resources": self._extract_resource_ids(software),
-                "tags": clean_software.get("tags", []),
-                "research_area": clean_software.get("research_area"),
-                "software_type": clean_software.get("software_type"),
-            }
+    async def _process_batch(
+        self, batch: list[tuple[str, dict]], system_prompt: str
+    ) -> list[tuple[ExtractionResult, dict]]:
+        """Share one battery call across a batch of packages, then finish each.
+
+        Unchanged packages (--incremental) are left out of the batched prompt.
+        Each package then runs its own discovery, judge, and cache store,
+        concurrently with the rest of the batch.
+        """
+        prepared = [self._prepare_software(name, software) for name, software in batch]
+        to_generate = [
+            (name, clean_software, clean_software.get("name", name))
+            for (name, _), (clean_software, _, cached) in zip(batch, prepared)
+            if cached is None
+        ]
+
+        batteries: dict[str, list[QAItem]] = {}
+        if len(to_generate) > 1:
+            batteries = await self._generate_battery_batch(
+                "software-discovery", system_prompt, to_generate
+            )
 
-        return ExtractionOutput(pairs=pairs, raw_data=raw_data)
+        return await asyncio.gather(
+            *(
+                self._process_software(
+                    name,
+                    software,
+                    system_prompt,
+                    battery=batteries.get(name),
+                    prepared=prep,
+                )
+                for (name, software), prep in zip(batch, prepared)
+            )
+        )
+
+    async def _process_software(
+        self,
+        name: str,
+        software: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
+        prepared: tuple[dict, str, ExtractionResult | None] | None = None,
+    ) -> tuple[ExtractionResult, dict]:
+        """Generate (or replay cached) pairs for one package and judge them.
+
+        battery, when given, came from a batched call and skips the battery
+        LLM call. prepared is the package's _prepare_software() result when
+        the caller already computed it. Returns the package's pairs and its
+        normalized raw_data entry.
+        """
+        if prepared is None:
+            prepared = self._prepare_software(name, software)
+        clean_software, entity_hash, software_pairs = prepared
+
+        if software_pairs is None:
+            # Generate Q&A pairs using LLM (freeform — variable count)
+            software_pairs = await self._generate_qa_pairs(
+                name, clean_software, system_prompt, battery
+            )
+
+            # Judge evaluation: score all pairs for this entity
+            if self.judge_client:
+                await self._judge_pairs(software_pairs, clean_software)
+
+            if self.incremental_cache:
+                self.incremental_cache.store(
+                    "software-discovery",
+                    name,
+                    entity_hash,
+                    software_pairs,
+                )
+
+        # Store normalized data for comparison generation
+        raw_entry = {
+            "name": software.get("name", name),
+            "software_id": name,
+            "resources": self._extract_resource_ids(software),
+            "tags": clean_software.get("tags", []),
+            "research_area": clean_software.get("research_area"),
+            "software_type": clean_software.get("software_type"),
+        }
+        return software_pairs, raw_entry
+
+    def _prepare_software(
+        self, name: str, software: dict
+    ) -> tuple[dict, str, ExtractionResult | None]:
+        """Clean a package, hash it, and look up --incremental cached pairs.
+
+        Returns (clean_software, entity_hash, cached pairs or None). Batches
+        call this once per package and hand the result on, so the clean, hash,
+        and cache read are not repeated.
+        """
+        # Clean up data for LLM (also serves as source_data for review)
+        clean_software = self._clean_software_data(software)
+        # Incremental: skip if entity data unchanged
+        entity_hash = compute_entity_hash(clean_software)
+        return clean_software, entity_hash, self._cached_pairs(name, entity_hash)
+
+    def _cached_pairs(self, name: str, entity_hash: str) -> ExtractionResult | None:
+        """Return --incremental cached pairs if the package is unchanged, else None."""
+        cache = self.incremental_cache
+        if cache and cache.is_unchanged("software-discovery", name, entity_hash):
+            return cache.get_cached_pairs("software-discovery", name) or None
+        return None
 
     def _extract_resource_ids(self, software: dict) -> list[str]:
         """Extract resource IDs where software is available."""
@@ -166,105 +264,78 @@ class SoftwareDiscoveryExtractor(BaseExtractor):
             cleaned["name"] = self._resolve_display_name(
                 software["name"], software.get("description", "")
             )
-        if software.get("description"):
-            cleaned["description"] = software["description"]
-        if software.get("versions"):
-            cleaned["versions"] = software["versions"]
-        if software.get("available_on_resources"):
-            cleaned["available_on_resources"] = software["available_on_resources"]
-        if software.get("documentation"):
-            cleaned["documentation"] = software["documentation"]
-        if software.get("website"):
-            cleaned["website"] = software["website"]
+        cleaned.update((key, value) for key in _CORE_FIELDS if (value := software.get(key)))
 
         # AI-enhanced metadata
-        ai_meta = software.get("ai_metadata", {})
-        if ai_meta:
-            if ai_meta.get("tags"):
-                cleaned["tags"] = ai_meta["tags"]
-            if ai_meta.get("research_area"):
-                cleaned["research_area"] = ai_meta["research_area"]
-            if ai_meta.get("research_field"):
-                cleaned["research_field"] = ai_meta["research_field"]
-            if ai_meta.get("software_type"):
-                cleaned["software_type"] = ai_meta["software_type"]
-            if ai_meta.get("core_features"):
-                cleaned["core_features"] = ai_meta["core_features"]
-            if ai_meta.get("example_use"):
-                example = ai_meta["example_use"]
-                if len(example) > 1500:
-                    example = example[:1500] + "..."
-                cleaned["example_use"] = example
+        ai_meta = software.get("ai_metadata") or {}
+        cleaned.update((key, value) for key in _AI_FIELDS if (value := ai_meta.get(key)))
+        example = ai_meta.get("example_use")
+        if example:
+            if len(example) > _MAX_EXAMPLE_CHARS:
+                example = example[:_MAX_EXAMPLE_CHARS] + "..."
+            cleaned["example_use"] = example
 
         return cleaned
 
     async def _generate_qa_pairs(
-        self, software_name: str, software: dict, system_prompt: str
+        self,
+        software_name: str,
+        software: dict,
+        system_prompt: str,
+        battery: list[QAItem] | None = None,
     ) -> ExtractionResult:
-        """Use LLM to generate Q&A pairs from software data."""
+        """Use LLM to generate Q&A pairs from software data.
+
+        A precomputed battery (from a batched call) skips the battery call.
+        """
         pairs: ExtractionResult = []
 
-        entity_json = json.dumps(software, indent=2)
+        entity_json = dumps_compact(software)
         user_prompt = build_user_prompt(
             "software-discovery", software_name, entity_json,
             entity_name=software.get("name", software_name),
         )
 
         try:
-            response = self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                max_tokens=self.extraction_config.max_tokens,
-            )
-
-            qa_list = self._parse_qa_response(response.text)
+            if battery is None:
+                # Same battery prompt for every package: let the provider cache it
+                response = await self._generate(system_prompt, user_prompt, cache_system=True)
+                qa_list = self._parse_qa_response(response.text)
+            else:
+                qa_list = list(battery)
 
             # Discovery call: find what the battery missed
             if qa_list:
-                existing = [{"question": qa["question"], "answer": qa["answer"]} for qa in qa_list]
+                existing = [{"question": qa.question, "answer": qa.answer} for qa in qa_list]
                 discovery_prompt = build_discovery_system_prompt("software-discovery", existing)
-                discovery_response = self.llm.generate(
-                    system=discovery_prompt,
-                    user=user_prompt,
-                    max_tokens=self.extraction_config.max_tokens,
-                )
+                discovery_response = await self._generate(discovery_prompt, user_prompt)
                 qa_list.extend(self._parse_qa_response(discovery_response.text))
 
+            # parse_qa_items already dropped items without a question and answer
             for seq_n, qa in enumerate(qa_list, start=1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-
-                if question and answer:
-                    pair_id = f"software-discovery_{software_name}_{seq_n}"
-
-                    complexity = "simple"
-                    if any(
-                        term in question.lower()
-                        for term in ["how do i", "how to", "example", "versions"]
-                    ):
-                        complexity = "moderate"
-
-                    pairs.append(
-                        QAPair.create(
-                            id=pair_id,
-                            question=question,
-                            answer=answer,
-                            source_ref=(f"mcp://software-discovery/software/{software_name}"),
-                            domain="software-discovery",
-                            complexity=complexity,
-                            source_data=software,
-                        )
+                question = qa.question
+                pair_id = f"software-discovery_{software_name}_{seq_n}"
+
+                complexity = "moderate" if _MODERATE_RE.search(question) else "simple"
+
+                pairs.append(
+                    QAPair.create(
+                        id=pair_id,
+                        question=question,
+                        answer=qa.answer,
+                        source_ref=(f"mcp://software-discovery/software/{software_name}"),
+                        domain="software-discovery",
+                        complexity=complexity,
+                        source_data=software,
                     )
+                )
 
         except Exception as e:
-            print(f"Error generating Q&A for {software_name}: {e}")
+            logger.warning("Error generating Q&A for %s: %s", software_name, e)
 
         return pairs
 
     @staticmethod
-    def _parse_qa_response(response_text: str) -> list[dict]:
+    def _parse_qa_response(response_text: str) -> list[QAItem]:
         """Parse a JSON array of Q&A pairs from an LLM response."""
-        json_match = re.search(r"\[[\s\S]*\]", response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return []
+        return parse_qa_items(find_json_array(response_text))
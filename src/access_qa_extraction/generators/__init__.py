@@ -1,7 +1,7 @@
 """Q&A generators and evaluation."""
 
 from .comparisons import ComparisonGenerator
-from .incremental import IncrementalCache, compute_entity_hash
+from .incremental import IncrementalCache, compute_entity_hash, hash_serialized
 from .judge import evaluate_pairs
 
 __all__ = [
@@ -9,4 +9,5 @@ __all__ = [
     "IncrementalCache",
     "compute_entity_hash",
     "evaluate_pairs",
+    "hash_serialized",
 ]
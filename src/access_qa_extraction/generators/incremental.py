@@ -10,6 +10,7 @@ import json
 from pathlib import Path
 
 from ..models import QAPair
+from ..question_categories import PROMPT_VERSION
 
 
 def compute_entity_hash(entity_data: dict) -> str:
@@ -18,7 +19,15 @@ def compute_entity_hash(entity_data: dict) -> str:
     Returns first 16 hex chars (64 bits) — collision probability
     negligible for <100K entities.
     """
-    canonical = json.dumps(entity_data, sort_keys=True, default=str)
+    return hash_serialized(json.dumps(entity_data, sort_keys=True, default=str))
+
+
+def hash_serialized(canonical: str) -> str:
+    """Hash already-serialized entity data the same way compute_entity_hash does.
+
+    For callers that serialize the entity anyway (e.g. for a prompt) and
+    should not pay for a second serialization just to hash it.
+    """
     return hashlib.sha256(canonical.encode()).hexdigest()[:16]
 
 
@@ -27,7 +36,8 @@ class IncrementalCache:
 
     Stores a JSON file mapping "{domain}_{entity_id}" → {hash, pairs}.
     On subsequent runs, entities with unchanged hashes skip LLM calls
-    and reuse cached pairs.
+    and reuse cached pairs. Entries stored under a different PROMPT_VERSION
+    count as changed, so a prompt change regenerates every entity.
     """
 
     def __init__(self, cache_dir: Path | str):
@@ -44,35 +54,62 @@ class IncrementalCache:
                 return {}
         return {}
 
+    def _entry(self, domain: str, entity_id: str) -> dict:
+        """The cached entry for an entity, or {} if absent or from another prompt version."""
+        cached = self._data.get(f"{domain}_{entity_id}", {})
+        if cached.get("prompt_version", 1) != PROMPT_VERSION:
+            return {}
+        return cached
+
     def is_unchanged(self, domain: str, entity_id: str, current_hash: str) -> bool:
         """Check if entity data matches the cached hash."""
-        key = f"{domain}_{entity_id}"
-        cached = self._data.get(key, {})
-        match = cached.get("hash") == current_hash
+        match = self._entry(domain, entity_id).get("hash") == current_hash
         if match:
             self._hits += 1
         else:
             self._misses += 1
         return match
 
+    def is_raw_unchanged(self, domain: str, entity_id: str, raw_hash: str) -> bool:
+        """Check a hash of the entity's raw source record against the cache.
+
+        Lets extractors skip cleaning an entity before the normal is_unchanged()
+        check. Only a match is counted (as a hit): on a mismatch the caller
+        falls through to is_unchanged(), which does the counting.
+        """
+        match = self._entry(domain, entity_id).get("raw_hash") == raw_hash
+        if match:
+            self._hits += 1
+        return match
+
     def get_cached_pairs(self, domain: str, entity_id: str) -> list[QAPair] | None:
         """Return cached QAPair objects for an entity, or None if not cached."""
-        key = f"{domain}_{entity_id}"
-        cached = self._data.get(key, {})
-        pair_dicts = cached.get("pairs")
+        pair_dicts = self._entry(domain, entity_id).get("pairs")
         if pair_dicts is None:
             return None
         return [QAPair.model_validate(p) for p in pair_dicts]
 
     def store(
-        self, domain: str, entity_id: str, hash_val: str, pairs: list[QAPair]
+        self,
+        domain: str,
+        entity_id: str,
+        hash_val: str,
+        pairs: list[QAPair],
+        raw_hash: str | None = None,
     ):
-        """Store entity hash and serialized pairs in the cache."""
+        """Store entity hash and serialized pairs in the cache.
+
+        raw_hash, if given, is the hash of the raw source record (see
+        is_raw_unchanged).
+        """
         key = f"{domain}_{entity_id}"
         self._data[key] = {
             "hash": hash_val,
+            "prompt_version": PROMPT_VERSION,
             "pairs": [p.model_dump(mode="json") for p in pairs],
         }
+        if raw_hash is not None:
+            self._data[key]["raw_hash"] = raw_hash
 
     def save(self):
         """Persist cache to disk."""
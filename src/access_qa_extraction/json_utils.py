@@ -0,0 +1,113 @@
+"""JSON helpers for prompt construction and LLM response parsing.
+
+Uses orjson when it is installed (pip install -e '.[fast]') and falls back to
+the stdlib json module otherwise. Output is the same either way: compact
+separators and raw UTF-8 rather than \\u escapes, which keeps prompts small.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def dumps_compact(obj: Any) -> str:
+    """Serialize obj as compact JSON for an LLM prompt."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass  # e.g. non-str dict keys; the stdlib path handles them
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_canonical(obj: Any) -> str:
+    """Serialize obj as compact JSON with sorted keys.
+
+    The output is stable for equal data, so one string can be both hashed for
+    change detection and sent in a prompt.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=True, default=str)
+
+
+def loads(text: str | bytes) -> Any:
+    """Parse JSON text. Raises json.JSONDecodeError on bad input.
+
+    (orjson.JSONDecodeError subclasses it, so callers catch one type.)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+_DECODER = json.JSONDecoder()
+
+
+def find_json_array(text: str) -> list | None:
+    """Decode the JSON array of objects embedded in text (e.g. an LLM reply).
+
+    A reply that is nothing but the array is parsed with loads() (orjson when
+    installed). Otherwise, or if that fails (orjson rejects NaN/Infinity),
+    raw_decode is tried from each "[" in turn, so prose before or after the
+    array (including stray brackets) is ignored without a greedy regex scan.
+    Arrays with no objects in them, like "[1]" in "see fields [1] and [2]",
+    are skipped in favour of a later array that has some; if none does, the
+    first array that decoded is returned. Returns None if no array decodes.
+    """
+    stripped = text.strip()
+    if stripped.startswith("[") and stripped.endswith("]"):
+        try:
+            return loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    first = None
+    start = text.find("[")
+    while start != -1:
+        try:
+            obj, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("[", start + 1)
+            continue
+        if any(isinstance(item, dict) for item in obj):
+            return obj
+        if first is None:
+            first = obj
+        start = text.find("[", start + 1)
+    return first
+
+
+def find_json_object(text: str) -> dict | None:
+    """Decode the first well-formed JSON object embedded in text (e.g. an LLM reply).
+
+    The object counterpart of find_json_array: a reply that is nothing but
+    the object goes through loads(), otherwise raw_decode is tried from each
+    "{" in turn, so braces in surrounding prose are skipped instead of being
+    swallowed by a greedy first-"{"-to-last-"}" match. Returns None if no
+    object decodes.
+    """
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            obj = loads(stripped)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = _DECODER.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    return None
@@ -0,0 +1,57 @@
+"""On-disk cache of LLM generation responses, keyed by the exact request.
+
+The incremental cache skips entities whose data is unchanged; this one sits
+below it and skips individual LLM calls whose prompt is unchanged. Re-running
+an extraction during development (a prompt tweak for one domain, a crashed
+run) then only pays for the calls that actually differ.
+
+Backed by a single SQLite file in WAL mode rather than one file per response.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+
+def llm_cache_key(model: str, max_tokens: int, system: str, user: str) -> str:
+    """SHA-256 over everything that determines a generation's output."""
+    payload = f"{model}\0{max_tokens}\0{system}\0{user}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed map of llm_cache_key() → response text."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT text FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text) VALUES (?, ?)", (key, text)
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @property
+    def stats(self) -> tuple[int, int]:
+        """Return (hits, misses) counts."""
+        return self._hits, self._misses
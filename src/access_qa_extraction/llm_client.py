@@ -1,9 +1,14 @@
 """LLM client abstraction supporting Anthropic and local models."""
 
+import json
+import logging
 import os
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class LLMResponse:
@@ -13,6 +18,22 @@ class LLMResponse:
     usage: dict | None = None
 
 
+@dataclass
+class LLMRequest:
+    """One generate() call, queued for a batch job."""
+    system: str
+    user: str
+    max_tokens: int = 4096
+    cache_system: bool = False
+
+
+# Seconds between status checks while waiting on a provider batch job
+BATCH_POLL_INTERVAL = 30.0
+# Seconds to wait for a provider batch job before cancelling it and raising
+# TimeoutError (providers allow up to 24h; callers fall back to live calls)
+BATCH_TIMEOUT = 4 * 60 * 60.0
+
+
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
 
@@ -22,6 +43,7 @@ class BaseLLMClient(ABC):
         system: str,
         user: str,
         max_tokens: int = 4096,
+        cache_system: bool = False,
     ) -> LLMResponse:
         """Generate a response from the LLM.
 
@@ -29,12 +51,39 @@ class BaseLLMClient(ABC):
             system: System prompt
             user: User message
             max_tokens: Maximum tokens to generate
+            cache_system: Hint that this exact system prompt will be sent again
+                (e.g. the per-domain battery prompt), so backends with explicit
+                prompt caching should cache it. Ignored by the other backends.
 
         Returns:
             LLMResponse with generated text
         """
         pass
 
+    def generate_batch(self, requests: list[LLMRequest]) -> list[LLMResponse | None]:
+        """Run many requests as one job and return responses in request order.
+
+        Backends with a provider batch API (Anthropic Message Batches, OpenAI
+        Batches) submit a single job and poll until it ends, which is cheaper and
+        not bound by per-minute request limits. This default just calls
+        generate() for each request. A request that failed is None.
+        """
+        responses: list[LLMResponse | None] = []
+        for request in requests:
+            try:
+                responses.append(
+                    self.generate(
+                        request.system,
+                        request.user,
+                        max_tokens=request.max_tokens,
+                        cache_system=request.cache_system,
+                    )
+                )
+            except Exception as e:
+                logger.warning("Batch request failed: %s", e)
+                responses.append(None)
+        return responses
+
 
 class AnthropicClient(BaseLLMClient):
     """Client for Anthropic API."""
@@ -56,11 +105,12 @@ class AnthropicClient(BaseLLMClient):
         system: str,
         user: str,
         max_tokens: int = 4096,
+        cache_system: bool = False,
     ) -> LLMResponse:
         response = self.client.messages.create(
             model=self.model,
             max_tokens=max_tokens,
-            system=system,
+            system=self._system_param(system, cache_system),
             messages=[{"role": "user", "content": user}]
         )
 
@@ -70,9 +120,72 @@ class AnthropicClient(BaseLLMClient):
             usage={
                 "input_tokens": response.usage.input_tokens,
                 "output_tokens": response.usage.output_tokens,
+                # Prefix-cache accounting; both are 0 when nothing was cached
+                "cache_read_input_tokens": getattr(
+                    response.usage, "cache_read_input_tokens", None
+                ) or 0,
+                "cache_creation_input_tokens": getattr(
+                    response.usage, "cache_creation_input_tokens", None
+                ) or 0,
             }
         )
 
+    @staticmethod
+    def _system_param(system: str, cache_system: bool) -> str | list[dict]:
+        """Mark a reused system prompt as a prompt-cache breakpoint.
+
+        Cached prefixes are read back at a fraction of the input price; prompts
+        below the model's minimum cacheable length are simply not cached.
+        """
+        if not cache_system:
+            return system
+        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+    def generate_batch(self, requests: list[LLMRequest]) -> list[LLMResponse | None]:
+        """Submit requests as one Message Batch and wait for it to end."""
+        if not requests:
+            return []
+        batch = self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": f"req-{i}",
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": request.max_tokens,
+                        "system": self._system_param(request.system, request.cache_system),
+                        "messages": [{"role": "user", "content": request.user}],
+                    },
+                }
+                for i, request in enumerate(requests)
+            ]
+        )
+        logger.info("  Submitted Anthropic batch %s (%d requests)", batch.id, len(requests))
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                self.client.messages.batches.cancel(batch.id)
+                raise TimeoutError(f"Anthropic batch {batch.id} still running, cancelled")
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        responses: list[LLMResponse | None] = [None] * len(requests)
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                continue
+            message = entry.result.message
+            responses[int(entry.custom_id.removeprefix("req-"))] = LLMResponse(
+                text=message.content[0].text,
+                model=self.model,
+                usage={
+                    "input_tokens": message.usage.input_tokens,
+                    "output_tokens": message.usage.output_tokens,
+                    "cache_read_input_tokens": getattr(
+                        message.usage, "cache_read_input_tokens", None
+                    ) or 0,
+                },
+            )
+        return responses
+
 
 class LocalLLMClient(BaseLLMClient):
     """Client for local LLM via OpenAI-compatible API (vLLM, ollama, etc.)."""
@@ -95,6 +208,7 @@ class LocalLLMClient(BaseLLMClient):
         system: str,
         user: str,
         max_tokens: int = 4096,
+        cache_system: bool = False,
     ) -> LLMResponse:
         response = self.client.chat.completions.create(
             model=self.model,
@@ -144,6 +258,7 @@ class OpenAIClient(BaseLLMClient):
         system: str,
         user: str,
         max_tokens: int = 4096,
+        cache_system: bool = False,
     ) -> LLMResponse:
         response = self.client.chat.completions.create(
             model=self.model,
@@ -154,6 +269,7 @@ class OpenAIClient(BaseLLMClient):
             ],
         )
 
+        details = getattr(response.usage, "prompt_tokens_details", None)
         return LLMResponse(
             text=response.choices[0].message.content,
             model=self.model,
@@ -162,11 +278,75 @@ class OpenAIClient(BaseLLMClient):
                 "completion_tokens": (
                     response.usage.completion_tokens if response.usage else None
                 ),
+                # OpenAI caches long prompt prefixes automatically
+                "cached_tokens": getattr(details, "cached_tokens", None) or 0,
             }
             if response.usage
             else None,
         )
 
+    def generate_batch(self, requests: list[LLMRequest]) -> list[LLMResponse | None]:
+        """Upload requests as a JSONL file, run one Batch job, and wait for it."""
+        if not requests:
+            return []
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": f"req-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "max_tokens": request.max_tokens,
+                        "messages": [
+                            {"role": "system", "content": request.system},
+                            {"role": "user", "content": request.user},
+                        ],
+                    },
+                }
+            )
+            for i, request in enumerate(requests)
+        ]
+        input_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("  Submitted OpenAI batch %s (%d requests)", batch.id, len(requests))
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() >= deadline:
+                self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"OpenAI batch {batch.id} still running, cancelled")
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+
+        responses: list[LLMResponse | None] = [None] * len(requests)
+        if not batch.output_file_id:
+            logger.warning("  OpenAI batch %s ended with status %s", batch.id, batch.status)
+            return responses
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            usage = body.get("usage")
+            responses[int(entry["custom_id"].removeprefix("req-"))] = LLMResponse(
+                text=body["choices"][0]["message"]["content"],
+                model=self.model,
+                usage={
+                    "prompt_tokens": usage.get("prompt_tokens"),
+                    "completion_tokens": usage.get("completion_tokens"),
+                }
+                if usage
+                else None,
+            )
+        return responses
+
 
 class TransformersClient(BaseLLMClient):
     """Client for local LLM using transformers directly (no server needed)."""
@@ -211,6 +391,7 @@ class TransformersClient(BaseLLMClient):
         system: str,
         user: str,
         max_tokens: int = 4096,
+        cache_system: bool = False,
     ) -> LLMResponse:
         import torch
 
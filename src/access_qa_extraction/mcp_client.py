@@ -6,6 +6,13 @@ from typing import Any
 import httpx
 
 from .config import MCPServerConfig
+from .resilience import CircuitBreaker, call_with_retry
+
+# One pooled client serves every call_tool() in a run; these bound it so the
+# concurrent gather in the extractors reuses keep-alive connections instead of
+# opening a new TLS session per request.
+_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_CONNECT_TIMEOUT = 10.0
 
 
 class MCPClient:
@@ -15,9 +22,13 @@ class MCPClient:
         self.config = config
         self.timeout = timeout
         self._client: httpx.AsyncClient | None = None
+        self._breaker = CircuitBreaker(f"MCP {config.name}")
 
     async def __aenter__(self) -> "MCPClient":
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=min(_CONNECT_TIMEOUT, self.timeout)),
+            limits=_POOL_LIMITS,
+        )
         return self
 
     async def __aexit__(self, *args) -> None:
@@ -36,20 +47,28 @@ class MCPClient:
         Returns:
             Parsed response data
 
+        Transient failures (timeouts, connection errors, 429/5xx) are retried
+        with jittered exponential backoff.
+
         Raises:
             httpx.HTTPError: On HTTP errors
             ValueError: On invalid response format
+            CircuitOpenError: If the server has failed repeatedly
         """
         if not self._client:
             raise RuntimeError("Client not initialized. Use 'async with' context.")
 
         url = f"{self.config.url}/tools/{tool_name}"
-        response = await self._client.post(url, json={"arguments": arguments or {}})
-        response.raise_for_status()
-
-        data = response.json()
+        data = await call_with_retry(
+            self._post, url, {"arguments": arguments or {}}, breaker=self._breaker
+        )
         return self._parse_response(data)
 
+    async def _post(self, url: str, payload: dict[str, Any]) -> Any:
+        response = await self._client.post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
     def _parse_response(self, data: dict[str, Any]) -> Any:
         """Parse MCP response format.
 
@@ -10,6 +10,13 @@ Supporting data:
   - FIELD_GUIDANCE: per-domain field groups mapping data fields to required Q&A pairs
 """
 
+import functools
+
+# Bump when a prompt template or field guidance changes in a way that should
+# regenerate pairs: --incremental treats entries stored under an older version
+# as changed. (Entries written before versioning count as version 1.)
+PROMPT_VERSION = 1
+
 DOMAIN_LABELS = {
     "compute-resources": {"display": "compute resources", "entity_type": "HPC system"},
     "software-discovery": {"display": "software catalog", "entity_type": "software package"},
@@ -295,10 +302,24 @@ Data:
 {entity_json}"""
 
 
+# --- Batched user prompt (battery call covering several entities) ---
+
+BATCH_USER_PROMPT_TEMPLATE = """The data below covers {count} separate {entity_type}s,
+divided by "---". Apply the field groups and rules to each one independently, using
+that entity's own name and citation marker.
+
+Output a single JSON object instead of an array: each key is an Entity ID and each
+value is the JSON array of Q&A pairs for that entity.
+
+{entity_blocks}"""
+
+
+@functools.cache
 def build_battery_system_prompt(domain: str) -> str:
     """Build the battery system prompt (call 1).
 
-    Strictly one pair per field group.
+    Strictly one pair per field group. Cached: the prompt depends only on the
+    domain, and returning the identical string keeps provider prefix caches warm.
     """
     labels = DOMAIN_LABELS[domain]
     notes = DOMAIN_NOTES.get(domain)
@@ -316,9 +337,6 @@ def build_discovery_system_prompt(domain: str, existing_pairs: list[dict[str, st
 
     Receives existing pairs so it knows what's already covered.
     """
-    labels = DOMAIN_LABELS[domain]
-    notes = DOMAIN_NOTES.get(domain)
-    domain_notes = f"\n## Data notes\n\n{notes}\n" if notes else ""
     # Format existing pairs as a readable list
     lines = []
     for i, pair in enumerate(existing_pairs, 1):
@@ -329,23 +347,65 @@ def build_discovery_system_prompt(domain: str, existing_pairs: list[dict[str, st
             answer_preview += "..."
         lines.append(f"   **A:** {answer_preview}")
     existing_pairs_block = "\n".join(lines) if lines else "(none)"
+    return _discovery_template(domain).replace(_EXISTING_PAIRS_SLOT, existing_pairs_block, 1)
+
+
+_EXISTING_PAIRS_SLOT = "{existing_pairs_block}"
+
+
+@functools.cache
+def _discovery_template(domain: str) -> str:
+    """Discovery prompt with the per-domain parts filled in once.
+
+    Only the existing-pairs block varies per entity; it is left as a slot.
+    """
+    labels = DOMAIN_LABELS[domain]
+    notes = DOMAIN_NOTES.get(domain)
+    domain_notes = f"\n## Data notes\n\n{notes}\n" if notes else ""
     return DISCOVERY_SYSTEM_PROMPT_TEMPLATE.format(
         domain_display_name=labels["display"],
         entity_type=labels["entity_type"],
-        existing_pairs_block=existing_pairs_block,
+        existing_pairs_block=_EXISTING_PAIRS_SLOT,
         domain_notes=domain_notes,
     )
 
 
+@functools.cache
+def get_user_prompt_template(domain: str) -> str:
+    """USER_PROMPT_TEMPLATE with the domain filled in.
+
+    Leaves {entity_id}, {entity_name}, and {entity_json} for format_map().
+    """
+    return USER_PROMPT_TEMPLATE.replace("{domain}", domain)
+
+
 def build_user_prompt(domain: str, entity_id: str, entity_json: str, entity_name: str = "") -> str:
     """Build the user prompt for a single entity.
 
     entity_name should be the human-readable name (e.g. project title, resource name).
     Surfaced prominently so the LLM uses it in Q&A rather than "this project" etc.
     """
-    return USER_PROMPT_TEMPLATE.format(
-        entity_id=entity_id,
-        entity_name=entity_name or entity_id,
-        domain=domain,
-        entity_json=entity_json,
+    return get_user_prompt_template(domain).format_map(
+        {
+            "entity_id": entity_id,
+            "entity_name": entity_name or entity_id,
+            "entity_json": entity_json,
+        }
+    )
+
+
+def build_batched_user_prompt(domain: str, entities: list[tuple[str, str, str]]) -> str:
+    """Build one user prompt covering several entities for a batched battery call.
+
+    entities is a list of (entity_id, entity_json, entity_name). Each entity keeps
+    its single-entity block, so citation markers are unchanged.
+    """
+    blocks = [
+        build_user_prompt(domain, entity_id, entity_json, entity_name=entity_name)
+        for entity_id, entity_json, entity_name in entities
+    ]
+    return BATCH_USER_PROMPT_TEMPLATE.format(
+        count=len(entities),
+        entity_type=DOMAIN_LABELS[domain]["entity_type"],
+        entity_blocks="\n\n---\n\n".join(blocks),
     )
@@ -0,0 +1,189 @@
+"""Retry with exponential backoff, a circuit breaker, and a rate limiter.
+
+Transient failures (timeouts, dropped connections, 429s, 5xx) are retried with
+full-jitter exponential backoff, waiting at least as long as a Retry-After
+header asks. A CircuitBreaker counts consecutive failed
+calls; once it trips, further calls fail fast for a cool-down period instead of
+each one waiting out its own retries against a dependency that is down.
+A RateLimiter paces calls to stay under a provider's requests-per-minute limit
+rather than hitting it and backing off.
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+# 529 is Anthropic's "overloaded" status
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504, 529})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is short-circuited because the breaker is open."""
+
+
+class CircuitBreaker:
+    """Trips after `failure_threshold` consecutive failures.
+
+    While open, before_call() raises CircuitOpenError. After `reset_timeout`
+    seconds one trial call is let through (half-open) and every other caller
+    is still refused until it finishes; success closes the breaker, failure
+    re-opens it. A trial that never reports back (e.g. cancelled) stops
+    blocking after another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        # monotonic start time of the half-open trial call, if one is running
+        self._probe_in_flight: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self.reset_timeout
+
+    def before_call(self, retrying: bool = False) -> None:
+        """Admit a call or raise CircuitOpenError.
+
+        retrying marks a retry of a call that was already admitted: it is
+        refused only while the breaker is open, so a half-open trial can retry
+        without competing with itself.
+        """
+        if self._opened_at is None:
+            return
+        if self.is_open or (not retrying and self._probe_running()):
+            raise CircuitOpenError(
+                f"{self.name} circuit open after {self._failures} consecutive failures"
+            )
+        if not retrying:
+            self._probe_in_flight = time.monotonic()
+
+    def _probe_running(self) -> bool:
+        started = self._probe_in_flight
+        return started is not None and time.monotonic() - started < self.reset_timeout
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = None
+
+    def release_probe(self) -> None:
+        """End a half-open trial without counting it as a success or failure."""
+        self._probe_in_flight = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = None
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """Async token bucket allowing `rate_per_minute` acquisitions per minute.
+
+    Starts full, so up to `burst` calls (default: a minute's worth) go out
+    immediately; after that, callers wait their turn in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float | None = None):
+        self.capacity = burst or max(1.0, rate_per_minute)
+        self._per_second = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self._per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._per_second)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for errors worth retrying: network failures, timeouts, 429, 5xx."""
+    if isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status in TRANSIENT_STATUS_CODES:
+        return True
+    # The anthropic/openai SDKs wrap network failures in their own classes
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Delay asked for by the error response's Retry-After header, if any.
+
+    Only the delta-seconds form is read; an HTTP-date is ignored and the
+    normal backoff applies.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+async def call_with_retry(
+    func: Callable[..., Any],
+    *args: Any,
+    attempts: int = 4,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    breaker: CircuitBreaker | None = None,
+    **kwargs: Any,
+) -> Any:
+    """Call func(*args, **kwargs), retrying transient errors with backoff.
+
+    func may be sync or async. Non-transient errors are raised immediately.
+    A Retry-After header on the error (e.g. a 429) raises the wait to at least
+    that many seconds, still capped at max_delay.
+    Only the final outcome of a call (after retries) is reported to the breaker,
+    and only transient errors count as breaker failures.
+    """
+    for attempt in range(1, attempts + 1):
+        if breaker:
+            breaker.before_call(retrying=attempt > 1)
+        try:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+            if attempt < attempts and is_transient_error(e):
+                backoff = min(max_delay, base_delay * 2 ** (attempt - 1))
+                delay = random.uniform(0, backoff)
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = min(max_delay, max(delay, retry_after))
+                await asyncio.sleep(delay)
+                continue
+            if breaker:
+                # Only outage-shaped errors count toward tripping; a 404 or a
+                # bad argument says nothing about the service's health.
+                if is_transient_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+            raise
+        if breaker:
+            breaker.record_success()
+        return result
+    raise AssertionError("unreachable")  # pragma: no cover
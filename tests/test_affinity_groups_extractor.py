@@ -6,12 +6,14 @@ that matches the shape of real MCP responses.
 """
 
 import json
+import threading
+import time
 from dataclasses import dataclass
 from unittest.mock import AsyncMock
 
 import pytest
 
-from access_qa_extraction.config import MCPServerConfig
+from access_qa_extraction.config import ExtractionConfig, MCPServerConfig
 from access_qa_extraction.extractors.affinity_groups import AffinityGroupsExtractor, strip_html
 
 # --- Fake data that matches what the MCP server actually returns ---
@@ -66,15 +68,16 @@ class FakeLLMResponse:
 
 
 class FakeLLMClient:
-    """Returns canned battery pairs on first call, empty discovery on second."""
+    """Returns canned battery pairs, and an empty array for discovery calls.
 
-    def __init__(self):
-        self._call_count = 0
+    Groups are processed concurrently, so calls interleave; the discovery
+    call is recognized by its system prompt rather than by call order.
+    """
 
-    def generate(self, system: str, user: str, max_tokens: int = 2048) -> FakeLLMResponse:
-        self._call_count += 1
-        # Even calls are discovery (return empty); odd calls are battery
-        if self._call_count % 2 == 0:
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        if "Already covered" in system:
             return FakeLLMResponse(text="[]")
         cite = "<<SRC:affinity-groups:42>>"
         return FakeLLMResponse(
@@ -97,6 +100,43 @@ class FakeLLMClient:
         )
 
 
+class SlowLLMClient(FakeLLMClient):
+    """Records the peak number of generate() calls in flight at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak = 0
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        with self._lock:
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            time.sleep(0.02)
+            return super().generate(system, user, max_tokens)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class RecordingLLMClient(FakeLLMClient):
+    """Records the max_tokens and cache hint passed to each generate() call."""
+
+    def __init__(self):
+        self.max_tokens_seen: list[int] = []
+        self.cache_hints: list[tuple[bool, bool]] = []  # (is_discovery, cache_system)
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        self.max_tokens_seen.append(max_tokens)
+        self.cache_hints.append(("Already covered" in system, cache_system))
+        return super().generate(system, user, max_tokens)
+
+
 class FakeErrorLLMClient:
     """Simulates an LLM that throws an error."""
 
@@ -260,6 +300,80 @@ class TestAffinityGroupsExtractor:
         assert "affinity-groups_42_2" in ids
         assert "affinity-groups_42_3" in ids
 
+    async def test_token_budget_scales_with_entity(self, server_config):
+        """Small groups ask for fewer tokens; max_tokens stays the ceiling."""
+        llm = RecordingLLMClient()
+        extractor = AffinityGroupsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(max_tokens=2048, no_judge=True),
+            llm_client=llm,
+        )
+        big_group = {"id": 7, "name": "Big", "description": "x" * 20000}
+        mock_client = AsyncMock()
+        mock_client.call_tool = AsyncMock(
+            side_effect=[{"total": 2, "items": [FAKE_GROUPS["items"][1], big_group]}, {}, {}]
+        )
+        extractor.client = mock_client
+        await extractor.extract()
+
+        assert min(llm.max_tokens_seen) < 2048
+        assert max(llm.max_tokens_seen) == 2048
+
+    async def test_only_battery_prompt_is_marked_cacheable(self, server_config):
+        """The shared battery prompt is cached; per-entity discovery prompts aren't."""
+        llm = RecordingLLMClient()
+        extractor = AffinityGroupsExtractor(
+            server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=llm
+        )
+        mock_client = AsyncMock()
+        mock_client.call_tool = AsyncMock(side_effect=[FAKE_GROUPS, FAKE_GROUP_DETAIL, {}])
+        extractor.client = mock_client
+        await extractor.extract()
+
+        assert sorted(set(llm.cache_hints)) == [(False, True), (True, False)]
+
+    async def test_sparse_group_skips_discovery(self, server_config):
+        """A group with only a name and description gets the battery call only."""
+        llm = RecordingLLMClient()
+        extractor = AffinityGroupsExtractor(
+            server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=llm
+        )
+        sparse = {"total": 1, "items": [{"id": 5, "name": "Tiny", "description": "Desc"}]}
+        mock_client = AsyncMock()
+        mock_client.call_tool = AsyncMock(side_effect=[sparse, {}])
+        extractor.client = mock_client
+        output = await extractor.extract()
+
+        assert llm.cache_hints == [(False, True)]
+        assert len(output.pairs) == 3
+
+    async def test_concurrency_limit_and_order(self, server_config):
+        """Groups run concurrently up to the limit; output keeps input order."""
+        llm = SlowLLMClient()
+        extractor = AffinityGroupsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(concurrency=2, no_judge=True),
+            llm_client=llm,
+        )
+        many_groups = {
+            "total": 4,
+            "items": [
+                {"id": gid, "name": f"Group {gid}", "description": "Desc"} for gid in (1, 2, 3, 4)
+            ],
+        }
+        mock_client = AsyncMock()
+        mock_client.call_tool = AsyncMock(side_effect=[many_groups, {}, {}, {}, {}])
+        extractor.client = mock_client
+        output = await extractor.extract()
+
+        assert 1 < llm.peak <= 2
+        assert list(output.raw_data) == ["1", "2", "3", "4"]
+        assert [p.id for p in output.pairs[:3]] == [
+            "affinity-groups_1_1",
+            "affinity-groups_1_2",
+            "affinity-groups_1_3",
+        ]
+
 
 class TestStripHtml:
     """Test the strip_html helper."""
@@ -273,3 +387,20 @@ class TestStripHtml:
 
     def test_normalizes_whitespace(self):
         assert strip_html("<p>Hello</p>  <p>World</p>") == "Hello World"
+
+
+class TestParseQAResponse:
+    """Test AffinityGroupsExtractor._parse_qa_response."""
+
+    def test_ignores_prose_and_stray_brackets(self):
+        text = 'Pairs:\n```json\n[{"question": "Who leads [AG]?", "answer": "Ana."}]\n```\nSee [1].'
+        (item,) = AffinityGroupsExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("Who leads [AG]?", "Ana.")
+
+    def test_skips_arrays_without_objects(self):
+        text = 'Based on fields [1] and [2]: [{"question": "q", "answer": "a"}]'
+        (item,) = AffinityGroupsExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("q", "a")
+
+    def test_no_array(self):
+        assert AffinityGroupsExtractor._parse_qa_response("Sorry, no pairs.") == []
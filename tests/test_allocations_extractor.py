@@ -6,13 +6,20 @@ that matches the shape of real API responses.
 """
 
 import json
+import re
+import time
 from dataclasses import dataclass
+from functools import partial
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
-from access_qa_extraction.config import MCPServerConfig
+from access_qa_extraction.config import ExtractionConfig, MCPServerConfig
 from access_qa_extraction.extractors.allocations import AllocationsExtractor, strip_html
+from access_qa_extraction.extractors.base import QAItem
+from access_qa_extraction.generators.incremental import IncrementalCache
+from access_qa_extraction.llm_client import LLMResponse
 
 # --- Fake data that matches what the allocations API returns ---
 
@@ -77,15 +84,16 @@ class FakeLLMResponse:
 
 
 class FakeLLMClient:
-    """Returns canned battery pairs on first call, empty discovery on second."""
+    """Returns canned battery pairs, and an empty array for discovery calls.
 
-    def __init__(self):
-        self._call_count = 0
+    Projects are processed concurrently, so calls interleave; the discovery
+    call is recognized by its system prompt rather than by call order.
+    """
 
-    def generate(self, system: str, user: str, max_tokens: int = 2048) -> FakeLLMResponse:
-        self._call_count += 1
-        # Even calls are discovery (return empty); odd calls are battery
-        if self._call_count % 2 == 0:
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        if "Already covered" in system:
             return FakeLLMResponse(text="[]")
         cite = "<<SRC:allocations:TG-CIS210014>>"
         return FakeLLMResponse(
@@ -118,6 +126,50 @@ class FakeLLMClient:
         )
 
 
+class BatchLLMClient(FakeLLMClient):
+    """Answers batched battery prompts with a JSON object keyed by entity ID.
+
+    IDs in `omit` are left out of the batched response. Every call is logged.
+    """
+
+    def __init__(self, omit: tuple[str, ...] = ()):
+        self.omit = omit
+        self.calls: list[str] = []
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        if "JSON object" in user:
+            self.calls.append("batch")
+            ids = [str(p["projectId"]) for p in FAKE_PROJECTS if p["projectId"] in user]
+            mapping = {
+                pid: [{"question": f"What is {pid}?", "answer": f"<<SRC:allocations:{pid}>>"}]
+                for pid in ids
+                if pid not in self.omit
+            }
+            return FakeLLMResponse(text=json.dumps(mapping))
+        self.calls.append("discovery" if "Already covered" in system else "battery")
+        return super().generate(system, user, max_tokens)
+
+
+class FakeBatchAPIClient(FakeLLMClient):
+    """Serves generate_batch() from generate() and records each job's size."""
+
+    def __init__(self):
+        self.jobs: list[int] = []
+        self.live_calls = 0
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        self.live_calls += 1
+        return super().generate(system, user, max_tokens)
+
+    def generate_batch(self, requests):
+        self.jobs.append(len(requests))
+        return [FakeLLMClient.generate(self, r.system, r.user, r.max_tokens) for r in requests]
+
+
 class FakeErrorLLMClient:
     """Simulates an LLM that throws an error."""
 
@@ -214,6 +266,249 @@ class TestAllocationsExtractor:
         assert "allocations_TG-CIS210014_2" in ids
         assert "allocations_TG-CIS210014_3" in ids
 
+    async def test_concurrent_output_order_and_cap(self, server_config):
+        """Concurrent processing keeps input order and respects max_entities."""
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(concurrency=4, no_judge=True),
+            llm_client=FakeLLMClient(),
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+        assert list(output.raw_data) == [str(p["projectId"]) for p in FAKE_PROJECTS]
+
+        extractor.extraction_config.max_entities = 1
+        output = await extractor.extract()
+        assert list(output.raw_data) == [str(FAKE_PROJECTS[0]["projectId"])]
+
+    async def test_batched_battery(self, server_config):
+        """batch_size > 1 shares one battery call; discovery stays per project."""
+        llm = BatchLLMClient()
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=2, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert sorted(llm.calls) == ["batch", "discovery", "discovery"]
+        assert [p.id for p in output.pairs] == [
+            "allocations_TG-CIS210014_1",
+            "allocations_TG-BIO220001_1",
+        ]
+        assert output.pairs[1].messages[-1].content.endswith("<<SRC:allocations:TG-BIO220001>>")
+
+    async def test_batched_battery_falls_back_per_project(self, server_config):
+        """A project missing from the batched response gets its own battery call."""
+        llm = BatchLLMClient(omit=("TG-BIO220001",))
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=2, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert llm.calls.count("battery") == 1
+        assert len([p for p in output.pairs if "TG-BIO220001" in p.id]) == 5
+
+    async def test_batch_api(self, server_config):
+        """use_batch_api runs one battery job and one discovery job, no live calls."""
+        llm = FakeBatchAPIClient()
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(use_batch_api=True, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert llm.jobs == [2, 2]
+        assert llm.live_calls == 0
+        assert len(output.pairs) == 10
+
+    async def test_batch_api_job_failure_falls_back_to_live_calls(self, server_config):
+        """A batch job that fails outright leaves every project to a live call."""
+
+        class FailingBatchClient(FakeBatchAPIClient):
+            def generate_batch(self, requests):
+                self.jobs.append(len(requests))
+                raise RuntimeError("batch create rejected")
+
+        llm = FailingBatchClient()
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(use_batch_api=True, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert llm.jobs == [2]
+        assert llm.live_calls == 4
+        assert len(output.pairs) == 10
+
+    async def test_batch_api_records_usage(self, server_config):
+        """Batch responses count toward token_usage like live ones."""
+
+        class UsageBatchClient(FakeBatchAPIClient):
+            def generate_batch(self, requests):
+                return [
+                    LLMResponse(text=r.text, model="m", usage={"input_tokens": 10})
+                    for r in super().generate_batch(requests)
+                ]
+
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(use_batch_api=True, no_judge=True),
+            llm_client=UsageBatchClient(),
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        await extractor.extract()
+
+        assert extractor.token_usage["input_tokens"] == 40
+
+    async def test_batch_api_incremental_checks_cache_once(self, server_config, tmp_path):
+        """With use_batch_api, cached projects are looked up once and skip the jobs."""
+        cache = IncrementalCache(tmp_path)
+        llm = FakeBatchAPIClient()
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(use_batch_api=True, no_judge=True),
+            incremental_cache=cache,
+            llm_client=llm,
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        first = await extractor.extract()
+        assert cache.stats == (0, 2)
+
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+        assert cache.stats == (2, 2)
+        assert llm.jobs == [2, 2]
+
+    async def test_incremental_raw_hash_skips_cleaning(self, server_config, tmp_path):
+        """A second incremental run replays cached pairs without re-cleaning."""
+        cache = IncrementalCache(tmp_path)
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(no_judge=True),
+            incremental_cache=cache,
+            llm_client=FakeLLMClient(),
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        first = await extractor.extract()
+
+        extractor.llm = FakeErrorLLMClient()
+        extractor._clean_project_data = None  # would raise if called
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+
+    async def test_batched_incremental_checks_cache_once(self, server_config, tmp_path):
+        """A batched rerun looks each project up in the cache exactly once."""
+        cache = IncrementalCache(tmp_path)
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=2, no_judge=True),
+            incremental_cache=cache,
+            llm_client=FakeLLMClient(),
+        )
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        first = await extractor.extract()
+        assert cache.stats == (0, 2)
+
+        extractor.llm = FakeErrorLLMClient()
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+        assert cache.stats == (2, 2)
+
+    async def test_judge_runs_behind_generation(self, server_config, tmp_path):
+        """The next project generates while the previous one is judged; cache keeps scores."""
+        events: list[str] = []
+
+        class RecordingLLM(FakeLLMClient):
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" not in system:
+                    events.append("generate " + user.split("Entity ID: ")[1].split()[0])
+                return super().generate(system, user, max_tokens, cache_system)
+
+        class SlowJudge:
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                time.sleep(0.2)
+                ids = re.findall(r"^### (\S+)", user, re.MULTILINE)
+                events.append("judged")
+                scores = {"faithfulness": 0.9, "relevance": 0.9, "completeness": 0.9}
+                return FakeLLMResponse(text=json.dumps([{"pair_id": i, **scores} for i in ids]))
+
+        cache = IncrementalCache(tmp_path)
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(concurrency=1),
+            incremental_cache=cache,
+            llm_client=RecordingLLM(),
+        )
+        extractor.judge_client = SlowJudge()
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert events.index("generate TG-BIO220001") < events.index("judged")
+        assert all(p.metadata.confidence_score == 0.9 for p in output.pairs)
+        cached = cache.get_cached_pairs("allocations", "TG-BIO220001")
+        assert cached[0].metadata.confidence_score == 0.9
+
+    async def test_judge_splits_large_projects(self, server_config):
+        """Projects with many pairs are judged in JUDGE_CHUNK_SIZE chunks."""
+
+        class ManyPairsLLM(FakeLLMClient):
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" in system:
+                    return FakeLLMResponse(text="[]")
+                cite = "<<SRC:allocations:TG-CIS210014>>"
+                qa = [{"question": f"Q{n}?", "answer": f"A{n}.\n\n{cite}"} for n in range(10)]
+                return FakeLLMResponse(text=json.dumps(qa))
+
+        class CountingJudge:
+            def __init__(self):
+                self.batch_sizes: list[int] = []
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                ids = re.findall(r"^### (\S+)", user, re.MULTILINE)
+                self.batch_sizes.append(len(ids))
+                scores = {"faithfulness": 1.0, "relevance": 1.0, "completeness": 1.0}
+                return FakeLLMResponse(text=json.dumps([{"pair_id": i, **scores} for i in ids]))
+
+        judge = CountingJudge()
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(max_entities=1),
+            llm_client=ManyPairsLLM(),
+        )
+        extractor.judge_client = judge
+        extractor._fetch_all_projects = AsyncMock(return_value=FAKE_PROJECTS)
+        output = await extractor.extract()
+
+        assert sorted(judge.batch_sizes) == [2, 8]
+        assert all(p.metadata.confidence_score == 1.0 for p in output.pairs)
+
+    async def test_complexity_tagging(self, server_config):
+        """Questions with process/comparison wording are tagged moderate."""
+        extractor = AllocationsExtractor(server_config, llm_client=FakeErrorLLMClient())
+        cite = "<<SRC:allocations:TG-1>>"
+        battery = [
+            QAItem("How To renew TG-1?", cite),
+            QAItem("Who leads TG-1?", cite),
+            QAItem("What is the PROCESS for TG-1?", cite),
+        ]
+        pairs = await extractor._generate_qa_pairs(
+            "TG-1", {"title": "T"}, "system", battery=battery, discovery=[]
+        )
+
+        assert [p.metadata.complexity for p in pairs] == ["moderate", "simple", "moderate"]
+
     async def test_clean_project_data(self, server_config):
         """Test that project data is properly cleaned."""
         extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
@@ -229,6 +524,126 @@ class TestAllocationsExtractor:
         assert len(cleaned["resources"]) == 2
         assert cleaned["resources"][0]["name"] == "Delta GPU"
 
+    async def test_build_project_views(self, server_config):
+        """Cleaned view and raw summary come out of one pass, matching the parts."""
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        project = FAKE_PROJECTS[0]
+        cleaned, summary = extractor._build_project_views("TG-CIS123456", project)
+
+        assert cleaned == extractor._clean_project_data(project)
+        assert summary == extractor._raw_summary("TG-CIS123456", project)
+        assert summary["resource_names"] == ["Delta GPU", "Expanse"]
+
+
+def test_parse_qa_response_drops_malformed_items():
+    text = json.dumps(
+        [
+            {"question": "Q1?", "answer": "A1"},
+            {"question": "Q2?"},
+            {"question": "Q3?", "answer": 3},
+            "not an object",
+            {"question": "Q4?", "answer": "A4", "category": "extra"},
+        ]
+    )
+    items = AllocationsExtractor._parse_qa_response(f"Here you go:\n{text}")
+
+    assert items == [QAItem("Q1?", "A1"), QAItem("Q4?", "A4")]
+
+
+class TestFetchAllProjects:
+    """Tests for _fetch_all_projects pagination."""
+
+    @pytest.fixture
+    def fake_api(self, monkeypatch):
+        """Serve 5 pages of 2 projects each through a mock transport."""
+        requested: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            requested.append(page)
+            projects = [{"projectId": f"P{page}-{i}"} for i in (1, 2)]
+            return httpx.Response(200, json={"pages": 5, "projects": projects})
+
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(httpx, "AsyncClient", partial(httpx.AsyncClient, transport=transport))
+        return requested
+
+    async def test_fetches_all_pages_in_order(self, server_config, fake_api):
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        projects = await extractor._fetch_all_projects()
+        await extractor.aclose()
+
+        assert len(projects) == 10
+        assert [p["projectId"] for p in projects[:4]] == ["P1-1", "P1-2", "P2-1", "P2-2"]
+        assert projects[-1]["projectId"] == "P5-2"
+
+    async def test_max_entities_limits_pages(self, server_config, fake_api):
+        extractor = AllocationsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(max_entities=5),
+            llm_client=FakeLLMClient(),
+        )
+        projects = await extractor._fetch_all_projects()
+        await extractor.aclose()
+
+        assert len(projects) == 5
+        assert sorted(fake_api) == [1, 2, 3]
+
+    async def test_transient_page_error_is_retried(self, server_config, monkeypatch):
+        """A 503 on one page is retried instead of aborting pagination."""
+        monkeypatch.setattr("access_qa_extraction.resilience.random.uniform", lambda a, b: 0)
+        failed: set[int] = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            if page == 2 and page not in failed:
+                failed.add(page)
+                return httpx.Response(503)
+            return httpx.Response(200, json={"pages": 3, "projects": [{"projectId": f"P{page}"}]})
+
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(httpx, "AsyncClient", partial(httpx.AsyncClient, transport=transport))
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        projects = await extractor._fetch_all_projects()
+        await extractor.aclose()
+
+        assert [p["projectId"] for p in projects] == ["P1", "P2", "P3"]
+        assert failed == {2}
+
+    def test_slim_project_keeps_cleaned_view(self, server_config):
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        project = {**FAKE_PROJECTS[0], "requestStatus": "active", "extra": {"big": "x" * 100}}
+        slim = extractor._slim_project(project)
+
+        assert "extra" not in slim
+        assert "resourceId" not in slim["resources"][0]
+        assert extractor._clean_project_data(slim) == extractor._clean_project_data(project)
+
+    async def test_report_reuses_client_and_closes(self, server_config, fake_api):
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        http = extractor._get_http()
+        report = await extractor.run_report()
+
+        assert report.sample_ids == ["P1-1", "P1-2"]
+        assert http.is_closed
+        assert extractor._http is None
+
+    async def test_report_small_page_probe(self, server_config, monkeypatch):
+        """report() requests a small page; the estimate works when it is honored."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            per_page = int(request.url.params.get("per_page", 20))
+            projects = [{"projectId": f"P{i}"} for i in range(per_page)]
+            return httpx.Response(200, json={"pages": -(-100 // per_page), "projects": projects})
+
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(httpx, "AsyncClient", partial(httpx.AsyncClient, transport=transport))
+        extractor = AllocationsExtractor(server_config, llm_client=FakeLLMClient())
+        report = await extractor.run_report()
+
+        assert report.total_fetched == 100
+        assert len(report.sample_ids) == 5
+
 
 class TestStripHtml:
     """Test the strip_html helper."""
@@ -242,3 +657,6 @@ class TestStripHtml:
 
     def test_normalizes_whitespace(self):
         assert strip_html("<p>Hello</p>  <p>World</p>") == "Hello World"
+
+    def test_plain_text_fast_path(self):
+        assert strip_html("  No tags\n here, 5 > 3  ") == "No tags here, 5 > 3"
@@ -0,0 +1,478 @@
+"""Tests for compute resources extractor.
+
+These tests mock both the MCP client and the LLM client, so they
+run instantly with no servers needed. The mocks return fake data
+that matches the shape of real MCP responses.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from unittest.mock import AsyncMock
+
+import pytest
+
+from access_qa_extraction.config import ExtractionConfig, MCPServerConfig
+from access_qa_extraction.extractors.compute_resources import (
+    ComputeResourcesExtractor,
+    strip_html,
+)
+from access_qa_extraction.generators.incremental import IncrementalCache
+
+# --- Fake data that matches what the MCP server actually returns ---
+
+FAKE_RESOURCES = {
+    "resources": [
+        {
+            "id": "delta.ncsa.access-ci.org",
+            "name": "Delta",
+            "description": "<p>A GPU-focused system at NCSA.</p>",
+            "organization_names": ["NCSA"],
+            "feature_names": ["GPU", "Unknown feature"],
+            "hasGpu": True,
+            "resourceType": "Compute",
+        },
+        {
+            "id": "neocortex.psc.access-ci.org",
+            "name": "Neocortex - COMING SOON",
+            "description": "An AI system at PSC.",
+            "organization_names": ["PSC"],
+            "hasGpu": False,
+            "resourceType": "Compute",
+        },
+        {
+            "id": "anvil.purdue.access-ci.org",
+            "name": "Anvil",
+            "description": "A CPU system at Purdue.",
+            "organization_names": ["Purdue"],
+            "hasGpu": False,
+            "resourceType": "Compute",
+        },
+    ]
+}
+
+FAKE_HARDWARE = {
+    "delta.ncsa.access-ci.org": {
+        "hardware": {
+            "compute_nodes": [
+                {
+                    "name": "GPU node",
+                    "type": "compute",
+                    "details": "4x NVIDIA A100 40GB GPUs per node with 256 GB of host memory",
+                },
+            ],
+        }
+    },
+}
+
+
+def fake_mcp_client() -> AsyncMock:
+    """MCP client answering by tool name, so concurrent calls can arrive in any order."""
+
+    async def call_tool(name: str, arguments: dict) -> dict:
+        if name == "search_resources":
+            return json.loads(json.dumps(FAKE_RESOURCES))
+        return FAKE_HARDWARE.get(arguments["id"], {})
+
+    client = AsyncMock()
+    client.call_tool = AsyncMock(side_effect=call_tool)
+    return client
+
+
+# --- Fake LLM client ---
+
+
+@dataclass
+class FakeLLMResponse:
+    """Mimics the response object from BaseLLMClient.generate()."""
+
+    text: str
+
+
+class FakeLLMClient:
+    """Returns two battery pairs per resource, and an empty array for discovery."""
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        if "Already covered" in system:
+            return FakeLLMResponse(text="[]")
+        resource_id = user.split("Entity ID: ")[1].split()[0]
+        cite = f"<<SRC:compute-resources:{resource_id}>>"
+        return FakeLLMResponse(
+            text=json.dumps(
+                [
+                    {"question": f"What is {resource_id}?", "answer": f"A resource.\n\n{cite}"},
+                    {"question": f"Who runs {resource_id}?", "answer": f"An RP.\n\n{cite}"},
+                ]
+            )
+        )
+
+
+class SlowLLMClient(FakeLLMClient):
+    """Records the peak number of generate() calls in flight at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak = 0
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        with self._lock:
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            time.sleep(0.02)
+            return super().generate(system, user, max_tokens)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+# --- The actual tests ---
+
+
+@pytest.fixture
+def server_config():
+    """Config for the compute-resources MCP server."""
+    return MCPServerConfig(
+        name="compute-resources",
+        url="http://localhost:3002",
+        tools=["search_resources", "get_resource_hardware"],
+    )
+
+
+class TestComputeResourcesExtractor:
+    """Tests for ComputeResourcesExtractor."""
+
+    async def test_pairs_in_resource_order(self, server_config):
+        """Resources run concurrently but pairs come back in input order."""
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(no_judge=True),
+            llm_client=FakeLLMClient(),
+        )
+        extractor.client = fake_mcp_client()
+        output = await extractor.extract()
+
+        assert [p.id for p in output.pairs] == [
+            f"compute-resources_{rid}_{n}"
+            for rid in (
+                "delta.ncsa.access-ci.org",
+                "neocortex.psc.access-ci.org",
+                "anvil.purdue.access-ci.org",
+            )
+            for n in (1, 2)
+        ]
+
+    async def test_raw_data_shape(self, server_config):
+        """raw_data has the keys ComparisonGenerator reads, with cleaned names."""
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(no_judge=True),
+            llm_client=FakeLLMClient(),
+        )
+        extractor.client = fake_mcp_client()
+        output = await extractor.extract()
+
+        delta = output.raw_data["delta.ncsa.access-ci.org"]
+        assert delta["name"] == "Delta"
+        assert delta["has_gpu"] is True
+        assert delta["gpu_types"] == ["A100 40GB", "A100"]
+        assert delta["features"] == ["GPU"]
+        assert output.raw_data["neocortex.psc.access-ci.org"]["name"] == "Neocortex"
+
+    async def test_max_entities(self, server_config):
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(max_entities=1, no_judge=True),
+            llm_client=FakeLLMClient(),
+        )
+        extractor.client = fake_mcp_client()
+        output = await extractor.extract()
+
+        assert list(output.raw_data) == ["delta.ncsa.access-ci.org"]
+
+    async def test_concurrency_cap(self, server_config):
+        """At most `concurrency` resources have an LLM call in flight."""
+        llm = SlowLLMClient()
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(concurrency=2, no_judge=True),
+            llm_client=llm,
+        )
+        extractor.client = fake_mcp_client()
+        await extractor.extract()
+
+        assert llm.peak == 2
+
+    async def test_parallel_discovery_dedupes(self, server_config):
+        """Blind discovery runs alongside the battery; repeated questions are dropped."""
+
+        class OverlappingLLM(FakeLLMClient):
+            def __init__(self):
+                self.discovery_prompts: list[str] = []
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" not in system:
+                    return super().generate(system, user, max_tokens)
+                self.discovery_prompts.append(system)
+                resource_id = user.split("Entity ID: ")[1].split()[0]
+                cite = f"<<SRC:compute-resources:{resource_id}>>"
+                return FakeLLMResponse(
+                    text=json.dumps(
+                        [
+                            {"question": f"what is  {resource_id}?", "answer": cite},
+                            {"question": f"Where is {resource_id}?", "answer": cite},
+                        ]
+                    )
+                )
+
+        llm = OverlappingLLM()
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(
+                max_entities=1, parallel_discovery=True, no_judge=True
+            ),
+            llm_client=llm,
+        )
+        extractor.client = fake_mcp_client()
+        output = await extractor.extract()
+
+        questions = [p.messages[0].content for p in output.pairs]
+        assert questions == [
+            "What is delta.ncsa.access-ci.org?",
+            "Who runs delta.ncsa.access-ci.org?",
+            "Where is delta.ncsa.access-ci.org?",
+        ]
+        assert "(none)" in llm.discovery_prompts[0]
+
+    async def test_batched_battery(self, server_config):
+        """batch_size > 1 shares one battery call; hardware is fetched once per resource."""
+
+        class BatchLLM(FakeLLMClient):
+            def __init__(self):
+                self.battery_calls = 0
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" in system:
+                    return FakeLLMResponse(text="[]")
+                self.battery_calls += 1
+                ids = [line.split(": ")[1] for line in user.splitlines() if "Entity ID:" in line]
+                battery = FakeLLMClient()
+                batched = {
+                    rid: json.loads(battery.generate(system, f"Entity ID: {rid}").text)
+                    for rid in ids
+                }
+                return FakeLLMResponse(text=json.dumps(batched))
+
+        llm = BatchLLM()
+        client = fake_mcp_client()
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=3, no_judge=True),
+            llm_client=llm,
+        )
+        extractor.client = client
+        output = await extractor.extract()
+
+        assert llm.battery_calls == 1
+        assert len(output.pairs) == 6
+        assert output.pairs[0].id == "compute-resources_delta.ncsa.access-ci.org_1"
+        hardware_calls = [
+            c for c in client.call_tool.call_args_list if c.args[0] == "get_resource_hardware"
+        ]
+        assert len(hardware_calls) == 3
+
+    async def test_batched_incremental_checks_cache_once(self, server_config, tmp_path):
+        """A batched rerun looks each resource up in the cache exactly once."""
+        cache = IncrementalCache(tmp_path)
+        extractor = ComputeResourcesExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=3, no_judge=True),
+            llm_client=FakeLLMClient(),
+            incremental_cache=cache,
+        )
+        extractor.client = fake_mcp_client()
+        first = await extractor.extract()
+        assert cache.stats == (0, 3)
+
+        class NoCallLLM:
+            def generate(self, **kwargs):
+                raise AssertionError("cached resources should not call the LLM")
+
+        extractor.llm = NoCallLLM()
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+        assert cache.stats == (3, 3)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("<p>Hello</p>", "Hello"),
+        ("a <b> c", "a c"),
+        ("a<br>b", "ab"),
+        ("<a href='x y'>link</a> text", "link text"),
+        ("  lots \n\t of   space  ", "lots of space"),
+        ("x<p> </p>y", "x y"),
+        ("", ""),
+    ],
+)
+def test_strip_html(text, expected):
+    assert strip_html(text) == expected
+
+
+async def test_judge_chunks_large_pair_sets(server_config):
+    """More than JUDGE_CHUNK_SIZE pairs are judged in several calls; all get scores."""
+
+    class ManyPairsLLM:
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            if "Already covered" in system:
+                return FakeLLMResponse(text="[]")
+            qa = [{"question": f"Q{i}?", "answer": f"A{i}"} for i in range(20)]
+            return FakeLLMResponse(text=json.dumps(qa))
+
+    class CountingJudge:
+        def __init__(self):
+            self.batch_sizes: list[int] = []
+
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            ids = re.findall(r"^### (\S+)", user, re.MULTILINE)
+            self.batch_sizes.append(len(ids))
+            scores = {"faithfulness": 1.0, "relevance": 1.0, "completeness": 1.0}
+            return FakeLLMResponse(text=json.dumps([{"pair_id": i, **scores} for i in ids]))
+
+    judge = CountingJudge()
+    extractor = ComputeResourcesExtractor(
+        server_config,
+        extraction_config=ExtractionConfig(max_entities=1),
+        llm_client=ManyPairsLLM(),
+    )
+    extractor.judge_client = judge
+    extractor.client = fake_mcp_client()
+    output = await extractor.extract()
+
+    assert sorted(judge.batch_sizes) == [4, 8, 8]
+    assert all(p.metadata.confidence_score == 1.0 for p in output.pairs)
+
+
+async def test_hardware_fetch_is_memoized(server_config):
+    """A resource listed twice (or re-requested) triggers one hardware call."""
+    extractor = ComputeResourcesExtractor(
+        server_config,
+        extraction_config=ExtractionConfig(no_judge=True),
+        llm_client=FakeLLMClient(),
+    )
+    client = fake_mcp_client()
+    extractor.client = client
+    rid = "delta.ncsa.access-ci.org"
+    first, second = await asyncio.gather(
+        extractor._fetch_hardware(rid), extractor._fetch_hardware(rid)
+    )
+    again = await extractor._fetch_hardware(rid)
+
+    assert first is second is again
+    assert client.call_tool.await_count == 1
+
+
+async def test_hardware_prefetched_before_generation(server_config):
+    """All selected resources have a hardware fetch running before the first LLM call."""
+
+    class RecordingLLM(FakeLLMClient):
+        def __init__(self):
+            self.tasks_at_call: list[int] = []
+
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            self.tasks_at_call.append(len(extractor._hardware_tasks))
+            return super().generate(system, user, max_tokens)
+
+    llm = RecordingLLM()
+    extractor = ComputeResourcesExtractor(
+        server_config,
+        extraction_config=ExtractionConfig(concurrency=1, no_judge=True),
+        llm_client=llm,
+    )
+    extractor.client = fake_mcp_client()
+    await extractor.extract()
+
+    assert llm.tasks_at_call[0] == 3
+
+
+async def test_hardware_prefetch_is_bounded(server_config, caplog):
+    """Prefetched hardware calls stay within `concurrency`; failures are logged."""
+    in_flight = peak = 0
+
+    async def call_tool(name: str, arguments: dict) -> dict:
+        nonlocal in_flight, peak
+        if name == "search_resources":
+            return json.loads(json.dumps(FAKE_RESOURCES))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if arguments["id"].startswith("anvil"):
+            raise RuntimeError("MCP timeout")
+        return FAKE_HARDWARE.get(arguments["id"], {})
+
+    extractor = ComputeResourcesExtractor(
+        server_config,
+        extraction_config=ExtractionConfig(concurrency=2, no_judge=True),
+        llm_client=FakeLLMClient(),
+    )
+    extractor.client = AsyncMock()
+    extractor.client.call_tool = AsyncMock(side_effect=call_tool)
+    with caplog.at_level("WARNING"):
+        await extractor.extract()
+
+    assert peak == 2
+    assert "Hardware fetch failed for anvil.purdue.access-ci.org" in caplog.text
+
+
+def test_extract_gpu_types(server_config):
+    """Named GPUs come first; node details add each model once, in order of appearance."""
+    extractor = ComputeResourcesExtractor(server_config, llm_client=FakeLLMClient())
+    hardware = {
+        "gpus": [{"name": "H100"}],
+        "compute_nodes": [
+            {"details": "8x NVIDIA H100 80GB, 2x RTX 6000"},
+            {"details": "4x nvidia a100 40GB; A100 and H100 nodes"},
+        ],
+    }
+    assert extractor._extract_gpu_types(hardware) == [
+        "H100",
+        "H100 80GB",
+        "RTX 6000",
+        "A100 40GB",
+        "A100",
+    ]
+
+
+def test_gpu_types_ignore_prompt_caps(server_config):
+    """GPUs beyond the hardware item and details caps still reach raw_data."""
+    extractor = ComputeResourcesExtractor(server_config, llm_client=FakeLLMClient())
+    filler = {"name": "n", "type": "compute", "details": "x" * 2000}
+    hardware = {
+        "hardware": {
+            "compute_nodes": [filler] * 25
+            + [{"name": "g", "details": "<p>" + "y" * 900 + " 4x NVIDIA H100 80GB</p>"}]
+        }
+    }
+    assert "H100" not in json.dumps(extractor._clean_hardware_data(hardware))
+    assert extractor._extract_gpu_types(hardware) == ["H100 80GB", "H100"]
+
+
+def test_clean_hardware_data_caps_prompt_size(server_config):
+    extractor = ComputeResourcesExtractor(server_config, llm_client=FakeLLMClient())
+    node = {"name": "n", "type": "compute", "details": "<p>" + "x" * 2000 + "</p>"}
+    cleaned = extractor._clean_hardware_data({"hardware": {"compute_nodes": [node] * 25}})
+
+    assert len(cleaned["compute_nodes"]) == 20
+    assert cleaned["compute_nodes_truncated"] is True
+    assert cleaned["compute_nodes"][0]["details"] == "x" * 800 + "…"
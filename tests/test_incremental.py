@@ -4,8 +4,10 @@ Tests compute_entity_hash() determinism, IncrementalCache round-trip,
 change detection, and source_hash population on QAPair.
 """
 
+import json
 from pathlib import Path
 
+from access_qa_extraction.generators import incremental
 from access_qa_extraction.generators.incremental import (
     IncrementalCache,
     compute_entity_hash,
@@ -118,6 +120,36 @@ class TestIncrementalCache:
         assert len(cached) == 3
         assert [p.id for p in cached] == ["pair_1", "pair_2", "pair_3"]
 
+    def test_raw_hash_round_trip(self, tmp_path: Path):
+        cache = IncrementalCache(tmp_path)
+        cache.store("allocations", "TG-1", "clean1", [self._make_pair()], raw_hash="raw1")
+        cache.store("allocations", "TG-2", "clean2", [self._make_pair()])
+        cache.save()
+
+        cache2 = IncrementalCache(tmp_path)
+        assert cache2.is_raw_unchanged("allocations", "TG-1", "raw1")
+        assert not cache2.is_raw_unchanged("allocations", "TG-1", "raw2")
+        assert not cache2.is_raw_unchanged("allocations", "TG-2", "raw1")
+        # Only raw matches count; mismatches are left to is_unchanged()
+        assert cache2.stats == (1, 0)
+
+    def test_prompt_version_change_invalidates(self, tmp_path: Path, monkeypatch):
+        cache = IncrementalCache(tmp_path)
+        cache.store("nsf-awards", "1", "h1", [self._make_pair()])
+        assert cache.is_unchanged("nsf-awards", "1", "h1")
+
+        monkeypatch.setattr(incremental, "PROMPT_VERSION", incremental.PROMPT_VERSION + 1)
+        assert not cache.is_unchanged("nsf-awards", "1", "h1")
+        assert cache.get_cached_pairs("nsf-awards", "1") is None
+
+    def test_unversioned_entries_count_as_version_1(self, tmp_path: Path, monkeypatch):
+        """Caches written before prompt versioning stay valid at version 1."""
+        entry = {"hash": "h1", "pairs": [self._make_pair().model_dump(mode="json")]}
+        (tmp_path / ".extraction_cache.json").write_text(json.dumps({"nsf-awards_1": entry}))
+        monkeypatch.setattr(incremental, "PROMPT_VERSION", 1)
+
+        assert IncrementalCache(tmp_path).is_unchanged("nsf-awards", "1", "h1")
+
     def test_corrupt_cache_file_handled(self, tmp_path: Path):
         cache_file = tmp_path / ".extraction_cache.json"
         cache_file.write_text("not valid json{{{")
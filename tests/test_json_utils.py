@@ -0,0 +1,82 @@
+"""Tests for the JSON helpers."""
+
+import json
+import math
+
+import pytest
+
+from access_qa_extraction import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (if installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_dumps_compact(backend):
+    data = {"title": "Café", "resources": [{"name": "Delta", "allocation": 5}]}
+    assert json_utils.dumps_compact(data) == (
+        '{"title":"Café","resources":[{"name":"Delta","allocation":5}]}'
+    )
+
+
+def test_dumps_compact_non_str_keys(backend):
+    assert json.loads(json_utils.dumps_compact({1: "a"})) == {"1": "a"}
+
+
+def test_dumps_canonical_sorts_keys(backend):
+    a = json_utils.dumps_canonical({"b": 1, "a": {"y": "é", "x": None}})
+    b = json_utils.dumps_canonical({"a": {"x": None, "y": "é"}, "b": 1})
+    assert a == b == '{"a":{"x":null,"y":"é"},"b":1}'
+
+
+def test_loads_round_trip(backend):
+    text = '[{"question": "Q?", "answer": "A."}]'
+    assert json_utils.loads(text) == [{"question": "Q?", "answer": "A."}]
+
+
+def test_loads_error_type(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads("[1,")
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('[{"question": "Q?"}]', [{"question": "Q?"}]),
+        ('Here:\n```json\n[{"q": "a ] b"}]\n```\nSee [1] above.', [{"q": "a ] b"}]),
+        ("See [note] then [1, 2]", [1, 2]),
+        ("no array here", None),
+        ("[1, 2", None),
+        ("[1] and [2]", [1]),
+        ('Based on fields [1] and [2]: [{"question": "q"}]', [{"question": "q"}]),
+        ('[[1], {"q": "a"}] then [{"q": "b"}]', [[1], {"q": "a"}]),
+    ],
+)
+def test_find_json_array(backend, text, expected):
+    assert json_utils.find_json_array(text) == expected
+
+
+def test_find_json_array_nan_falls_back(backend):
+    """orjson rejects NaN; the stdlib scan still accepts it."""
+    (value,) = json_utils.find_json_array("  [NaN]\n")
+    assert math.isnan(value)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"a": [1]}', {"a": [1]}),
+        ('Output for {entity}:\n{"a": [{"q": "}"}]}\nDone {ok}.', {"a": [{"q": "}"}]}),
+        ('[{"question": "q"}]', {"question": "q"}),
+        ("no object here", None),
+        ('{"a": 1', None),
+    ],
+)
+def test_find_json_object(backend, text, expected):
+    assert json_utils.find_json_object(text) == expected
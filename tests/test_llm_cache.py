@@ -0,0 +1,93 @@
+"""Tests for the on-disk LLM response cache."""
+
+from dataclasses import dataclass
+
+from access_qa_extraction.config import MCPServerConfig
+from access_qa_extraction.extractors.base import BaseExtractor
+from access_qa_extraction.llm_cache import LLMResponseCache, llm_cache_key
+
+
+@dataclass
+class FakeLLMResponse:
+    text: str
+
+
+class CountingLLMClient:
+    model = "fake-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, system, user, max_tokens=2048, cache_system=False):
+        self.calls += 1
+        return FakeLLMResponse(text=f"response {self.calls}")
+
+
+class Extractor(BaseExtractor):
+    server_name = "test"
+
+    async def extract(self):
+        raise NotImplementedError
+
+
+def make_extractor(cache: LLMResponseCache) -> Extractor:
+    config = MCPServerConfig(name="test", url="http://localhost:1", tools=[])
+    extractor = Extractor(config, llm_cache=cache)
+    extractor.llm = CountingLLMClient()
+    return extractor
+
+
+def test_key_covers_every_input():
+    base = llm_cache_key("m", 100, "sys", "user")
+    assert base == llm_cache_key("m", 100, "sys", "user")
+    assert base != llm_cache_key("m2", 100, "sys", "user")
+    assert base != llm_cache_key("m", 200, "sys", "user")
+    assert base != llm_cache_key("m", 100, "sys2", "user")
+    assert base != llm_cache_key("m", 100, "sys", "user2")
+
+
+def test_persists_across_instances(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite")
+    assert cache.get("k") is None
+    cache.put("k", "text")
+    cache.close()
+
+    reopened = LLMResponseCache(tmp_path / "llm.sqlite")
+    assert reopened.get("k") == "text"
+    assert reopened.stats == (1, 0)
+
+
+async def test_generate_replays_identical_requests(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite")
+    extractor = make_extractor(cache)
+
+    first = await extractor._generate("system", "user")
+    again = await extractor._generate("system", "user")
+    other = await extractor._generate("system", "another user")
+
+    assert first.text == again.text == "response 1"
+    assert other.text == "response 2"
+    assert extractor.llm.calls == 2
+
+
+async def test_generate_sums_token_usage(tmp_path):
+    """Live calls add their usage (incl. prompt-cache reads); replays add nothing."""
+
+    @dataclass
+    class UsageResponse:
+        text: str
+        usage: dict
+
+    class UsageLLMClient(CountingLLMClient):
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            self.calls += 1
+            usage = {"input_tokens": 100, "cache_read_input_tokens": 80, "note": "x"}
+            return UsageResponse(text="[]", usage=usage)
+
+    extractor = make_extractor(LLMResponseCache(tmp_path / "llm.sqlite"))
+    extractor.llm = UsageLLMClient()
+    await extractor._generate("system", "user 1")
+    await extractor._generate("system", "user 2")
+    await extractor._generate("system", "user 1")
+
+    assert extractor.token_usage == {"input_tokens": 200, "cache_read_input_tokens": 160}
@@ -5,21 +5,25 @@ run instantly with no servers needed. The mocks return fake data
 that matches the shape of real NSF API responses (MCP-normalized format).
 """
 
+import asyncio
 import json
+import threading
+import time
 from dataclasses import dataclass
-from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
-from access_qa_extraction.config import MCPServerConfig
+from access_qa_extraction.config import ExtractionConfig, MCPServerConfig
 from access_qa_extraction.extractors.nsf_awards import (
     NSFAwardsExtractor,
     _format_currency,
     _transform_nsf_award,
     strip_html,
 )
+from access_qa_extraction.generators.incremental import IncrementalCache
 
-# --- Fake data in MCP-normalized format (what _fetch_all_awards returns) ---
+# --- Fake data in MCP-normalized format (what _iter_award_pages yields) ---
 
 FAKE_AWARDS = [
     {
@@ -57,6 +61,20 @@ FAKE_AWARDS = [
 ]
 
 
+def fake_pages(*pages):
+    """Stand-in for _iter_award_pages that yields the given pages."""
+
+    async def iter_pages():
+        for page in pages:
+            yield page
+
+    return iter_pages
+
+
+async def collect_awards(extractor):
+    return [award async for page in extractor._iter_award_pages() for award in page]
+
+
 # --- Fake LLM client ---
 
 
@@ -68,15 +86,13 @@ class FakeLLMResponse:
 
 
 class FakeLLMClient:
-    """Returns canned battery pairs on first call, empty discovery on second."""
-
-    def __init__(self):
-        self._call_count = 0
+    """Returns canned battery pairs, and an empty array for discovery."""
 
-    def generate(self, system: str, user: str, max_tokens: int = 2048) -> FakeLLMResponse:
-        self._call_count += 1
-        # Even calls are discovery (return empty); odd calls are battery
-        if self._call_count % 2 == 0:
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        # Discovery prompts list the pairs "Already covered"; they find nothing new
+        if "Already covered" in system:
             return FakeLLMResponse(text="[]")
         cite = "<<SRC:nsf-awards:2345678>>"
         return FakeLLMResponse(
@@ -107,6 +123,28 @@ class FakeLLMClient:
         )
 
 
+class SlowLLMClient(FakeLLMClient):
+    """Records the peak number of generate() calls in flight at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak = 0
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        with self._lock:
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            time.sleep(0.02)
+            return super().generate(system, user, max_tokens)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
 class FakeErrorLLMClient:
     """Simulates an LLM that throws an error."""
 
@@ -135,7 +173,7 @@ class TestNSFAwardsExtractor:
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
 
         # Mock the direct API fetcher
-        extractor._fetch_all_awards = AsyncMock(return_value=FAKE_AWARDS)
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
 
         output = await extractor.extract()
 
@@ -144,36 +182,119 @@ class TestNSFAwardsExtractor:
         assert len(comprehensive) == 10
         assert all(p.domain == "nsf-awards" for p in output.pairs)
 
-    async def test_deduplication(self, server_config):
-        """Test that duplicate award numbers are skipped."""
-        duplicate_awards = [
-            {
-                "awardNumber": "2345678",
-                "title": "Climate Research",
-                "institution": "MIT",
-                "principalInvestigator": "Dr. Smith",
-            },
-            {
-                "awardNumber": "2345678",
-                "title": "Climate Research",
-                "institution": "MIT",
-                "principalInvestigator": "Dr. Smith",
-            },
-        ]
+    async def test_deduplication(self, server_config, monkeypatch):
+        """An award repeated across API pages is kept once, as pages arrive."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params["offset"])
+            ids = range(100) if offset == 1 else [99, 100]
+            awards = [{"id": str(n), "title": f"Award {n}"} for n in ids]
+            return httpx.Response(200, json={"response": {"award": awards}})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
 
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
-        extractor._fetch_all_awards = AsyncMock(return_value=duplicate_awards)
-        output = await extractor.extract()
+        awards = await collect_awards(extractor)
+        await extractor.aclose()
 
-        # Should only process one award: 5 comprehensive (LLM)
-        comprehensive = [p for p in output.pairs if p.metadata.granularity == "comprehensive"]
-        assert len(comprehensive) == 5
+        assert [a["awardNumber"] for a in awards] == [str(n) for n in range(101)]
+
+    @pytest.mark.parametrize(
+        ("metadata", "max_entities", "expected_offsets"),
+        [
+            ({"totalCount": "250"}, None, [1, 101, 201]),
+            ({}, 150, [1, 101]),
+        ],
+    )
+    async def test_pagination_stops_at_count_or_cap(
+        self, server_config, monkeypatch, metadata, max_entities, expected_offsets
+    ):
+        """Pages after the first are fetched concurrently but never past the count or cap."""
+        offsets = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params["offset"])
+            offsets.append(offset)
+            awards = [{"id": str(offset + n), "title": "Award"} for n in range(100)]
+            return httpx.Response(200, json={"response": {"award": awards, "metadata": metadata}})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+        extractor = NSFAwardsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(max_entities=max_entities),
+            llm_client=FakeLLMClient(),
+        )
+        awards = await collect_awards(extractor)
+        await extractor.aclose()
+
+        assert sorted(offsets) == expected_offsets
+        numbers = [int(a["awardNumber"]) for a in awards]
+        assert numbers == list(range(1, len(numbers) + 1))
+
+    async def test_page_retries_transient_errors(self, server_config, monkeypatch):
+        """A 503 on one page is retried instead of aborting the crawl."""
+        statuses = iter([503, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            awards = [{"id": "1", "title": "Award 1"}]
+            return httpx.Response(200, json={"response": {"award": awards}})
+
+        async def no_sleep(delay):
+            pass
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+        monkeypatch.setattr("access_qa_extraction.resilience.asyncio.sleep", no_sleep)
+
+        extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
+        awards = await collect_awards(extractor)
+        await extractor.aclose()
+
+        assert [a["awardNumber"] for a in awards] == ["1"]
+
+    async def test_report_reuses_client_and_closes(self, server_config, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            awards = [{"id": str(n), "title": f"Award {n}"} for n in range(3)]
+            return httpx.Response(200, json={"response": {"award": awards}})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+        extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
+        http = extractor._get_http()
+        report = await extractor.run_report()
+
+        assert report.sample_ids == ["0", "1", "2"]
+        assert http.is_closed
+        assert extractor._http is None
 
     async def test_skips_empty_titles(self, server_config):
         """Test that awards without titles are skipped."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
-        extractor._fetch_all_awards = AsyncMock(
-            return_value=[
+        extractor._iter_award_pages = fake_pages(
+            [
                 {
                     "awardNumber": "1111111",
                     "title": "",
@@ -185,10 +306,29 @@ class TestNSFAwardsExtractor:
 
         assert len(output.pairs) == 0
 
+    async def test_sparse_awards_skip_llm(self, server_config):
+        """An award with only a title, PI, and institution gets raw_data but no LLM calls."""
+        sparse = {
+            "awardNumber": "1111111",
+            "title": "Travel Support",
+            "principalInvestigator": "Dr. Smith",
+            "institution": "MIT",
+        }
+        llm = SlowLLMClient()
+        extractor = NSFAwardsExtractor(
+            server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=llm
+        )
+        extractor._iter_award_pages = fake_pages([sparse, FAKE_AWARDS[0]])
+        output = await extractor.extract()
+
+        assert list(output.raw_data) == ["1111111", "2345678"]
+        assert {p.id.split("_")[1] for p in output.pairs} == {"2345678"}
+        assert llm.peak == 1
+
     async def test_raw_data_shape(self, server_config):
         """Test that raw_data has expected keys for ComparisonGenerator."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
-        extractor._fetch_all_awards = AsyncMock(return_value=FAKE_AWARDS)
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
         output = await extractor.extract()
 
         assert "2345678" in output.raw_data
@@ -208,7 +348,7 @@ class TestNSFAwardsExtractor:
     async def test_llm_error_handling(self, server_config):
         """Test that LLM errors don't crash the whole extraction."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeErrorLLMClient())
-        extractor._fetch_all_awards = AsyncMock(return_value=FAKE_AWARDS)
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
         output = await extractor.extract()
 
         # LLM fails → 0 pairs, but extraction doesn't crash
@@ -219,7 +359,7 @@ class TestNSFAwardsExtractor:
     async def test_qa_pair_ids_and_citations(self, server_config):
         """Test that Q&A pairs have proper IDs and citations."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
-        extractor._fetch_all_awards = AsyncMock(return_value=FAKE_AWARDS)
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
         output = await extractor.extract()
 
         for pair in output.pairs:
@@ -230,7 +370,7 @@ class TestNSFAwardsExtractor:
     async def test_sequential_ids(self, server_config):
         """Test that LLM-generated pairs use sequential IDs."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
-        extractor._fetch_all_awards = AsyncMock(return_value=FAKE_AWARDS[:1])
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS[:1])
         output = await extractor.extract()
 
         ids = [p.id for p in output.pairs]
@@ -238,6 +378,114 @@ class TestNSFAwardsExtractor:
         assert "nsf-awards_2345678_2" in ids
         assert "nsf-awards_2345678_3" in ids
 
+    async def test_generation_overlaps_fetch(self, server_config):
+        """Awards from page 1 reach the LLM before later pages are fetched."""
+        llm = SlowLLMClient()
+        calls_before_page_2 = []
+        extractor = NSFAwardsExtractor(
+            server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=llm
+        )
+
+        async def iter_pages():
+            yield [FAKE_AWARDS[0]]
+            await asyncio.sleep(0.1)  # slow page fetch
+            calls_before_page_2.append(llm.peak)
+            yield [FAKE_AWARDS[1]]
+
+        extractor._iter_award_pages = iter_pages
+        output = await extractor.extract()
+
+        assert calls_before_page_2 == [1]
+        assert list(output.raw_data) == ["2345678", "9876543"]
+
+    async def test_concurrent_awards_keep_order(self, server_config):
+        """Awards run concurrently (up to `concurrency`) but output keeps input order."""
+        awards = [{**FAKE_AWARDS[1], "awardNumber": str(n)} for n in range(5)]
+        llm = SlowLLMClient()
+        extractor = NSFAwardsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(concurrency=2, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._iter_award_pages = fake_pages(awards)
+        output = await extractor.extract()
+
+        assert llm.peak == 2
+        assert list(output.raw_data) == [str(n) for n in range(5)]
+        assert [p.id for p in output.pairs][:6] == [
+            *(f"nsf-awards_0_{n}" for n in range(1, 6)),
+            "nsf-awards_1_1",
+        ]
+
+    async def test_batched_battery(self, server_config):
+        """batch_size > 1 shares one battery call across awards."""
+
+        class BatchLLM(FakeLLMClient):
+            def __init__(self):
+                self.battery_calls = 0
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" in system:
+                    return FakeLLMResponse(text="[]")
+                self.battery_calls += 1
+                ids = [line.split(": ")[1] for line in user.splitlines() if "Entity ID:" in line]
+                battery = json.loads(super().generate(system, user).text)
+                return FakeLLMResponse(text=json.dumps({award: battery for award in ids}))
+
+        llm = BatchLLM()
+        extractor = NSFAwardsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=2, no_judge=True),
+            llm_client=llm,
+        )
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
+        output = await extractor.extract()
+
+        assert llm.battery_calls == 1
+        assert len(output.pairs) == 10
+        assert output.pairs[5].id == "nsf-awards_9876543_1"
+
+    async def test_batched_incremental_reads_cache_once(self, server_config, tmp_path):
+        """A cached award in a batch is looked up once and makes no LLM calls."""
+        cache = IncrementalCache(tmp_path)
+        extractor = NSFAwardsExtractor(
+            server_config,
+            extraction_config=ExtractionConfig(batch_size=2, no_judge=True),
+            incremental_cache=cache,
+            llm_client=FakeLLMClient(),
+        )
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS)
+        first = await extractor.extract()
+
+        reads = []
+        real_get = cache.get_cached_pairs
+        cache.get_cached_pairs = lambda *args: reads.append(args) or real_get(*args)
+        extractor.llm = FakeErrorLLMClient()
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+        assert len(reads) == 2
+
+    async def test_battery_prompt_marked_for_caching(self, server_config):
+        """Only the shared battery system prompt asks for provider prompt caching."""
+
+        class RecordingLLM(FakeLLMClient):
+            def __init__(self):
+                self.calls: list[tuple[bool, bool]] = []
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                self.calls.append(("Already covered" in system, cache_system))
+                return super().generate(system, user, max_tokens)
+
+        llm = RecordingLLM()
+        extractor = NSFAwardsExtractor(
+            server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=llm
+        )
+        extractor._iter_award_pages = fake_pages(FAKE_AWARDS[:1])
+        await extractor.extract()
+
+        assert llm.calls == [(False, True), (True, False)]
+
     async def test_clean_award_data(self, server_config):
         """Test that award data is properly cleaned."""
         extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
@@ -257,6 +505,15 @@ class TestNSFAwardsExtractor:
         assert cleaned["startDate"] == "2024-01-01"
         assert cleaned["programOfficer"] == "Dr. Program Officer"
 
+    def test_clean_award_data_drops_empty_fields(self, server_config):
+        extractor = NSFAwardsExtractor(server_config, llm_client=FakeLLMClient())
+        award = _transform_nsf_award({"id": "1", "title": "Sparse Award", "awardeeName": "MIT"})
+
+        assert extractor._clean_award_data(award) == {
+            "title": "Sparse Award",
+            "institution": "MIT",
+        }
+
 
 class TestTransformNSFAward:
     """Test the _transform_nsf_award helper."""
@@ -351,6 +608,29 @@ class TestFormatCurrency:
     def test_handles_non_numeric(self):
         assert _format_currency("not-a-number") == "not-a-number"
 
+    @pytest.mark.parametrize(
+        ("amount", "expected"),
+        [
+            ("-2500", "$-2,500"),
+            (1500000, "$1,500,000"),
+            (1234.5, "$1,234"),
+            (float("nan"), None),
+            (None, ""),
+            ("1500.50", "1500.50"),
+            ("-", "-"),
+        ],
+    )
+    def test_edge_inputs(self, amount, expected):
+        result = _format_currency(amount)
+        if expected is None:
+            assert result is amount  # passed through unchanged
+        else:
+            assert result == expected
+
+    def test_transform_survives_float_amounts(self):
+        award = _transform_nsf_award({"id": "1", "estimatedTotalAmt": 2500.0})
+        assert award["totalIntendedAward"] == "$2,500"
+
 
 class TestStripHtml:
     """Test the strip_html helper."""
@@ -364,3 +644,43 @@ class TestStripHtml:
 
     def test_normalizes_whitespace(self):
         assert strip_html("<p>Hello</p>  <p>World</p>") == "Hello World"
+
+
+class TestParseQAResponse:
+    """Test NSFAwardsExtractor._parse_qa_response."""
+
+    def test_ignores_prose_and_stray_brackets(self):
+        text = 'Here you go:\n```json\n[{"question": "Q [1]?", "answer": "A."}]\n```\nSee [2].'
+        (item,) = NSFAwardsExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("Q [1]?", "A.")
+
+    def test_no_array(self):
+        assert NSFAwardsExtractor._parse_qa_response("Sorry, no pairs.") == []
+
+    def test_skips_arrays_without_objects(self):
+        text = 'Based on fields [1] and [2]: [{"question": "q", "answer": "a"}]'
+        (item,) = NSFAwardsExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("q", "a")
+
+
+async def test_complexity_tagging(server_config):
+    """Questions about processes or comparisons are "moderate"; the rest "simple"."""
+
+    class ProcessLLM(FakeLLMClient):
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            if "Already covered" in system:
+                return FakeLLMResponse(text="[]")
+            cite = "<<SRC:nsf-awards:2345678>>"
+            qa = [
+                {"question": "What PROCESS does award 2345678 fund?", "answer": cite},
+                {"question": "Who runs award 2345678?", "answer": cite},
+            ]
+            return FakeLLMResponse(text=json.dumps(qa))
+
+    extractor = NSFAwardsExtractor(
+        server_config, extraction_config=ExtractionConfig(no_judge=True), llm_client=ProcessLLM()
+    )
+    extractor._iter_award_pages = fake_pages(FAKE_AWARDS[:1])
+    output = await extractor.extract()
+
+    assert [p.metadata.complexity for p in output.pairs] == ["moderate", "simple"]
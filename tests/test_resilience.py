@@ -0,0 +1,189 @@
+"""Tests for retry/backoff and the circuit breaker."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from access_qa_extraction.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    call_with_retry,
+    is_transient_error,
+    retry_after_seconds,
+)
+
+
+class Flaky:
+    """Fails with `error` for the first `failures` calls, then returns "ok"."""
+
+    def __init__(self, failures: int, error: Exception):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+def status_error(code: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://localhost/tools/x")
+    response = httpx.Response(code, request=request, headers=headers)
+    return httpx.HTTPStatusError(f"{code}", request=request, response=response)
+
+
+class TestIsTransientError:
+    def test_network_errors(self):
+        assert is_transient_error(httpx.ConnectError("refused"))
+        assert is_transient_error(TimeoutError())
+
+    def test_status_codes(self):
+        assert is_transient_error(status_error(429))
+        assert is_transient_error(status_error(503))
+        assert not is_transient_error(status_error(404))
+
+    def test_other_errors(self):
+        assert not is_transient_error(ValueError("bad json"))
+
+
+class TestCallWithRetry:
+    async def test_retries_transient_then_succeeds(self):
+        func = Flaky(2, httpx.ReadTimeout("slow"))
+        assert await call_with_retry(func, base_delay=0) == "ok"
+        assert func.calls == 3
+
+    async def test_non_transient_raises_immediately(self):
+        func = Flaky(1, ValueError("bad"))
+        with pytest.raises(ValueError):
+            await call_with_retry(func, base_delay=0)
+        assert func.calls == 1
+
+    async def test_gives_up_after_attempts(self):
+        func = Flaky(10, status_error(502))
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_retry(func, attempts=3, base_delay=0)
+        assert func.calls == 3
+
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"Retry-After": "3"}, 3.0),
+            ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, None),
+            ({}, None),
+        ],
+    )
+    def test_retry_after_seconds(self, headers, expected):
+        assert retry_after_seconds(status_error(429, headers)) == expected
+        assert retry_after_seconds(ValueError("no response")) is None
+
+    async def test_honors_retry_after(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr("access_qa_extraction.resilience.asyncio.sleep", fake_sleep)
+        func = Flaky(2, status_error(429, {"Retry-After": "5"}))
+        assert await call_with_retry(func, base_delay=0, max_delay=4) == "ok"
+        assert delays == [4, 4]
+
+    async def test_awaits_async_functions(self):
+        async def func(x):
+            return x * 2
+
+        assert await call_with_retry(func, 21) == 42
+
+
+class TestCircuitBreaker:
+    async def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        func = Flaky(10, status_error(503))
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await call_with_retry(func, attempts=1, breaker=breaker)
+
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            await call_with_retry(func, breaker=breaker)
+        assert func.calls == 2
+
+    async def test_half_open_trial_closes_on_success(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_retry(Flaky(1, status_error(503)), attempts=1, breaker=breaker)
+
+        assert await call_with_retry(lambda: "ok", breaker=breaker) == "ok"
+        assert not breaker.is_open
+
+    async def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_retry(Flaky(1, status_error(503)), attempts=1, breaker=breaker)
+        await asyncio.sleep(0.06)
+
+        probe_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def probe():
+            probe_started.set()
+            await release.wait()
+            return "ok"
+
+        trial = asyncio.create_task(call_with_retry(probe, breaker=breaker))
+        await probe_started.wait()
+        with pytest.raises(CircuitOpenError):
+            await call_with_retry(lambda: "second", breaker=breaker)
+
+        release.set()
+        assert await trial == "ok"
+        assert await call_with_retry(lambda: "closed", breaker=breaker) == "closed"
+
+    async def test_half_open_probe_may_retry(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_retry(Flaky(1, status_error(503)), attempts=1, breaker=breaker)
+        await asyncio.sleep(0.06)
+
+        func = Flaky(1, httpx.ReadTimeout("slow"))
+        assert await call_with_retry(func, base_delay=0, breaker=breaker) == "ok"
+        assert func.calls == 2
+
+    async def test_non_transient_errors_do_not_trip(self):
+        breaker = CircuitBreaker("mcp", failure_threshold=5, reset_timeout=60)
+        for _ in range(6):
+            with pytest.raises(httpx.HTTPStatusError):
+                await call_with_retry(Flaky(1, status_error(404)), breaker=breaker)
+
+        assert not breaker.is_open
+        assert await call_with_retry(lambda: "ok", breaker=breaker) == "ok"
+
+    async def test_non_transient_error_ends_half_open_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_retry(Flaky(1, status_error(503)), attempts=1, breaker=breaker)
+        await asyncio.sleep(0.06)
+
+        with pytest.raises(ValueError):
+            await call_with_retry(Flaky(1, ValueError("bad id")), breaker=breaker)
+        assert await call_with_retry(lambda: "ok", breaker=breaker) == "ok"
+
+
+class TestRateLimiter:
+    async def test_burst_then_paced(self):
+        # 6000/min = 100/s, burst of 2: third acquire waits ~10ms
+        limiter = RateLimiter(6000, burst=2)
+        start = time.monotonic()
+        await limiter.acquire()
+        await limiter.acquire()
+        assert time.monotonic() - start < 0.005
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.008
+
+    def test_default_burst_is_one_minute(self):
+        assert RateLimiter(50).capacity == 50
+        assert RateLimiter(0.5).capacity == 1
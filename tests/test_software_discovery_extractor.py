@@ -0,0 +1,312 @@
+"""Tests for software discovery extractor.
+
+These tests mock both the MCP client and the LLM client, so they
+run instantly with no servers needed. The mocks return fake data
+that matches the shape of real MCP responses.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from unittest.mock import AsyncMock
+
+import pytest
+
+from access_qa_extraction.config import ExtractionConfig, MCPServerConfig
+from access_qa_extraction.extractors.software_discovery import SoftwareDiscoveryExtractor
+from access_qa_extraction.generators.incremental import IncrementalCache
+
+# --- Fake data that matches what the MCP server actually returns ---
+
+FAKE_SOFTWARE = {
+    "total": 2,
+    "items": [
+        {
+            "name": "gromacs",
+            "description": "GROMACS is a molecular dynamics package.",
+            "versions": ["2023.1", "2024.2"],
+            "available_on_resources": [{"resource_id": "delta.ncsa.access-ci.org"}],
+            "documentation": "https://manual.gromacs.org",
+            "ai_metadata": {
+                "tags": ["molecular-dynamics", "gpu"],
+                "research_area": "Chemistry",
+                "software_type": "Simulation",
+                "example_use": "gmx mdrun -deffnm md",
+            },
+        },
+        {
+            "name": "python",
+            "description": "Python programming language.",
+            "versions": ["3.11"],
+            "available_on_resources": ["expanse.sdsc.access-ci.org"],
+        },
+    ],
+}
+
+
+# --- Fake LLM client ---
+
+
+@dataclass
+class FakeLLMResponse:
+    """Mimics the response object from BaseLLMClient.generate()."""
+
+    text: str
+
+
+class FakeLLMClient:
+    """Returns canned battery pairs, and an empty array for discovery calls."""
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        if "Already covered" in system:
+            return FakeLLMResponse(text="[]")
+        cite = "<<SRC:software-discovery:gromacs>>"
+        return FakeLLMResponse(
+            text=json.dumps(
+                [
+                    {
+                        "question": "What is GROMACS?",
+                        "answer": f"A molecular dynamics package.\n\n{cite}",
+                    },
+                    {
+                        "question": "What versions of GROMACS are available?",
+                        "answer": f"2023.1 and 2024.2.\n\n{cite}",
+                    },
+                ]
+            )
+        )
+
+
+class SlowLLMClient(FakeLLMClient):
+    """Records the peak number of generate() calls in flight at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak = 0
+
+    def generate(
+        self, system: str, user: str, max_tokens: int = 2048, cache_system: bool = False
+    ) -> FakeLLMResponse:
+        with self._lock:
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            time.sleep(0.02)
+            return super().generate(system, user, max_tokens)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class FakeErrorLLMClient:
+    """Simulates an LLM that throws an error."""
+
+    def generate(self, **kwargs) -> FakeLLMResponse:
+        raise RuntimeError("LLM is down")
+
+
+# --- The actual tests ---
+
+
+@pytest.fixture
+def server_config():
+    """Config for the software-discovery MCP server."""
+    return MCPServerConfig(
+        name="software-discovery",
+        url="http://localhost:3004",
+        tools=["list_all_software"],
+    )
+
+
+def make_extractor(server_config, llm_client, items=None, **config):
+    extractor = SoftwareDiscoveryExtractor(
+        server_config,
+        extraction_config=ExtractionConfig(no_judge=True, **config.pop("extraction", {})),
+        llm_client=llm_client,
+        **config,
+    )
+    mock_client = AsyncMock()
+    mock_client.call_tool = AsyncMock(return_value={"items": items or FAKE_SOFTWARE["items"]})
+    extractor.client = mock_client
+    return extractor
+
+
+class TestSoftwareDiscoveryExtractor:
+    """Tests for SoftwareDiscoveryExtractor."""
+
+    async def test_basic_extraction(self, server_config):
+        extractor = make_extractor(server_config, FakeLLMClient())
+        output = await extractor.extract()
+
+        assert len(output.pairs) == 4
+        assert all(p.domain == "software-discovery" for p in output.pairs)
+        assert output.pairs[0].id == "software-discovery_gromacs_1"
+
+    async def test_raw_data_shape(self, server_config):
+        extractor = make_extractor(server_config, FakeLLMClient())
+        output = await extractor.extract()
+
+        entry = output.raw_data["gromacs"]
+        assert entry["resources"] == ["delta.ncsa.access-ci.org"]
+        assert entry["tags"] == ["molecular-dynamics", "gpu"]
+        assert output.raw_data["python"]["resources"] == ["expanse.sdsc.access-ci.org"]
+
+    async def test_concurrent_packages_keep_order(self, server_config):
+        """Packages run concurrently (up to `concurrency`) but output keeps input order."""
+        items = [{"name": f"pkg{n}", "description": "A package."} for n in range(5)]
+        llm = SlowLLMClient()
+        extractor = make_extractor(server_config, llm, items, extraction={"concurrency": 2})
+        output = await extractor.extract()
+
+        assert llm.peak == 2
+        assert list(output.raw_data) == [f"pkg{n}" for n in range(5)]
+        assert output.pairs[2].id == "software-discovery_pkg1_1"
+
+    @pytest.mark.parametrize("wrapper", ["{}", "Pairs for each {{name}}:\n{}\nDone {{ok}}."])
+    async def test_batched_battery(self, server_config, wrapper):
+        """batch_size > 1 shares one battery call across packages, despite braces in prose."""
+
+        class BatchLLM(FakeLLMClient):
+            def __init__(self):
+                self.battery_calls = 0
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                if "Already covered" in system:
+                    return FakeLLMResponse(text="[]")
+                self.battery_calls += 1
+                ids = [line.split(": ")[1] for line in user.splitlines() if "Entity ID:" in line]
+                battery = json.loads(super().generate(system, user).text)
+                batched = json.dumps({name: battery for name in ids})
+                return FakeLLMResponse(text=wrapper.format(batched))
+
+        llm = BatchLLM()
+        extractor = make_extractor(server_config, llm, extraction={"batch_size": 2})
+        output = await extractor.extract()
+
+        assert llm.battery_calls == 1
+        assert [p.id for p in output.pairs] == [
+            "software-discovery_gromacs_1",
+            "software-discovery_gromacs_2",
+            "software-discovery_python_1",
+            "software-discovery_python_2",
+        ]
+
+    async def test_battery_prompt_marked_for_caching(self, server_config):
+        """Only the shared battery system prompt asks for provider prompt caching."""
+
+        class RecordingLLM(FakeLLMClient):
+            def __init__(self):
+                self.calls: list[tuple[bool, bool]] = []
+
+            def generate(self, system, user, max_tokens=2048, cache_system=False):
+                self.calls.append(("Already covered" in system, cache_system))
+                return super().generate(system, user, max_tokens)
+
+        llm = RecordingLLM()
+        extractor = make_extractor(server_config, llm, FAKE_SOFTWARE["items"][:1])
+        await extractor.extract()
+
+        assert llm.calls == [(False, True), (True, False)]
+
+    def test_clean_software_data(self, server_config):
+        extractor = make_extractor(server_config, FakeLLMClient())
+        software = {
+            **FAKE_SOFTWARE["items"][0],
+            "website": "",
+            "description": "GROMACS runs MD. gromacs is fast.",
+        }
+        software["ai_metadata"] = {**software["ai_metadata"], "example_use": "x" * 1600}
+        cleaned = extractor._clean_software_data(software)
+
+        assert list(cleaned) == [
+            "name",
+            "description",
+            "versions",
+            "available_on_resources",
+            "documentation",
+            "tags",
+            "research_area",
+            "software_type",
+            "example_use",
+        ]
+        assert cleaned["name"] == "GROMACS"
+        assert cleaned["example_use"] == "x" * 1500 + "..."
+        assert extractor._clean_software_data({"name": "vim", "ai_metadata": None}) == {
+            "name": "vim"
+        }
+
+    async def test_incremental_replays_cached_pairs(self, server_config, tmp_path):
+        cache = IncrementalCache(tmp_path)
+        extractor = make_extractor(server_config, FakeLLMClient(), incremental_cache=cache)
+        first = await extractor.extract()
+
+        extractor.llm = FakeErrorLLMClient()
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+
+    async def test_batched_incremental_checks_cache_once(self, server_config, tmp_path):
+        """A batched rerun looks each package up in the cache exactly once."""
+        cache = IncrementalCache(tmp_path)
+        extractor = make_extractor(
+            server_config, FakeLLMClient(), incremental_cache=cache, extraction={"batch_size": 2}
+        )
+        first = await extractor.extract()
+        assert cache.stats == (0, 2)
+
+        extractor.llm = FakeErrorLLMClient()
+        second = await extractor.extract()
+
+        assert [p.id for p in second.pairs] == [p.id for p in first.pairs]
+        assert cache.stats == (2, 2)
+
+    async def test_llm_error_yields_no_pairs(self, server_config, caplog):
+        extractor = make_extractor(server_config, FakeErrorLLMClient())
+        with caplog.at_level("WARNING"):
+            output = await extractor.extract()
+
+        assert output.pairs == []
+        assert list(output.raw_data) == ["gromacs", "python"]
+        assert "Error generating Q&A for gromacs" in caplog.text
+
+
+async def test_complexity_tagging(server_config):
+    """How-to, example, and version questions are "moderate"; the rest "simple"."""
+
+    class HowToLLM(FakeLLMClient):
+        def generate(self, system, user, max_tokens=2048, cache_system=False):
+            if "Already covered" in system:
+                return FakeLLMResponse(text="[]")
+            cite = "<<SRC:software-discovery:gromacs>>"
+            qa = [
+                {"question": "How do I run GROMACS on Delta?", "answer": cite},
+                {"question": "What VERSIONS are installed?", "answer": cite},
+                {"question": "What is GROMACS?", "answer": cite},
+            ]
+            return FakeLLMResponse(text=json.dumps(qa))
+
+    extractor = make_extractor(server_config, HowToLLM(), FAKE_SOFTWARE["items"][:1])
+    output = await extractor.extract()
+
+    assert [p.metadata.complexity for p in output.pairs] == ["moderate", "moderate", "simple"]
+
+
+class TestParseQAResponse:
+    """Test SoftwareDiscoveryExtractor._parse_qa_response."""
+
+    def test_ignores_prose_and_stray_brackets(self):
+        text = 'Pairs:\n```json\n[{"question": "Is [v2] out?", "answer": "Yes."}]\n```\nSee [1].'
+        (item,) = SoftwareDiscoveryExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("Is [v2] out?", "Yes.")
+
+    def test_no_array(self):
+        assert SoftwareDiscoveryExtractor._parse_qa_response("Sorry, no pairs.") == []
+
+    def test_skips_arrays_without_objects(self):
+        text = 'Based on fields [1] and [2]: [{"question": "q", "answer": "a"}]'
+        (item,) = SoftwareDiscoveryExtractor._parse_qa_response(text)
+        assert (item.question, item.answer) == ("q", "a")